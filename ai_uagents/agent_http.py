@@ -0,0 +1,217 @@
+"""
+Inter-agent transports for AI Company agents
+Pooled HTTP between agent processes, uAgents messages between agents on any host,
+or direct handler calls when agents share one process
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import aiohttp
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple, Type
+from uagents import Agent, Context, Model
+
+class AgentHTTPClient:
+    """Pooled aiohttp client for REST calls between local agents
+
+    Each downstream agent gets its own session and connector, so a slow
+    agent cannot use up the connections other stages need. Sessions are
+    created lazily on the running loop and reused across requests.
+    """
+
+    def __init__(self, agent_ports: Dict[str, int], host: Optional[str] = None,
+                 pool_size: Optional[int] = None, connect_timeout: Optional[float] = None):
+        self.agent_ports = agent_ports
+        self.host = host or os.getenv('AGENT_HOST', 'localhost')
+        self.pool_size = pool_size or int(os.getenv('AGENT_HTTP_POOL_SIZE', '16'))
+        self.connect_timeout = connect_timeout or float(os.getenv('AGENT_HTTP_CONNECT_TIMEOUT', '5'))
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def _get_session(self, agent: str) -> aiohttp.ClientSession:
+        session = self._sessions.get(agent)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[agent] = session
+        return session
+
+    def url(self, agent: str, path: str) -> str:
+        return f"http://{self.host}:{self.agent_ports[agent]}{path}"
+
+    async def post(self, agent: str, path: str, payload: Dict[str, Any], timeout: float = 120) -> Dict[str, Any]:
+        """POST JSON to an agent's REST endpoint and return the decoded response"""
+        stats = self.stats.setdefault(agent, {'requests': 0, 'failures': 0, 'in_flight': 0, 'total_time': 0.0})
+        request_timeout = aiohttp.ClientTimeout(total=timeout, connect=self.connect_timeout)
+        started = time.monotonic()
+        stats['requests'] += 1
+        stats['in_flight'] += 1
+        try:
+            async with self._get_session(agent).post(self.url(agent, path), json=payload,
+                                                     timeout=request_timeout) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except Exception:
+            stats['failures'] += 1
+            raise
+        finally:
+            stats['in_flight'] -= 1
+            stats['total_time'] += time.monotonic() - started
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-agent request counters"""
+        return {
+            agent: dict(
+                stats,
+                total_time=round(stats['total_time'], 3),
+                avg_time=round(stats['total_time'] / stats['requests'], 3) if stats['requests'] else None
+            )
+            for agent, stats in self.stats.items()
+        }
+
+    async def close(self):
+        """Close every connection pool"""
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions.clear()
+
+class InProcessAgentTransport:
+    """Direct calls to agent stage handlers running in the same process
+
+    Drop-in replacement for AgentHTTPClient in bureau mode: ``post`` builds
+    the request model from the payload, awaits the registered handler on the
+    current event loop and returns the response model's fields, with no
+    socket or JSON round trip.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], Tuple[Type[Model], Callable[[Model], Awaitable[Model]]]] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, agent: str, path: str, request_model: Type[Model],
+                 handler: Callable[[Model], Awaitable[Model]]):
+        """Route ``post(agent, path, ...)`` to ``handler(request_model(**payload))``"""
+        self.routes[(agent, path)] = (request_model, handler)
+        return self
+
+    async def post(self, agent: str, path: str, payload: Dict[str, Any], timeout: float = 120) -> Dict[str, Any]:
+        """Call an agent's stage handler directly and return its response fields"""
+        if (agent, path) not in self.routes:
+            raise KeyError(f"No in-process handler registered for {agent} {path}")
+        request_model, handler = self.routes[(agent, path)]
+        stats = self.stats.setdefault(agent, {'requests': 0, 'failures': 0, 'in_flight': 0, 'total_time': 0.0})
+        started = time.monotonic()
+        stats['requests'] += 1
+        stats['in_flight'] += 1
+        try:
+            response = await asyncio.wait_for(handler(request_model(**payload)), timeout)
+            return response.dict()
+        except Exception:
+            stats['failures'] += 1
+            raise
+        finally:
+            stats['in_flight'] -= 1
+            stats['total_time'] += time.monotonic() - started
+
+    get_stats = AgentHTTPClient.get_stats
+
+    async def close(self):
+        pass
+
+def parse_agent_addresses(spec: str) -> Dict[str, str]:
+    """Parse ``"product=agent1q...,cmo=agent1q..."`` into ``{'product': 'agent1q...', ...}``"""
+    addresses = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            agent, address = item.split('=', 1)
+            addresses[agent.strip()] = address.strip()
+    return addresses
+
+class AgentMessageTransport:
+    """Stage calls sent as uAgents messages, with replies correlated by request_id
+
+    Drop-in replacement for AgentHTTPClient: ``post`` sends the request model
+    to the agent's address and waits for the reply carrying the same
+    ``request_id``. Agents are found by address (AGENT_ADDRESSES), so they can
+    run on any host the uAgents network can reach, with no ports configured.
+    ``attach`` must be called on the sending agent before it starts.
+    """
+
+    def __init__(self, addresses: Optional[Dict[str, str]] = None):
+        self.addresses = addresses if addresses is not None else parse_agent_addresses(os.getenv('AGENT_ADDRESSES', ''))
+        self.routes: Dict[Tuple[str, str], Type[Model]] = {}
+        self.response_models = []
+        self.pending: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self.ctx: Optional[Context] = None
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.unmatched_replies = 0
+
+    def register(self, agent: str, path: str, request_model: Type[Model], response_model: Type[Model]):
+        """Send ``post(agent, path, ...)`` as ``request_model`` and expect ``response_model`` back"""
+        self.routes[(agent, path)] = request_model
+        if response_model not in self.response_models:
+            self.response_models.append(response_model)
+        return self
+
+    def attach(self, agent: Agent):
+        """Capture the agent's context for sending and handle every registered reply model"""
+        @agent.on_event("startup")
+        async def bind_message_transport(ctx: Context):
+            self.ctx = ctx
+
+        for response_model in self.response_models:
+            @agent.on_message(model=response_model)
+            async def handle_stage_reply(ctx: Context, sender: str, msg: Model):
+                self.resolve(sender, msg)
+        return self
+
+    def resolve(self, sender: str, msg: Model):
+        """Complete the call waiting for ``msg``; replies nobody waits for are counted and dropped"""
+        expected_sender, future = self.pending.get(getattr(msg, 'request_id', None), (None, None))
+        if future is None or sender != expected_sender:
+            self.unmatched_replies += 1
+            return
+        if not future.done():
+            future.set_result(msg)
+
+    async def post(self, agent: str, path: str, payload: Dict[str, Any], timeout: float = 120) -> Dict[str, Any]:
+        """Send a stage request to an agent and return the fields of its correlated reply"""
+        if (agent, path) not in self.routes:
+            raise KeyError(f"No message model registered for {agent} {path}")
+        if agent not in self.addresses:
+            raise KeyError(f"No uAgents address configured for {agent} (AGENT_ADDRESSES)")
+        if self.ctx is None:
+            raise RuntimeError("Message transport used before its agent started")
+        stats = self.stats.setdefault(agent, {'requests': 0, 'failures': 0, 'in_flight': 0, 'total_time': 0.0})
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = (self.addresses[agent], future)
+        started = time.monotonic()
+        stats['requests'] += 1
+        stats['in_flight'] += 1
+        try:
+            status = await self.ctx.send(self.addresses[agent], self.routes[(agent, path)](**payload, request_id=request_id))
+            if getattr(status, 'status', None) == 'failed':
+                raise ConnectionError(f"Could not deliver message to {agent}: {getattr(status, 'detail', '')}")
+            reply = await asyncio.wait_for(future, timeout)
+            fields = reply.dict()
+            fields.pop('request_id', None)
+            return fields
+        except Exception:
+            stats['failures'] += 1
+            raise
+        finally:
+            self.pending.pop(request_id, None)
+            stats['in_flight'] -= 1
+            stats['total_time'] += time.monotonic() - started
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-agent request counters plus replies that matched no pending call"""
+        return dict(AgentHTTPClient.get_stats(self), unmatched_replies=self.unmatched_replies)
+
+    async def close(self):
+        for _, future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
@@ -0,0 +1,60 @@
+"""
+uAgents message routes for the Workflow Orchestrator
+Maps each stage call to the request and reply models the agents' on_message handlers use
+"""
+
+import os
+from typing import Dict
+from uagents.crypto import Identity
+from uagents.storage import load_all_keys
+from agent_http import AgentMessageTransport, parse_agent_addresses
+from agent_models import (
+    GenerateIdeas, IdeasResponse, EvaluateProduct, ProductEvaluation,
+    ResearchRequest, MettaResearchResponse,
+    ProductRequest, ProductResponse,
+    MarketingRequest, MarketingResponse,
+    TechnicalRequest, TechnicalResponse,
+    BoltPromptRequest, BoltPromptResponse,
+    RevenueAnalysisRequest, RevenueAnalysisResponse
+)
+
+# Stage agent -> the name it passes to Agent(), which keys its entry in private_keys.json
+STAGE_AGENT_NAMES = {
+    'ceo': 'CEO Agent',
+    'research_metta': 'Research Agent (MeTTa)',
+    'product': 'Product Agent',
+    'cmo': 'CMO Agent',
+    'cto': 'CTO Agent',
+    'head_engineering': 'Head of Engineering Agent',
+    'finance': 'Finance Agent'
+}
+
+def local_agent_addresses() -> Dict[str, str]:
+    """Addresses of the stage agents derived from this deployment's private_keys.json
+
+    Reads the identity keys the agents were created with, so no agent is
+    built just to learn its address. Agents that have never run here have
+    no key yet and are left out.
+    """
+    keys = load_all_keys()
+    return {stage: Identity.from_string(keys[name]['identity_key']).address
+            for stage, name in STAGE_AGENT_NAMES.items() if name in keys}
+
+def create_message_transport() -> AgentMessageTransport:
+    """Message transport covering every stage the orchestrator calls
+
+    Addresses come from AGENT_ADDRESSES (``name=agent1q...``, comma separated);
+    agents not listed fall back to the address derived from their key in
+    this deployment's private_keys.json.
+    """
+    addresses = local_agent_addresses()
+    addresses.update(parse_agent_addresses(os.getenv('AGENT_ADDRESSES', '')))
+    return (AgentMessageTransport(addresses)
+            .register('ceo', '/generate-ideas', GenerateIdeas, IdeasResponse)
+            .register('ceo', '/evaluate-product', EvaluateProduct, ProductEvaluation)
+            .register('research_metta', '/research-idea-metta', ResearchRequest, MettaResearchResponse)
+            .register('product', '/develop-product', ProductRequest, ProductResponse)
+            .register('cmo', '/develop-marketing', MarketingRequest, MarketingResponse)
+            .register('cto', '/develop-technical', TechnicalRequest, TechnicalResponse)
+            .register('head_engineering', '/create-bolt-prompt', BoltPromptRequest, BoltPromptResponse)
+            .register('finance', '/analyze-revenue', RevenueAnalysisRequest, RevenueAnalysisResponse))
@@ -0,0 +1,380 @@
+"""
+Shared message models for AI Company agents
+Request and response models of every agent, importable without building the agents
+"""
+
+from typing import List, Dict, Any
+from uagents import Model
+
+# CEO agent: idea generation and product evaluation
+
+class GenerateIdeas(Model):
+    """Model for generating business ideas"""
+    count: int = 3
+    theme: str = None  # Optional concept the ideas should be variations of
+    deadline: float = None  # Epoch seconds by which the caller needs the result
+    request_id: str = None  # Echoed in the reply so message senders can correlate it
+
+class BusinessIdea(Model):
+    """Model for business idea structure"""
+    title: str
+    description: str
+    revenue_model: str
+    success_factors: str
+
+class IdeasResponse(Model):
+    """Model for ideas response"""
+    ideas: List[BusinessIdea]
+    request_id: str = None  # request_id of the message this replies to
+
+class EvaluateProduct(Model):
+    """Model for product evaluation request"""
+    product_name: str
+    product_description: str
+    features: List[str]
+    target_market: Dict[str, str]
+    deadline: float = None  # Epoch seconds by which the caller needs the result
+    request_id: str = None  # Echoed in the reply so message senders can correlate it
+
+class ProductEvaluation(Model):
+    """Model for product evaluation response"""
+    viability_score: int
+    market_potential: str
+    recommendations: str
+    go_decision: bool
+    request_id: str = None  # request_id of the message this replies to
+
+# Research agent (MeTTa-enhanced)
+
+class ResearchRequest(Model):
+    """Model for research request"""
+    idea: Dict[str, str]
+    deadline: float = None  # Epoch seconds by which the caller needs the result
+    request_id: str = None  # Echoed in the reply so message senders can correlate it
+
+class Competitor(Model):
+    """Model for competitor information"""
+    name: str
+    description: str
+    strengths: str
+    weaknesses: str
+
+class MarketAnalysis(Model):
+    """Model for market analysis"""
+    market_size: str
+    growth_potential: str
+    key_challenges: List[str]
+    opportunities: List[str]
+
+class Recommendations(Model):
+    """Model for recommendations"""
+    positioning: str
+    differentiation: str
+    target_audience: str
+
+class ResearchResponse(Model):
+    """Model for research response"""
+    competitors: List[Competitor]
+    market_analysis: MarketAnalysis
+    recommendations: Recommendations
+
+class SimilarResearchResponse(Model):
+    """Response model for similar research endpoint"""
+    similar_research: List[Dict[str, Any]]
+    market_patterns: Dict[str, Any]
+    business_context: Dict[str, str]
+
+class MarketTrendResponse(Model):
+    """Response model for market trend analysis endpoint"""
+    industry_insights: Dict[str, str]
+    market_patterns: Dict[str, Any]
+    trends: str
+
+class MettaResearchResponse(Model):
+    """Enhanced research response with MeTTa insights"""
+    competitors: List[Competitor]
+    market_analysis: MarketAnalysis
+    recommendations: Recommendations
+    historical_context: str
+    similar_research: List[Dict[str, Any]]
+    market_patterns: Dict[str, Any]
+    success_factors: List[str]
+    request_id: str = None  # request_id of the message this replies to
+    fallback: bool = False  # True when the agent returned canned data instead of a real result
+
+# Product agent
+
+class ProductRequest(Model):
+    """Model for product development request"""
+    idea: Dict[str, str]
+    research: Dict[str, Any]
+    deadline: float = None  # Epoch seconds by which the caller needs the result
+    request_id: str = None  # Echoed in the reply so message senders can correlate it
+
+class TargetMarket(Model):
+    """Model for target market"""
+    primary: str
+    secondary: str
+
+class GoToMarket(Model):
+    """Model for go-to-market strategy"""
+    channels: List[str]
+    pricing_strategy: str
+    launch_plan: str
+
+class ProductResponse(Model):
+    """Model for product response"""
+    product_name: str
+    product_description: str
+    core_features: List[str]
+    target_market: TargetMarket
+    value_proposition: str
+    go_to_market: GoToMarket
+    revenue_model: str
+    success_metrics: List[str]
+    request_id: str = None  # request_id of the message this replies to
+    fallback: bool = False  # True when the agent returned canned data instead of a real result
+
+# CMO agent: marketing strategy
+
+class MarketingRequest(Model):
+    """Model for marketing strategy request"""
+    idea: Dict[str, str]
+    product: Dict[str, Any]
+    research: Dict[str, Any]
+    deadline: float = None  # Epoch seconds by which the caller needs the result
+    request_id: str = None  # Echoed in the reply so message senders can correlate it
+
+class TargetSegment(Model):
+    """Model for target segment"""
+    segment: str
+    characteristics: str
+    channels: List[str]
+
+class MarketingChannel(Model):
+    """Model for marketing channel"""
+    channel: str
+    strategy: str
+    budget_allocation: str
+
+class MarketingContentStrategy(Model):
+    """Model for content strategy"""
+    content_types: List[str]
+    content_themes: List[str]
+    publishing_schedule: str
+
+class SocialMedia(Model):
+    """Model for social media strategy"""
+    platforms: List[str]
+    strategy: str
+    engagement_tactics: List[str]
+
+class LaunchCampaign(Model):
+    """Model for launch campaign"""
+    pre_launch: str
+    launch_day: str
+    post_launch: str
+
+class BudgetRecommendations(Model):
+    """Model for budget recommendations"""
+    total_budget: str
+    allocation: Dict[str, str]
+
+class MarketingResponse(Model):
+    """Model for marketing response"""
+    brand_positioning: str
+    key_messages: List[str]
+    target_segments: List[TargetSegment]
+    marketing_channels: List[MarketingChannel]
+    content_strategy: MarketingContentStrategy
+    social_media: SocialMedia
+    launch_campaign: LaunchCampaign
+    budget_recommendations: BudgetRecommendations
+    success_metrics: List[str]
+    request_id: str = None  # request_id of the message this replies to
+    fallback: bool = False  # True when the agent returned canned data instead of a real result
+
+# CTO agent: technical strategy
+
+class TechnicalRequest(Model):
+    """Model for technical strategy request"""
+    idea: Dict[str, str]
+    product: Dict[str, Any]
+    research: Dict[str, Any]
+    deadline: float = None  # Epoch seconds by which the caller needs the result
+    request_id: str = None  # Echoed in the reply so message senders can correlate it
+
+class TechnologyStack(Model):
+    """Model for technology stack"""
+    frontend: List[str]
+    backend: List[str]
+    database: str
+    cloud_platform: str
+    ai_ml: List[str]
+
+class Architecture(Model):
+    """Model for system architecture"""
+    overview: str
+    components: List[str]
+    data_flow: str
+    api_design: str
+
+class DevelopmentMethodology(Model):
+    """Model for development methodology"""
+    approach: str
+    sprints: str
+    tools: List[str]
+    version_control: str
+
+class SecurityCompliance(Model):
+    """Model for security and compliance"""
+    security_measures: List[str]
+    compliance_requirements: List[str]
+    data_protection: str
+    authentication: str
+
+class Scalability(Model):
+    """Model for scalability strategy"""
+    performance_targets: str
+    scaling_strategy: str
+    monitoring: str
+    load_balancing: str
+
+class Integrations(Model):
+    """Model for integrations"""
+    third_party: List[str]
+    apis: str
+    data_sources: str
+
+class TimelinePhase(Model):
+    """Model for timeline phase"""
+    phase: str
+    duration: str
+    deliverables: List[str]
+
+class Timeline(Model):
+    """Model for development timeline"""
+    phases: List[TimelinePhase]
+    total_duration: str
+    milestones: List[str]
+
+class TeamStructure(Model):
+    """Model for team structure"""
+    roles_needed: List[str]
+    team_size: str
+    hiring_priority: List[str]
+
+class Infrastructure(Model):
+    """Model for infrastructure requirements"""
+    hosting: str
+    cdn: str
+    backup: str
+    monitoring: str
+
+class QualityAssurance(Model):
+    """Model for quality assurance"""
+    testing_strategy: str
+    automation: str
+    performance_testing: str
+    security_testing: str
+
+class TechnicalResponse(Model):
+    """Model for technical response"""
+    technology_stack: TechnologyStack
+    architecture: Architecture
+    development_methodology: DevelopmentMethodology
+    security_compliance: SecurityCompliance
+    scalability: Scalability
+    integrations: Integrations
+    timeline: Timeline
+    team_structure: TeamStructure
+    infrastructure: Infrastructure
+    quality_assurance: QualityAssurance
+    request_id: str = None  # request_id of the message this replies to
+    fallback: bool = False  # True when the agent returned canned data instead of a real result
+
+# Head of Engineering agent: Bolt website prompt
+
+class BoltPromptRequest(Model):
+    """Model for Bolt prompt request"""
+    idea: Dict[str, str]
+    product: Dict[str, Any]
+    research: Dict[str, Any]
+    marketing_strategy: Dict[str, Any]
+    technical_strategy: Dict[str, Any]
+    deadline: float = None  # Epoch seconds by which the caller needs the result
+    request_id: str = None  # Echoed in the reply so message senders can correlate it
+
+class DesignSpecifications(Model):
+    """Model for design specifications"""
+    color_scheme: str
+    typography: str
+    layout_style: str
+    responsive_design: str
+
+class WebsiteContentStrategy(Model):
+    """Model for content strategy"""
+    homepage_content: str
+    about_page: str
+    features_page: str
+    pricing_page: str
+    contact_page: str
+
+class TechnicalSpecifications(Model):
+    """Model for technical specifications"""
+    performance_requirements: str
+    seo_requirements: str
+    analytics_setup: str
+    security_requirements: str
+
+class BoltPromptResponse(Model):
+    """Model for Bolt prompt response"""
+    website_title: str
+    website_description: str
+    pages_required: List[str]
+    design_specifications: DesignSpecifications
+    functional_requirements: List[str]
+    content_strategy: WebsiteContentStrategy
+    technical_specifications: TechnicalSpecifications
+    integration_requirements: List[str]
+    bolt_prompt: str
+    request_id: str = None  # request_id of the message this replies to
+    fallback: bool = False  # True when the agent returned canned data instead of a real result
+
+# Finance agent: revenue analysis and reports
+
+class RevenueAnalysisRequest(Model):
+    """Model for revenue analysis request"""
+    idea_data: Dict[str, Any]
+    product_data: Dict[str, Any] = None
+    deadline: float = None  # Epoch seconds by which the caller needs the result
+    request_id: str = None  # Echoed in the reply so message senders can correlate it
+
+class RevenueProjection(Model):
+    """Model for revenue projection"""
+    minimum: float
+    maximum: float
+    most_likely: float
+    currency: str
+
+class RevenueAnalysisResponse(Model):
+    """Model for revenue analysis response"""
+    revenue_projection: RevenueProjection
+    timeline: str
+    revenue_sources: List[str]
+    risk_factors: List[str]
+    pricing_strategy: str
+    confidence_level: str
+    request_id: str = None  # request_id of the message this replies to
+    fallback: bool = False  # True when the agent returned canned data instead of a real result
+
+class FinancialReportRequest(Model):
+    """Model for financial report request"""
+    revenue_data: Dict[str, Any] = None
+    token_holder_data: Dict[str, Any] = None
+    contract_info: Dict[str, Any] = None
+
+class FinancialReportResponse(Model):
+    """Model for financial report response"""
+    report: str
+    summary: Dict[str, Any]
@@ -0,0 +1,173 @@
+"""
+Async ASI:One client for AI Company agents
+Keeps one keep-alive connection pool per agent and caps concurrent completions
+"""
+
+import os
+import json
+import time
+import asyncio
+import aiohttp
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, AsyncIterator
+
+DEFAULT_BASE_URL = 'https://api.asi1.ai/v1'
+DEFAULT_MODEL = 'asi1-mini'
+
+class ASIOneAPIError(Exception):
+    """Raised when ASI:One returns a non-200 response"""
+
+    def __init__(self, status: int, body: str = '', retry_after: Optional[float] = None):
+        super().__init__(f"ASI:One API error: {status}")
+        self.status = status
+        self.body = body
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+async def raise_for_response(response: aiohttp.ClientResponse):
+    """Raise ASIOneAPIError for any non-200 response"""
+    if response.status != 200:
+        raise ASIOneAPIError(
+            response.status,
+            await response.text(),
+            parse_retry_after(response.headers.get('Retry-After'))
+        )
+
+class ASIOneClient:
+    """asyncio-native ASI:One chat completions client
+
+    The aiohttp session is created lazily on first use so it binds to the
+    event loop the agent is actually running on.
+    """
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL,
+                 model: str = DEFAULT_MODEL, max_concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None, pool_size: Optional[int] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.max_concurrency = max_concurrency or int(os.getenv('ASI_ONE_MAX_CONCURRENCY', '8'))
+        self.timeout = timeout or float(os.getenv('ASI_ONE_TIMEOUT', '120'))
+        self.pool_size = pool_size or int(os.getenv('ASI_ONE_POOL_SIZE', str(self.max_concurrency)))
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on the running loop if needed"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'Authorization': f'Bearer {self.api_key}',
+                    'Content-Type': 'application/json'
+                }
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def build_payload(self, prompt: str, max_tokens: int, stream: bool = False) -> Dict[str, Any]:
+        """Build the chat completions request body"""
+        payload = {
+            'model': self.model,
+            'max_tokens': max_tokens,
+            'messages': [
+                {
+                    'role': 'user',
+                    'content': prompt
+                }
+            ]
+        }
+        if stream:
+            payload['stream'] = True
+        return payload
+
+    async def chat_completion(self, prompt: str, max_tokens: int = 1000,
+                              timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send one chat completion and return the decoded JSON body"""
+        session = self._get_session()
+        request_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                async with session.post(
+                    f"{self.base_url}/chat/completions",
+                    json=self.build_payload(prompt, max_tokens),
+                    timeout=request_timeout
+                ) as response:
+                    await raise_for_response(response)
+                    return await response.json(content_type=None)
+            finally:
+                self.in_flight -= 1
+
+    async def complete(self, prompt: str, max_tokens: int = 1000,
+                       timeout: Optional[float] = None) -> str:
+        """Send one chat completion and return the message content"""
+        result = await self.chat_completion(prompt, max_tokens, timeout)
+        return result['choices'][0]['message']['content']
+
+    async def stream_completion(self, prompt: str, max_tokens: int = 1000,
+                                timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Stream a chat completion, yielding content deltas from server-sent events"""
+        session = self._get_session()
+        request_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                async with session.post(
+                    f"{self.base_url}/chat/completions",
+                    json=self.build_payload(prompt, max_tokens, stream=True),
+                    timeout=request_timeout
+                ) as response:
+                    await raise_for_response(response)
+                    async for raw_line in response.content:
+                        line = raw_line.decode('utf-8').strip()
+                        if not line.startswith('data:'):
+                            continue
+                        data = line[len('data:'):].strip()
+                        if data == '[DONE]':
+                            break
+                        try:
+                            chunk = json.loads(data)
+                        except json.JSONDecodeError:
+                            continue
+                        choices = chunk.get('choices') or [{}]
+                        delta = choices[0].get('delta', {}).get('content')
+                        if delta:
+                            yield delta
+            finally:
+                self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool and concurrency figures"""
+        return {
+            'model': self.model,
+            'max_concurrency': self.max_concurrency,
+            'pool_size': self.pool_size,
+            'in_flight': self.in_flight,
+            'timeout': self.timeout
+        }
+
+    async def close(self):
+        """Close the underlying connection pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -4,23 +4,42 @@ Provides common functionality for all agents including ASI:One integration
 """
 
 import os
+import re
 import json
-import requests
-from typing import Dict, Any, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Type
 from dotenv import load_dotenv
 from uagents import Agent, Context, Model
+from asi_one_client import ASIOneAPIError, DEFAULT_BASE_URL
+from llm_cache import LLMResponseCache
+from json_stream import IncrementalJSONAssembler
+from json_extractor import extract_json
+from model_validation import get_validation_stats
+from singleflight import SingleFlight
+from inference_fallback_manager import create_inference_router
+from prompt_budget import PromptBudget, estimate_tokens
+from deadline import DeadlineExceededError, fit_max_tokens, time_left
 
 load_dotenv()
 
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.llm_cache')
+
+class LLMStatsResponse(Model):
+    """Model for LLM usage statistics"""
+    agent: str
+    stats: Dict[str, Any]
+
 class BaseUAgent:
     """Base class for all AI Company uAgents"""
     
-    def __init__(self, name: str, role: str, port: int):
+    def __init__(self, name: str, role: str, port: int, cache_ttl: Optional[int] = None,
+                 prompt_budget: Optional[int] = None):
         self.name = name
         self.role = role
         self.port = port
         self.api_key = os.getenv('ASI_ONE_API_KEY')
-        self.base_url = 'https://api.asi1.ai/v1'
+        self.base_url = os.getenv('ASI_ONE_BASE_URL', DEFAULT_BASE_URL)
         
         # Initialize the agent
         self.agent = Agent(
@@ -32,51 +51,222 @@ class BaseUAgent:
         
         if not self.api_key:
             raise ValueError(f"ASI_ONE_API_KEY not found for {name}")
+        
+        # Routes completions across ASI:One and any configured fallback backends;
+        # each backend keeps one keep-alive connection pool shared by all handlers
+        self.inference_router = create_inference_router(self.api_key, base_url=self.base_url)
+        
+        # Response cache keyed by (model, prompt, max_tokens); TTL can be set per agent
+        self.llm_cache = None
+        if os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true':
+            self.llm_cache = LLMResponseCache(
+                namespace=re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_'),
+                ttl=cache_ttl or int(os.getenv('LLM_CACHE_TTL', '86400')),
+                max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', '256')),
+                cache_dir=os.getenv('LLM_CACHE_DIR', DEFAULT_CACHE_DIR)
+            )
+        
+        # Cache key of each recent cached completion, so one that fails to parse can be evicted
+        self.completion_keys: "OrderedDict[str, str]" = OrderedDict()
+        
+        # Token budget for the upstream context embedded in this agent's prompts
+        self.prompt_budget = PromptBudget(prompt_budget or int(os.getenv('PROMPT_CONTEXT_BUDGET', '1500')))
+        
+        # Identical prompts already in flight share one upstream request
+        self.inflight = SingleFlight()
+        
+        # Estimated tokens sent to and received from upstream (cache hits excluded)
+        self.token_stats = {'upstream_calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+        
+        # Streaming latency counters (seconds)
+        self.stream_stats = {'streams': 0, 'time_to_first_field': 0.0, 'total_time': 0.0}
+        
+        # Completion JSON extraction counters (seconds)
+        self.parse_stats = {'parses': 0, 'parsed': 0, 'repaired': 0, 'total_time': 0.0}
+        
+        @self.agent.on_event("shutdown")
+        async def close_inference_router(ctx: Context):
+            await self.inference_router.close()
+        
+        @self.agent.on_rest_get("/llm-stats", LLMStatsResponse)
+        async def handle_llm_stats_rest(ctx: Context) -> LLMStatsResponse:
+            """REST endpoint exposing inference routing and cache counters"""
+            return LLMStatsResponse(agent=self.name, stats=self.get_llm_stats())
+    
+    async def call_asi_one(self, prompt: str, max_tokens: int = 1000,
+                           timeout: Optional[float] = None, use_cache: bool = True,
+                           stream: bool = False,
+                           on_field: Optional[Callable[[str, Any], None]] = None,
+                           deadline: Optional[float] = None) -> str:
+        """Call ASI:One API to generate response
+        
+        ``deadline`` (epoch seconds) caps the request timeout at the time left
+        and shrinks ``max_tokens`` to what can be generated in that time; once
+        it has passed no request is sent and DeadlineExceededError is raised.
+        
+        With ``stream=True`` the completion is consumed as server-sent chunks and
+        ``on_field(key, value)`` fires as each top-level JSON field closes. Cached
+        and non-streamed responses replay their fields to ``on_field`` as well.
+        
+        ``use_cache=False`` also opts out of sharing an identical in-flight request.
+        """
+        remaining = time_left(deadline)
+        if remaining is not None:
+            if remaining <= 0:
+                raise DeadlineExceededError(f"{self.name} deadline passed before calling ASI:One")
+            timeout = min(timeout, remaining) if timeout else remaining
+            fitted = fit_max_tokens(max_tokens, remaining)
+            if fitted < max_tokens:
+                print(f"⏳ [{self.name}] {remaining:.0f}s left, reducing max_tokens {max_tokens} -> {fitted}")
+                max_tokens = fitted
+        
+        if not use_cache:
+            return await self.fetch_asi_one(prompt, max_tokens, timeout, stream, on_field, deadline=deadline)
+        
+        fingerprint = LLMResponseCache.make_key(self.inference_router.primary.model, prompt, max_tokens)
+        if self.llm_cache:
+            cached = self.llm_cache.get(fingerprint)
+            if cached is not None:
+                print(f"⚡ [{self.name}] ASI:One cache hit ({len(cached)} chars)")
+                self.remember_completion_key(cached, fingerprint)
+                self.replay_fields(cached, on_field)
+                return cached
+        
+        joined = self.inflight.in_flight(fingerprint)
+        if joined:
+            print(f"🔗 [{self.name}] Joining identical in-flight ASI:One request")
+        content = await self.inflight.do(
+            fingerprint,
+            lambda: self.fetch_asi_one(prompt, max_tokens, timeout, stream, on_field, fingerprint, deadline)
+        )
+        if joined:
+            self.replay_fields(content, on_field)
+        return content
     
-    async def call_asi_one(self, prompt: str, max_tokens: int = 1000) -> str:
-        """Call ASI:One API to generate response"""
+    async def fetch_asi_one(self, prompt: str, max_tokens: int, timeout: Optional[float] = None,
+                            stream: bool = False,
+                            on_field: Optional[Callable[[str, Any], None]] = None,
+                            cache_key: Optional[str] = None, deadline: Optional[float] = None) -> str:
+        """Send one completion upstream and store it in the cache"""
         try:
             print(f"🔑 [{self.name}] Calling ASI:One API...")
             print(f"🔑 [{self.name}] API Key length: {len(self.api_key)}")
             print(f"🔑 [{self.name}] API Key starts with sk_: {self.api_key.startswith('sk_')}")
             
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers={
-                    'Authorization': f'Bearer {self.api_key}',
-                    'Content-Type': 'application/json'
-                },
-                json={
-                    'model': 'asi1-mini',
-                    'max_tokens': max_tokens,
-                    'messages': [
-                        {
-                            'role': 'user',
-                            'content': prompt
-                        }
-                    ]
-                },
-                timeout=120
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                content = result['choices'][0]['message']['content']
-                print(f"✅ [{self.name}] ASI:One response received ({len(content)} chars)")
-                return content
+            served_by = {}
+            if stream:
+                content = await self.stream_asi_one(prompt, max_tokens, timeout, on_field, served_by, deadline)
             else:
-                print(f"❌ [{self.name}] ASI:One API error: {response.status_code}")
-                print(f"❌ [{self.name}] Error response: {response.text}")
-                raise Exception(f"ASI:One API error: {response.status_code}")
+                content = await self.inference_router.complete(prompt, max_tokens, timeout=timeout,
+                                                               served_by=served_by, deadline=deadline)
+                self.replay_fields(content, on_field)
+            print(f"✅ [{self.name}] Response received from {served_by.get('backend', 'unknown')} ({len(content)} chars)")
+            self.token_stats['upstream_calls'] += 1
+            self.token_stats['prompt_tokens'] += estimate_tokens(prompt)
+            self.token_stats['completion_tokens'] += estimate_tokens(content)
+            if cache_key and self.llm_cache and served_by.get('cacheable', True):
+                self.llm_cache.set(cache_key, content)
+                self.remember_completion_key(content, cache_key)
+            return content
                 
+        except ASIOneAPIError as e:
+            print(f"❌ [{self.name}] ASI:One API error: {e.status}")
+            print(f"❌ [{self.name}] Error response: {e.body}")
+            raise e
         except Exception as e:
             print(f"❌ [{self.name}] Error calling ASI:One: {str(e)}")
             raise e
     
+    async def stream_asi_one(self, prompt: str, max_tokens: int, timeout: Optional[float] = None,
+                             on_field: Optional[Callable[[str, Any], None]] = None,
+                             served_by: Optional[Dict[str, Any]] = None,
+                             deadline: Optional[float] = None) -> str:
+        """Stream a completion, reporting top-level JSON fields as they close"""
+        started = time.monotonic()
+        first_field_at = None
+        assembler = IncrementalJSONAssembler()
+        chunks = []
+        
+        async for delta in self.inference_router.stream(prompt, max_tokens, timeout=timeout,
+                                                        served_by=served_by, deadline=deadline):
+            chunks.append(delta)
+            for key, value in assembler.feed(delta):
+                if first_field_at is None:
+                    first_field_at = time.monotonic() - started
+                    print(f"📡 [{self.name}] First field '{key}' ready after {first_field_at:.2f}s")
+                if on_field:
+                    on_field(key, value)
+        
+        total_time = time.monotonic() - started
+        self.stream_stats['streams'] += 1
+        self.stream_stats['time_to_first_field'] += first_field_at if first_field_at is not None else total_time
+        self.stream_stats['total_time'] += total_time
+        return ''.join(chunks)
+    
+    def fit_prompt_context(self, fields: Dict[str, Any], priorities: Dict[str, int]) -> Dict[str, str]:
+        """Render context fields for a prompt, compacting low-priority ones to fit the budget"""
+        rendered, saved = self.prompt_budget.fit(fields, priorities)
+        if saved:
+            used = sum(estimate_tokens(text) for text in rendered.values())
+            print(f"✂️ [{self.name}] Compacted prompt context: saved ~{saved} tokens ({used}/{self.prompt_budget.max_tokens} used)")
+        return rendered
+    
+    def replay_fields(self, content: str, on_field: Optional[Callable[[str, Any], None]]):
+        """Feed a complete response through on_field, as a stream would have"""
+        if not on_field:
+            return
+        for key, value in IncrementalJSONAssembler().feed(content):
+            on_field(key, value)
+    
+    def remember_completion_key(self, content: str, cache_key: str):
+        """Track which cache entry served a completion (the most recent 64 are kept)"""
+        self.completion_keys[content] = cache_key
+        self.completion_keys.move_to_end(content)
+        while len(self.completion_keys) > 64:
+            self.completion_keys.popitem(last=False)
+    
+    def parse_llm_json(self, response: str, model: Optional[Type[Model]] = None) -> Optional[Dict[str, Any]]:
+        """Extract the JSON object from a completion, repaired against ``model``'s schema
+        
+        Returns None when the completion holds no recoverable object, so the
+        caller can fall back to its default data. Such a completion is also
+        evicted from the LLM cache, so a retry asks upstream again instead of
+        replaying the same unusable text until it expires.
+        """
+        started = time.perf_counter()
+        data, repaired = extract_json(response, model)
+        stats = self.parse_stats
+        stats['parses'] += 1
+        stats['total_time'] += time.perf_counter() - started
+        if data is not None:
+            stats['parsed'] += 1
+            if repaired:
+                stats['repaired'] += 1
+                print(f"🩹 [{self.name}] Repaired malformed JSON in completion")
+        else:
+            self.evict_completion(response)
+        return data
+    
+    def evict_completion(self, response: str):
+        """Drop a completion the caller could not use from the LLM cache, if it came from there"""
+        cache_key = self.completion_keys.pop(response, None)
+        if cache_key and self.llm_cache:
+            self.llm_cache.delete(cache_key)
+            print(f"🗑️ [{self.name}] Evicted unusable completion from the LLM cache")
+    
+    def log_streamed_field(self, key: str, value: Any):
+        """Default on_field callback: log each field as it becomes available"""
+        print(f"📡 [{self.name}] Field ready: {key}")
+    
     def log_activity(self, activity: str, data: Dict[str, Any] = None):
         """Log agent activity"""
         print(f"[{self.name}] {activity}: {data or 'No data'}")
     
+    async def reply(self, ctx: Context, sender: str, request: Model, response: Model):
+        """Send ``response`` to ``sender``, echoing the request's ``request_id``"""
+        response.request_id = getattr(request, 'request_id', None)
+        await ctx.send(sender, response)
+    
     def get_agent_address(self) -> str:
         """Get the agent's address for communication"""
         return str(self.agent.address)
@@ -88,5 +278,30 @@ class BaseUAgent:
             'role': self.role,
             'port': self.port,
             'address': self.get_agent_address(),
-            'status': 'active'
+            'status': 'active',
+            'llm': self.get_llm_stats()
+        }
+    
+    def get_llm_stats(self) -> Dict[str, Any]:
+        """Get inference routing and response cache statistics"""
+        streams = self.stream_stats['streams']
+        parses = self.parse_stats['parses']
+        return {
+            'router': self.inference_router.get_stats(),
+            'cache': self.llm_cache.get_stats() if self.llm_cache else None,
+            'single_flight': self.inflight.get_stats(),
+            'prompt_budget': self.prompt_budget.get_stats(),
+            'tokens': dict(self.token_stats),
+            'streaming': {
+                'streams': streams,
+                'avg_time_to_first_field': round(self.stream_stats['time_to_first_field'] / streams, 3) if streams else None,
+                'avg_total_time': round(self.stream_stats['total_time'] / streams, 3) if streams else None
+            },
+            'json_parsing': {
+                'parses': parses,
+                'success_rate': round(self.parse_stats['parsed'] / parses, 3) if parses else None,
+                'repaired': self.parse_stats['repaired'],
+                'avg_parse_ms': round(self.parse_stats['total_time'] * 1000 / parses, 3) if parses else None
+            },
+            'model_validation': get_validation_stats()
         }
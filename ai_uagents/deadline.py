@@ -0,0 +1,52 @@
+"""
+Workflow deadlines for AI Company agents
+Splits a workflow's time budget across stages and sizes completions to the time left
+"""
+
+import os
+import time
+from typing import Optional
+
+class DeadlineExceededError(Exception):
+    """Raised when work is attempted after its deadline has passed"""
+
+class Deadline:
+    """Absolute wall-clock deadline, so it can be passed between agent processes
+
+    ``stage_deadline(share)`` gives a stage ``share`` of the time remaining,
+    leaving the rest for the stages that still have to run after it.
+    """
+
+    def __init__(self, budget: float):
+        self.expires_at = time.time() + budget
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+    def check(self, what: str):
+        """Raise DeadlineExceededError if the deadline has passed"""
+        if self.expired():
+            raise DeadlineExceededError(f"Workflow deadline exceeded before {what}")
+
+    def stage_deadline(self, share: float) -> float:
+        """Epoch seconds by which a stage given ``share`` of the remaining time should finish"""
+        return time.time() + self.remaining() * min(1.0, max(0.0, share))
+
+def fit_max_tokens(max_tokens: int, seconds: float) -> int:
+    """Shrink ``max_tokens`` to what can be generated in ``seconds``
+
+    Uses DEADLINE_TOKENS_PER_SECOND (default 50) as the expected generation
+    rate and never goes below DEADLINE_MIN_MAX_TOKENS (default 256).
+    """
+    tokens_per_second = float(os.getenv('DEADLINE_TOKENS_PER_SECOND', '50'))
+    floor = int(os.getenv('DEADLINE_MIN_MAX_TOKENS', '256'))
+    return max(min(max_tokens, floor), min(max_tokens, int(seconds * tokens_per_second)))
+
+def time_left(deadline: Optional[float]) -> Optional[float]:
+    """Seconds until an epoch ``deadline``, or None when there is none"""
+    if deadline is None:
+        return None
+    return deadline - time.time()
@@ -4,42 +4,17 @@ Handles financial analysis and revenue distribution
 """
 
 import json
-import re
-from typing import List, Dict, Any
-from uagents import Context, Model
+from typing import Dict, Any
+from uagents import Context
 from base_uagent import BaseUAgent
-
-class RevenueAnalysisRequest(Model):
-    """Model for revenue analysis request"""
-    idea_data: Dict[str, Any]
-    product_data: Dict[str, Any] = None
-
-class RevenueProjection(Model):
-    """Model for revenue projection"""
-    minimum: float
-    maximum: float
-    most_likely: float
-    currency: str
-
-class RevenueAnalysisResponse(Model):
-    """Model for revenue analysis response"""
-    revenue_projection: RevenueProjection
-    timeline: str
-    revenue_sources: List[str]
-    risk_factors: List[str]
-    pricing_strategy: str
-    confidence_level: str
-
-class FinancialReportRequest(Model):
-    """Model for financial report request"""
-    revenue_data: Dict[str, Any] = None
-    token_holder_data: Dict[str, Any] = None
-    contract_info: Dict[str, Any] = None
-
-class FinancialReportResponse(Model):
-    """Model for financial report response"""
-    report: str
-    summary: Dict[str, Any]
+from agent_models import (
+    RevenueAnalysisRequest,
+    RevenueProjection,
+    RevenueAnalysisResponse,
+    FinancialReportRequest,
+    FinancialReportResponse
+)
+from deadline import DeadlineExceededError
 
 class FinanceuAgent(BaseUAgent):
     """Finance uAgent for financial analysis and revenue distribution"""
@@ -58,82 +33,7 @@ class FinanceuAgent(BaseUAgent):
         @self.agent.on_message(model=RevenueAnalysisRequest)
         async def handle_revenue_analysis(ctx: Context, sender: str, msg: RevenueAnalysisRequest):
             """Analyze revenue potential for a project"""
-            try:
-                print(f"💰 [{self.name}] Analyzing revenue potential for: {msg.idea_data.get('title', 'Unknown')}")
-                
-                prompt = f"""As the Finance Agent for an AI company, analyze the revenue potential for this project:
-        
-IDEA: {json.dumps(msg.idea_data, indent=2)}
-{json.dumps(msg.product_data, indent=2) if msg.product_data else ''}
-
-Please provide:
-1. Estimated revenue range (minimum, maximum, most likely)
-2. Revenue timeline (when revenue might be generated)
-3. Revenue sources (how money would be made)
-4. Risk factors that could impact revenue
-5. Recommended pricing strategy
-
-Format your response as JSON with these fields:
-{{
-  "revenue_projection": {{
-    "minimum": number,
-    "maximum": number,
-    "most_likely": number,
-    "currency": "USD"
-  }},
-  "timeline": "string describing when revenue is expected",
-  "revenue_sources": ["source1", "source2"],
-  "risk_factors": ["risk1", "risk2"],
-  "pricing_strategy": "description",
-  "confidence_level": "high/medium/low"
-}}"""
-
-                response = await self.call_asi_one(prompt, 2000)
-                
-                # Clean the response to handle JSON parsing issues
-                cleaned_response = response
-                cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
-                cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                
-                # Try to extract JSON from the response if it's wrapped in markdown
-                json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
-                if json_match:
-                    cleaned_response = json_match.group(0)
-                
-                # Parse JSON response
-                try:
-                    analysis_data = json.loads(cleaned_response)
-                except json.JSONDecodeError:
-                    print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
-                    analysis_data = self.get_fallback_analysis_data()
-                
-                # Convert to response models
-                revenue_projection = RevenueProjection(**analysis_data.get('revenue_projection', {}))
-                
-                analysis_response = RevenueAnalysisResponse(
-                    revenue_projection=revenue_projection,
-                    timeline=analysis_data.get('timeline', '6-12 months'),
-                    revenue_sources=analysis_data.get('revenue_sources', []),
-                    risk_factors=analysis_data.get('risk_factors', []),
-                    pricing_strategy=analysis_data.get('pricing_strategy', 'Subscription model'),
-                    confidence_level=analysis_data.get('confidence_level', 'medium')
-                )
-                
-                self.log_activity('Revenue Analysis', {
-                    'idea_title': msg.idea_data.get('title', 'Unknown'),
-                    'most_likely_revenue': analysis_response.revenue_projection.most_likely,
-                    'confidence_level': analysis_response.confidence_level,
-                    'sender': sender
-                })
-                
-                # Send response back
-                await ctx.send(sender, analysis_response)
-                
-            except Exception as e:
-                print(f"❌ [{self.name}] Error analyzing revenue: {str(e)}")
-                # Send error response with fallback data
-                fallback_response = self.get_fallback_analysis_response()
-                await ctx.send(sender, fallback_response)
+            await self.reply(ctx, sender, msg, await self.analyze_revenue(msg))
         
         @self.agent.on_message(model=FinancialReportRequest)
         async def handle_financial_report(ctx: Context, sender: str, msg: FinancialReportRequest):
@@ -195,78 +95,7 @@ Format as a markdown report."""
         @self.agent.on_rest_post("/analyze-revenue", RevenueAnalysisRequest, RevenueAnalysisResponse)
         async def handle_analyze_revenue_rest(ctx: Context, req: RevenueAnalysisRequest) -> RevenueAnalysisResponse:
             """REST endpoint for revenue analysis"""
-            try:
-                print(f"💰 [{self.name}] REST: Analyzing revenue potential for: {req.idea_data.get('title', 'Unknown')}")
-                
-                prompt = f"""As the Finance Agent for an AI company, analyze the revenue potential for this project:
-        
-IDEA: {json.dumps(req.idea_data, indent=2)}
-{json.dumps(req.product_data, indent=2) if req.product_data else ''}
-
-Please provide:
-1. Estimated revenue range (minimum, maximum, most likely)
-2. Revenue timeline (when revenue might be generated)
-3. Revenue sources (how money would be made)
-4. Risk factors that could impact revenue
-5. Recommended pricing strategy
-
-Format your response as JSON with these fields:
-{{
-  "revenue_projection": {{
-    "minimum": number,
-    "maximum": number,
-    "most_likely": number,
-    "currency": "USD"
-  }},
-  "timeline": "string describing when revenue is expected",
-  "revenue_sources": ["source1", "source2"],
-  "risk_factors": ["risk1", "risk2"],
-  "pricing_strategy": "description",
-  "confidence_level": "high/medium/low"
-}}"""
-
-                response = await self.call_asi_one(prompt, 2000)
-                
-                # Clean the response to handle JSON parsing issues
-                cleaned_response = response
-                cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
-                cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                
-                # Try to extract JSON from the response if it's wrapped in markdown
-                json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
-                if json_match:
-                    cleaned_response = json_match.group(0)
-                
-                # Parse JSON response
-                try:
-                    analysis_data = json.loads(cleaned_response)
-                except json.JSONDecodeError:
-                    print(f"❌ [{self.name}] REST: JSON parsing failed, using fallback data")
-                    analysis_data = self.get_fallback_analysis_data()
-                
-                # Convert to response models
-                revenue_projection = RevenueProjection(**analysis_data.get('revenue_projection', {}))
-                
-                analysis_response = RevenueAnalysisResponse(
-                    revenue_projection=revenue_projection,
-                    timeline=analysis_data.get('timeline', '6-12 months'),
-                    revenue_sources=analysis_data.get('revenue_sources', []),
-                    risk_factors=analysis_data.get('risk_factors', []),
-                    pricing_strategy=analysis_data.get('pricing_strategy', 'Subscription model'),
-                    confidence_level=analysis_data.get('confidence_level', 'medium')
-                )
-                
-                self.log_activity('REST: Revenue Analysis', {
-                    'idea_title': req.idea_data.get('title', 'Unknown'),
-                    'most_likely_revenue': analysis_response.revenue_projection.most_likely,
-                    'confidence_level': analysis_response.confidence_level
-                })
-                
-                return analysis_response
-                
-            except Exception as e:
-                print(f"❌ [{self.name}] REST: Error analyzing revenue: {str(e)}")
-                return self.get_fallback_analysis_response()
+            return await self.analyze_revenue(req)
         
         @self.agent.on_rest_post("/generate-report", FinancialReportRequest, FinancialReportResponse)
         async def handle_generate_report_rest(ctx: Context, req: FinancialReportRequest) -> FinancialReportResponse:
@@ -320,6 +149,74 @@ Format as a markdown report."""
                     summary={'error': str(e)}
                 )
     
+    async def analyze_revenue(self, req: RevenueAnalysisRequest) -> RevenueAnalysisResponse:
+        """Analyze revenue potential for a project"""
+        try:
+            print(f"💰 [{self.name}] Analyzing revenue potential for: {req.idea_data.get('title', 'Unknown')}")
+            
+            prompt = f"""As the Finance Agent for an AI company, analyze the revenue potential for this project:
+        
+IDEA: {json.dumps(req.idea_data, indent=2)}
+{json.dumps(req.product_data, indent=2) if req.product_data else ''}
+
+Please provide:
+1. Estimated revenue range (minimum, maximum, most likely)
+2. Revenue timeline (when revenue might be generated)
+3. Revenue sources (how money would be made)
+4. Risk factors that could impact revenue
+5. Recommended pricing strategy
+
+Format your response as JSON with these fields:
+{{
+  "revenue_projection": {{
+    "minimum": number,
+    "maximum": number,
+    "most_likely": number,
+    "currency": "USD"
+  }},
+  "timeline": "string describing when revenue is expected",
+  "revenue_sources": ["source1", "source2"],
+  "risk_factors": ["risk1", "risk2"],
+  "pricing_strategy": "description",
+  "confidence_level": "high/medium/low"
+}}"""
+
+            response = await self.call_asi_one(prompt, 2000, deadline=req.deadline)
+            
+            # Parse JSON response, repaired against the response schema
+            analysis_data = self.parse_llm_json(response, RevenueAnalysisResponse)
+            fallback = analysis_data is None
+            if fallback:
+                print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
+                analysis_data = self.get_fallback_analysis_data()
+            
+            # Convert to response models
+            revenue_projection = RevenueProjection(**analysis_data.get('revenue_projection', {}))
+            
+            analysis_response = RevenueAnalysisResponse(
+                revenue_projection=revenue_projection,
+                timeline=analysis_data.get('timeline', '6-12 months'),
+                revenue_sources=analysis_data.get('revenue_sources', []),
+                risk_factors=analysis_data.get('risk_factors', []),
+                pricing_strategy=analysis_data.get('pricing_strategy', 'Subscription model'),
+                confidence_level=analysis_data.get('confidence_level', 'medium'),
+                fallback=fallback
+            )
+            
+            self.log_activity('Revenue Analysis', {
+                'idea_title': req.idea_data.get('title', 'Unknown'),
+                'most_likely_revenue': analysis_response.revenue_projection.most_likely,
+                'confidence_level': analysis_response.confidence_level
+            })
+            
+            return analysis_response
+            
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            print(f"❌ [{self.name}] Error analyzing revenue: {str(e)}")
+            return self.get_fallback_analysis_response()
+    
     def get_fallback_analysis_data(self) -> Dict[str, Any]:
         """Get fallback analysis data when API fails"""
         return {
@@ -345,7 +242,8 @@ Format as a markdown report."""
             revenue_sources=fallback_data['revenue_sources'],
             risk_factors=fallback_data['risk_factors'],
             pricing_strategy=fallback_data['pricing_strategy'],
-            confidence_level=fallback_data['confidence_level']
+            confidence_level=fallback_data['confidence_level'],
+            fallback=True
         )
 
 # Create the agent instance
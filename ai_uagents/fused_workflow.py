@@ -0,0 +1,100 @@
+"""
+Fused multi-section generation for the Workflow Orchestrator
+Asks for product, marketing, technical, Bolt and finance sections in one completion
+"""
+
+import json
+import typing
+from typing import Dict, Any, List, Optional, Tuple, Type
+from uagents import Model
+from json_extractor import conform_to_model
+from model_validation import build_model
+from agent_models import ProductResponse, MarketingResponse, TechnicalResponse, BoltPromptResponse, RevenueAnalysisResponse
+
+# (section key, response model) in the order the model should write them,
+# so later sections can build on earlier ones within the same completion
+FUSED_SECTIONS: List[Tuple[str, Type[Model]]] = [
+    ('product', ProductResponse),
+    ('marketing', MarketingResponse),
+    ('technical', TechnicalResponse),
+    ('bolt_prompt', BoltPromptResponse),
+    ('finance', RevenueAnalysisResponse)
+]
+
+# Message bookkeeping fields the completion should not be asked to fill in
+BOOKKEEPING_FIELDS = ('request_id', 'fallback')
+
+SECTION_GUIDANCE = {
+    'product': "Product concept: name, positioning, core features, target market, value proposition, go-to-market, revenue model, success metrics.",
+    'marketing': "Marketing strategy for that product: brand positioning, key messages, segments, channels, content, social media, launch campaign, budget.",
+    'technical': "Technical strategy for that product: stack, architecture, methodology, security, scalability, integrations, phased timeline, team, infrastructure, QA.",
+    'bolt_prompt': "A Bolt website-generation brief that reflects the product, marketing and technical sections.",
+    'finance': "Revenue analysis for the product: numeric projection range in USD, timeline, sources, risks, pricing strategy, confidence level."
+}
+
+def model_skeleton(model: Type[Model]) -> Any:
+    """Example JSON shape for a response model, derived from its annotations"""
+    hints = typing.get_type_hints(model)
+    return {name: type_skeleton(hints[name]) for name in model.__annotations__ if name not in BOOKKEEPING_FIELDS}
+
+def type_skeleton(annotation: Any) -> Any:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin in (list, List):
+        return [type_skeleton(args[0])] if args else []
+    if origin in (dict, Dict):
+        return {}
+    if origin is typing.Union:
+        return type_skeleton(next(arg for arg in args if arg is not type(None)))
+    if isinstance(annotation, type) and issubclass(annotation, Model):
+        return model_skeleton(annotation)
+    if annotation in (int, float):
+        return 0
+    return "..."
+
+def build_fused_prompt(idea: Dict[str, Any], context: Dict[str, str]) -> str:
+    """One prompt asking for every fused section as a single JSON object"""
+    skeleton = {}
+    guidance = []
+    for key, model in FUSED_SECTIONS:
+        skeleton[key] = model_skeleton(model)
+        guidance.append(f"- {key}: {SECTION_GUIDANCE[key]}")
+    sections = '\n'.join(guidance)
+
+    return f"""You are the leadership team of an AI company (product strategist, CMO, CTO, Head of Engineering and Finance). Develop a complete business plan for this idea in a single response.
+
+Original Idea:
+Title: {idea.get('title', 'Unknown')}
+Description: {idea.get('description', 'No description')}
+Revenue Model: {idea.get('revenue_model', 'No revenue model')}
+
+Research Data:
+Competitors: {context['competitors']}
+Market Analysis: {context['market_analysis']}
+Recommendations: {context['recommendations']}
+
+Write the sections in this order; each later section must be consistent with the earlier ones:
+{sections}
+
+Respond with only one JSON object in exactly this shape (replace every "..." and 0 with real content):
+{json.dumps(skeleton, indent=2)}"""
+
+def split_fused_response(data: Dict[str, Any]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Validate each section against its response model, after conforming it to the schema
+
+    Sections that are missing or do not fit their model come back as None so
+    the orchestrator can fall back to the staged agent call for just those.
+    """
+    sections: Dict[str, Optional[Dict[str, Any]]] = {}
+    for key, model in FUSED_SECTIONS:
+        section = data.get(key)
+        try:
+            if isinstance(section, dict):
+                conform_to_model(section, model)
+                sections[key] = build_model(model, section).dict()
+            else:
+                sections[key] = None
+        except Exception as e:
+            print(f"⚠️ [FUSED] Section '{key}' does not match {model.__name__}: {e}")
+            sections[key] = None
+    return sections
@@ -0,0 +1,502 @@
+"""
+Inference Fallback Manager for AI Company agents
+Routes completions across pluggable backends with per-backend circuit breakers
+"""
+
+import os
+import time
+import asyncio
+from typing import Dict, Any, List, Optional, AsyncIterator
+from asi_one_client import ASIOneClient, ASIOneAPIError, DEFAULT_BASE_URL, DEFAULT_MODEL
+from rate_governor import ASIOneRateGovernor
+from retry_policy import RetryPolicy, LatencyTracker
+from deadline import DeadlineExceededError, time_left
+
+class NoBackendAvailableError(Exception):
+    """Raised when every inference backend is unavailable"""
+
+def _cap_timeout(timeout: Optional[float], deadline: Optional[float]) -> Optional[float]:
+    """``timeout`` capped at the time left before an epoch ``deadline``"""
+    remaining = time_left(deadline)
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceededError("Deadline passed before the inference request was sent")
+    return min(timeout, remaining) if timeout else remaining
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for one backend"""
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.failure_threshold = failure_threshold or int(os.getenv('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
+        self.reset_timeout = reset_timeout or float(os.getenv('CIRCUIT_BREAKER_RESET_TIMEOUT', '30'))
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_in_flight = False
+
+    def is_available(self) -> bool:
+        """Check, without side effects, whether a request would be admitted"""
+        if self.state == 'closed':
+            return True
+        if self.state == 'open':
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+        return not self.half_open_in_flight
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent, moving open -> half-open after the timeout"""
+        if self.state == 'closed':
+            return True
+        if self.state == 'open':
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = 'half_open'
+            self.half_open_in_flight = False
+        # Half-open: let a single probe through
+        if self.half_open_in_flight:
+            return False
+        self.half_open_in_flight = True
+        return True
+
+    def release_probe(self):
+        """Free the half-open probe slot of a request that ended without an outcome (cancelled)"""
+        self.half_open_in_flight = False
+
+    def record_success(self):
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.half_open_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.half_open_in_flight = False
+        if self.state == 'half_open' or self.consecutive_failures >= self.failure_threshold:
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+
+class InferenceBackend:
+    """Base class for inference backends
+
+    Subclasses implement ``_complete`` and ``_stream``; this class keeps the
+    live latency / error-rate figures the router ranks backends by.
+    """
+
+    # Whether responses from this backend may be stored in the LLM response cache
+    cacheable = True
+    # Ranking tier: a backend is only preferred over another in a lower tier when
+    # that one is unavailable, whatever their latencies (last-resort backends use 1)
+    tier = 0
+
+    def __init__(self, name: str, model: str):
+        self.name = name
+        self.model = model
+        self.breaker = CircuitBreaker()
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.last_failure_at = 0.0
+        self.latency_trackers: Dict[int, LatencyTracker] = {}
+
+    async def _complete(self, prompt: str, max_tokens: int, timeout: Optional[float],
+                        deadline: Optional[float] = None) -> str:
+        raise NotImplementedError
+
+    async def _stream(self, prompt: str, max_tokens: int, timeout: Optional[float],
+                      deadline: Optional[float] = None) -> AsyncIterator[str]:
+        # Backends without native streaming yield the whole completion at once
+        yield await self._complete(prompt, max_tokens, timeout, deadline)
+
+    async def complete(self, prompt: str, max_tokens: int, timeout: Optional[float] = None,
+                       deadline: Optional[float] = None) -> str:
+        """Run one completion and record its outcome"""
+        started = time.monotonic()
+        try:
+            content = await self._complete(prompt, max_tokens, timeout, deadline)
+        except asyncio.CancelledError:
+            # Lost a hedge, cancelled by a sibling stage or a deadline: no verdict on
+            # the backend, but a half-open probe must not stay in flight forever
+            self.breaker.release_probe()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        latency = time.monotonic() - started
+        self.record_success(latency)
+        self.latency_trackers.setdefault(max_tokens, LatencyTracker()).record(latency)
+        return content
+
+    async def stream(self, prompt: str, max_tokens: int, timeout: Optional[float] = None,
+                     deadline: Optional[float] = None) -> AsyncIterator[str]:
+        """Stream one completion and record its outcome"""
+        started = time.monotonic()
+        try:
+            async for delta in self._stream(prompt, max_tokens, timeout, deadline):
+                yield delta
+        except (asyncio.CancelledError, GeneratorExit):
+            self.breaker.release_probe()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - started)
+
+    def record_success(self, latency: float):
+        self.requests += 1
+        self.error_rate *= 0.8
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+        self.breaker.record_success()
+
+    def record_failure(self):
+        self.requests += 1
+        self.failures += 1
+        self.error_rate = 0.8 * self.recent_error_rate() + 0.2
+        self.last_failure_at = time.monotonic()
+        self.breaker.record_failure()
+
+    def hedge_delay(self, max_tokens: int) -> Optional[float]:
+        """Observed p95 latency for this request size, if known"""
+        tracker = self.latency_trackers.get(max_tokens)
+        return tracker.percentile(0.95) if tracker else None
+
+    def recent_error_rate(self) -> float:
+        """Error rate decayed with a 30s half-life, so an idle backend earns back traffic"""
+        idle = time.monotonic() - self.last_failure_at
+        return self.error_rate * 0.5 ** (idle / 30.0)
+
+    def score(self) -> float:
+        """Lower is better: latency inflated by recent error rate"""
+        latency = self.latency_ewma if self.latency_ewma is not None else 0.0
+        error_rate = self.recent_error_rate()
+        return latency * (1 + 4 * error_rate) + 60 * error_rate
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'model': self.model,
+            'circuit': self.breaker.state,
+            'latency_ewma': round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            'error_rate': round(self.recent_error_rate(), 3),
+            'requests': self.requests,
+            'failures': self.failures
+        }
+
+    async def close(self):
+        pass
+
+class OpenAICompatibleBackend(InferenceBackend):
+    """Any endpoint speaking the OpenAI chat completions protocol"""
+
+    def __init__(self, name: str, base_url: str, api_key: str, model: str):
+        super().__init__(name, model)
+        self.client = ASIOneClient(api_key, base_url=base_url, model=model)
+
+    async def _complete(self, prompt: str, max_tokens: int, timeout: Optional[float],
+                        deadline: Optional[float] = None) -> str:
+        return await self.client.complete(prompt, max_tokens, timeout=timeout)
+
+    async def _stream(self, prompt: str, max_tokens: int, timeout: Optional[float],
+                      deadline: Optional[float] = None) -> AsyncIterator[str]:
+        async for delta in self.client.stream_completion(prompt, max_tokens, timeout=timeout):
+            yield delta
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['client'] = self.client.get_stats()
+        return stats
+
+    async def close(self):
+        await self.client.close()
+
+class ASIOneBackend(OpenAICompatibleBackend):
+    """ASI:One, metered by the host-wide rate governor"""
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL, model: str = DEFAULT_MODEL):
+        super().__init__('asi_one', base_url, api_key, model)
+        self.rate_governor = None
+        if os.getenv('ASI_ONE_GOVERNOR_ENABLED', 'true').lower() == 'true':
+            self.rate_governor = ASIOneRateGovernor()
+
+    async def _governed(self, deadline: Optional[float]):
+        if self.rate_governor:
+            await self.rate_governor.acquire(deadline)
+        return time.monotonic()
+
+    def _release(self, status: int, started: float):
+        if self.rate_governor:
+            self.rate_governor.release(status, time.monotonic() - started)
+
+    async def _complete(self, prompt: str, max_tokens: int, timeout: Optional[float],
+                        deadline: Optional[float] = None) -> str:
+        started = await self._governed(deadline)
+        status = 0
+        try:
+            content = await super()._complete(prompt, max_tokens, _cap_timeout(timeout, deadline))
+            status = 200
+            return content
+        except ASIOneAPIError as e:
+            status = e.status
+            raise
+        finally:
+            self._release(status, started)
+
+    async def _stream(self, prompt: str, max_tokens: int, timeout: Optional[float],
+                      deadline: Optional[float] = None) -> AsyncIterator[str]:
+        started = await self._governed(deadline)
+        status = 0
+        try:
+            async for delta in super()._stream(prompt, max_tokens, _cap_timeout(timeout, deadline)):
+                yield delta
+            status = 200
+        except ASIOneAPIError as e:
+            status = e.status
+            raise
+        finally:
+            self._release(status, started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['governor'] = self.rate_governor.get_stats() if self.rate_governor else None
+        return stats
+
+class LocalStubBackend(InferenceBackend):
+    """Offline last-resort backend returning a fixed response"""
+
+    cacheable = False
+    tier = 1
+
+    def __init__(self, response: Optional[str] = None):
+        super().__init__('local_stub', 'stub')
+        self.response = response if response is not None else os.getenv('INFERENCE_STUB_RESPONSE', '{}')
+
+    async def _complete(self, prompt: str, max_tokens: int, timeout: Optional[float],
+                        deadline: Optional[float] = None) -> str:
+        return self.response
+
+class InferenceRouter:
+    """Routes each completion to the healthiest available backend
+
+    Backends are ranked by tier (last-resort backends such as the local stub
+    come after every real one), then live latency and error rate, with
+    configuration order breaking ties; backends whose circuit is open are
+    skipped. A failed attempt moves on to the next-best backend straight away
+    and only backs off (honoring Retry-After) when it has to reuse the same
+    one. Optional hedging sends a duplicate to the next-best backend of the
+    same tier once a call outlives that backend's observed p95 latency.
+    """
+
+    def __init__(self, backends: List[InferenceBackend], retry_policy: Optional[RetryPolicy] = None,
+                 hedge_enabled: Optional[bool] = None):
+        if not backends:
+            raise ValueError("InferenceRouter needs at least one backend")
+        self.backends = backends
+        self.retry_policy = retry_policy or RetryPolicy()
+        if hedge_enabled is None:
+            hedge_enabled = os.getenv('ASI_ONE_HEDGE_ENABLED', 'false').lower() == 'true'
+        self.hedge_enabled = hedge_enabled
+        self.stats = {'retries': 0, 'failovers': 0, 'hedges': 0, 'hedge_wins': 0}
+
+    @property
+    def primary(self) -> InferenceBackend:
+        return self.backends[0]
+
+    def ranked_backends(self) -> List[InferenceBackend]:
+        """Backends ordered best-first by tier, score, then configuration order"""
+        order = {id(backend): index for index, backend in enumerate(self.backends)}
+        return sorted(self.backends, key=lambda b: (b.tier, round(b.score(), 1), order[id(b)]))
+
+    def pick_backend(self, exclude: Optional[InferenceBackend] = None) -> Optional[InferenceBackend]:
+        """Best backend whose circuit admits a request"""
+        for backend in self.ranked_backends():
+            if backend is exclude:
+                continue
+            if backend.breaker.allow_request():
+                return backend
+        return None
+
+    def next_available(self) -> Optional[InferenceBackend]:
+        """Backend the next attempt would use, without consuming a half-open probe"""
+        for backend in self.ranked_backends():
+            if backend.breaker.is_available():
+                return backend
+        return None
+
+    def should_retry(self, attempt: int, error: Exception, previous: InferenceBackend) -> bool:
+        """Retry transient errors; fail over on any error while another backend is healthy"""
+        if attempt + 1 >= self.retry_policy.max_attempts:
+            return False
+        if self.retry_policy.is_retryable(error):
+            return True
+        upcoming = self.next_available()
+        return upcoming is not None and upcoming is not previous
+
+    async def _before_retry(self, attempt: int, error: Exception, previous: InferenceBackend,
+                            deadline: Optional[float] = None):
+        """Back off only if the next attempt would land on the same backend
+
+        Raises DeadlineExceededError instead when ``deadline`` leaves no time
+        for another attempt after the backoff.
+        """
+        remaining = time_left(deadline)
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(f"Deadline passed after {previous.name} failed ({error})") from error
+        self.stats['retries'] += 1
+        upcoming = self.next_available()
+        if upcoming is not None and upcoming is not previous:
+            self.stats['failovers'] += 1
+            print(f"🔀 [ROUTER] {previous.name} failed ({error}), failing over to {upcoming.name}")
+            return
+        delay = self.retry_policy.backoff(attempt, getattr(error, 'retry_after', None))
+        if remaining is not None and delay >= remaining:
+            raise DeadlineExceededError(f"No time left to retry {previous.name} ({error})") from error
+        print(f"🔁 [ROUTER] {previous.name} failed ({error}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    async def complete(self, prompt: str, max_tokens: int, timeout: Optional[float] = None,
+                       served_by: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None) -> str:
+        """Get a completion from the best backend, failing over on errors
+
+        If ``served_by`` is given it is filled with the name and cacheability of
+        the backend that produced the answer. ``deadline`` (epoch seconds)
+        bounds every attempt, backoff, hedge and rate-governor wait together;
+        once it has passed DeadlineExceededError is raised.
+        """
+        last_error: Optional[Exception] = None
+        for attempt in range(self.retry_policy.max_attempts):
+            attempt_timeout = _cap_timeout(timeout, deadline)
+            backend = self.pick_backend()
+            if backend is None:
+                break
+            try:
+                return await self._hedged(backend, prompt, max_tokens, attempt_timeout, served_by, deadline)
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                last_error = e
+                if not self.should_retry(attempt, e, backend):
+                    raise
+                await self._before_retry(attempt, e, backend, deadline)
+        if last_error:
+            raise last_error
+        raise NoBackendAvailableError("All inference backends are unavailable")
+
+    async def _hedged(self, backend: InferenceBackend, prompt: str, max_tokens: int,
+                      timeout: Optional[float], served_by: Optional[Dict[str, Any]] = None,
+                      deadline: Optional[float] = None) -> str:
+        hedge_after = backend.hedge_delay(max_tokens) if self.hedge_enabled else None
+        remaining = time_left(deadline)
+        if hedge_after is not None and remaining is not None and hedge_after >= remaining:
+            # A hedge could not start before the deadline
+            hedge_after = None
+        if hedge_after is None:
+            content = await backend.complete(prompt, max_tokens, timeout, deadline)
+            self._mark_served(served_by, backend)
+            return content
+
+        primary = asyncio.ensure_future(backend.complete(prompt, max_tokens, timeout, deadline))
+        tasks = {primary}
+        task_backends = {primary: backend}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                hedge_backend = self.pick_backend(exclude=backend)
+                if hedge_backend is None or hedge_backend.tier > backend.tier:
+                    # Never race a real backend against a canned answer
+                    if hedge_backend is not None:
+                        hedge_backend.breaker.release_probe()
+                    hedge_backend = backend
+                print(f"🏇 [ROUTER] {backend.name} passed p95 ({hedge_after:.1f}s), hedging on {hedge_backend.name}")
+                self.stats['hedges'] += 1
+                hedge = asyncio.ensure_future(hedge_backend.complete(
+                    prompt, max_tokens, _cap_timeout(timeout, deadline), deadline
+                ))
+                tasks.add(hedge)
+                task_backends[hedge] = hedge_backend
+
+            error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats['hedge_wins'] += 1
+                        self._mark_served(served_by, task_backends[task])
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _mark_served(served_by: Optional[Dict[str, Any]], backend: InferenceBackend):
+        if served_by is not None:
+            served_by['backend'] = backend.name
+            served_by['cacheable'] = backend.cacheable
+
+    async def stream(self, prompt: str, max_tokens: int, timeout: Optional[float] = None,
+                     served_by: Optional[Dict[str, Any]] = None,
+                     deadline: Optional[float] = None) -> AsyncIterator[str]:
+        """Stream from the best backend; fail over only before the first chunk arrives"""
+        last_error: Optional[Exception] = None
+        for attempt in range(self.retry_policy.max_attempts):
+            attempt_timeout = _cap_timeout(timeout, deadline)
+            backend = self.pick_backend()
+            if backend is None:
+                break
+            started = False
+            self._mark_served(served_by, backend)
+            try:
+                async for delta in backend.stream(prompt, max_tokens, attempt_timeout, deadline):
+                    started = True
+                    yield delta
+                return
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                last_error = e
+                if started or not self.should_retry(attempt, e, backend):
+                    raise
+                await self._before_retry(attempt, e, backend, deadline)
+        if last_error:
+            raise last_error
+        raise NoBackendAvailableError("All inference backends are unavailable")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get routing counters and per-backend health"""
+        return dict(
+            self.stats,
+            hedge_enabled=self.hedge_enabled,
+            backends={backend.name: backend.get_stats() for backend in self.backends}
+        )
+
+    async def close(self):
+        for backend in self.backends:
+            await backend.close()
+
+def create_inference_router(api_key: str, base_url: str = DEFAULT_BASE_URL) -> InferenceRouter:
+    """Build the router from INFERENCE_BACKENDS (comma-separated, in preference order)"""
+    backends: List[InferenceBackend] = []
+    for name in os.getenv('INFERENCE_BACKENDS', 'asi_one').split(','):
+        name = name.strip()
+        if name == 'asi_one':
+            backends.append(ASIOneBackend(api_key, base_url=base_url))
+        elif name == 'openai_compatible':
+            compat_url = os.getenv('OPENAI_COMPAT_BASE_URL')
+            if not compat_url:
+                print("⚠️ [ROUTER] OPENAI_COMPAT_BASE_URL not set, skipping openai_compatible backend")
+                continue
+            backends.append(OpenAICompatibleBackend(
+                'openai_compatible',
+                compat_url,
+                os.getenv('OPENAI_COMPAT_API_KEY', ''),
+                os.getenv('OPENAI_COMPAT_MODEL', 'gpt-4o-mini')
+            ))
+        elif name == 'local_stub':
+            backends.append(LocalStubBackend())
+        elif name:
+            print(f"⚠️ [ROUTER] Unknown inference backend '{name}', skipping")
+    if not backends:
+        backends.append(ASIOneBackend(api_key, base_url=base_url))
+    return InferenceRouter(backends)
@@ -0,0 +1,175 @@
+"""
+Schema-guided JSON extraction for LLM completions
+Finds the outermost JSON object in one pass and repairs common LLM mistakes
+"""
+
+import re
+import json
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Type, Union, get_origin, get_args
+from uagents import Model
+
+# strict=False accepts raw newlines and tabs inside strings, the most common LLM slip
+_decoder = json.JSONDecoder(strict=False)
+# A whole-string number, optionally with a currency symbol and thousands separators,
+# or a score out of ten ("8/10"); anything with other words ("1.2 million") is left alone
+_NUMBER = re.compile(r'([-+]?)\s*[$€£¥]?\s*(\d{1,3}(?:,\d{3})+|\d+)(\.\d+)?|(\d+(?:\.\d+)?)\s*/\s*10')
+_STRING_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+_CLOSERS = {'{': '}', '[': ']'}
+_TRUE_WORDS = ('true', 'yes', 'y', 'go', '1')
+
+def extract_json(text: str, model: Optional[Type[Model]] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Return ``(object, repaired)`` for the outermost JSON object in ``text``
+
+    Prose and code fences around the object are skipped. When the object does
+    not decode as-is it is rebuilt by ``repair_json_object``; with ``model`` the
+    result is then conformed to the model's field names and types. ``object``
+    is None when no JSON object can be recovered.
+    """
+    start = text.find('{') if text else -1
+    if start < 0:
+        return None, False
+    repaired = False
+    try:
+        data, _ = _decoder.raw_decode(text, start)
+    except json.JSONDecodeError:
+        fixed = repair_json_object(text, start)
+        try:
+            data = _decoder.decode(fixed)
+        except json.JSONDecodeError:
+            return None, False
+        repaired = True
+    if not isinstance(data, dict):
+        return None, False
+    if model is not None:
+        repaired = conform_to_model(data, model) or repaired
+    return data, repaired
+
+def repair_json_object(text: str, start: int = 0) -> str:
+    """Rebuild the object starting at ``text[start]`` in a single scan
+
+    Control characters inside strings are escaped (or dropped), trailing
+    commas are removed, mismatched closing brackets are corrected and an
+    object cut off by the token limit is closed. Scanning stops at the
+    bracket that closes the outermost object, so trailing prose is ignored.
+    """
+    out = []
+    stack = []
+    in_string = escape = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+            elif char < ' ':
+                out.append(_STRING_ESCAPES.get(char, ''))
+                continue
+            out.append(char)
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char in '{[':
+            stack.append(char)
+            out.append(char)
+        elif char in '}]':
+            if not stack:
+                continue
+            _drop_trailing_comma(out)
+            out.append(_CLOSERS[stack.pop()])
+            if not stack:
+                break
+        elif char >= ' ' or char in '\n\r\t':
+            out.append(char)
+    if stack:
+        # Truncated completion: finish the open string and value, then close every bracket
+        if in_string:
+            if escape:
+                out.pop()
+            out.append('"')
+        while out and out[-1].isspace():
+            out.pop()
+        if out and out[-1] == ':':
+            out.append('null')
+        _drop_trailing_comma(out)
+        out.extend(_CLOSERS[opener] for opener in reversed(stack))
+    return ''.join(out)
+
+def _drop_trailing_comma(out: list):
+    end = len(out)
+    while end and out[end - 1].isspace():
+        end -= 1
+    if end and out[end - 1] == ',':
+        del out[end - 1:]
+
+@lru_cache(maxsize=None)
+def model_fields(model: Type[Model]) -> Dict[str, Any]:
+    """Field name -> annotation for a Model subclass, including inherited fields"""
+    fields = {}
+    for cls in reversed(model.__mro__):
+        if cls is not Model and issubclass(cls, Model):
+            fields.update(cls.__dict__.get('__annotations__', {}))
+    return fields
+
+def _normalize_key(key: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', key.lower()).strip('_')
+
+def conform_to_model(data: Dict[str, Any], model: Type[Model]) -> bool:
+    """Rename keys and coerce values in place to match ``model``; True if anything changed"""
+    fields = model_fields(model)
+    changed = False
+    for key in list(data):
+        if key not in fields:
+            normalized = _normalize_key(key)
+            if normalized in fields and normalized not in data:
+                data[normalized] = data.pop(key)
+                changed = True
+    for name, annotation in fields.items():
+        if name in data:
+            value, coerced = coerce_value(data[name], annotation)
+            if coerced:
+                data[name] = value
+                changed = True
+    return changed
+
+def coerce_value(value: Any, annotation: Any) -> Tuple[Any, bool]:
+    """Coerce ``value`` towards ``annotation``; returns ``(value, changed)``"""
+    if value is None or isinstance(annotation, str):
+        return value, False
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is Union:
+        options = [arg for arg in args if arg is not type(None)]
+        return coerce_value(value, options[0]) if len(options) == 1 else (value, False)
+    if origin is list:
+        changed = False
+        if not isinstance(value, list):
+            value, changed = [value], True
+        if args:
+            items = [coerce_value(item, args[0]) for item in value]
+            if any(item_changed for _, item_changed in items):
+                value, changed = [item for item, _ in items], True
+        return value, changed
+    if origin is dict:
+        if isinstance(value, dict) and len(args) == 2:
+            items = {key: coerce_value(item, args[1]) for key, item in value.items()}
+            if any(item_changed for _, item_changed in items.values()):
+                return {key: item for key, (item, _) in items.items()}, True
+        return value, False
+    if isinstance(annotation, type) and issubclass(annotation, Model):
+        return value, isinstance(value, dict) and conform_to_model(value, annotation)
+    if annotation is str and not isinstance(value, str):
+        if isinstance(value, list):
+            return ', '.join(str(item) for item in value), True
+        return (value, False) if isinstance(value, dict) else (str(value), True)
+    if annotation is bool and isinstance(value, str):
+        return value.strip().lower() in _TRUE_WORDS, True
+    if annotation in (int, float) and isinstance(value, str):
+        match = _NUMBER.fullmatch(value.strip())
+        if match:
+            sign, whole, fraction, score = match.groups()
+            number = float(score) if score else float(sign + whole.replace(',', '') + (fraction or ''))
+            return annotation(number), True
+    return value, False
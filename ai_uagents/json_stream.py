@@ -0,0 +1,82 @@
+"""
+Incremental JSON assembly for streamed LLM completions
+Reports each top-level field of a JSON object as soon as its value closes
+"""
+
+import json
+from typing import Dict, Any, List, Tuple
+
+class IncrementalJSONAssembler:
+    """Assembles a streamed JSON object and emits completed top-level fields
+
+    Text before the first ``{`` (prose, code fences) is ignored. Each
+    top-level member is parsed on its own as soon as the ``,`` or ``}`` that
+    ends it arrives, so callers can act on early fields while the rest of the
+    completion is still being generated.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Append streamed text and return the fields completed by it"""
+        completed = []
+        if self.done:
+            return completed
+        self.buffer += text
+
+        while self._pos < len(self.buffer):
+            char = self.buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if char == '{':
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._close_member(self._pos))
+                    self.done = True
+                    self._pos += 1
+                    break
+            elif char == ',' and self._depth == 1:
+                completed.extend(self._close_member(self._pos))
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+        return completed
+
+    def _close_member(self, end: int) -> List[Tuple[str, Any]]:
+        """Parse the member between the last separator and ``end``"""
+        member = self.buffer[self._member_start:end].strip()
+        if not member:
+            return []
+        try:
+            parsed = json.loads('{' + member + '}')
+        except json.JSONDecodeError:
+            return []
+        self.fields.update(parsed)
+        return list(parsed.items())
+
+    def result(self) -> Dict[str, Any]:
+        """Get every field completed so far"""
+        return dict(self.fields)
@@ -0,0 +1,133 @@
+"""
+Content-addressed LLM response cache for AI Company agents
+In-memory LRU tier backed by an on-disk tier that survives restarts
+"""
+
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + disk) cache for LLM completions
+
+    Entries are keyed by a hash of (model, prompt, max_tokens) and expire
+    after ``ttl`` seconds in both tiers.
+    """
+
+    def __init__(self, namespace: str, ttl: int, max_entries: int = 256,
+                 cache_dir: Optional[str] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = os.path.join(cache_dir, namespace) if cache_dir else None
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model: str, prompt: str, max_tokens: int) -> str:
+        """Build the content address for a completion request"""
+        payload = json.dumps([model, prompt, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry['created_at'] < self.ttl
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self._is_fresh(entry):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ [LLM CACHE] Could not persist entry for {self.namespace}: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached completion, checking memory before disk"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            if self._is_fresh(entry):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry['content']
+            del self._memory[key]
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+            self.disk_hits += 1
+            return entry['content']
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, content: str):
+        """Store a completion in both tiers"""
+        entry = {'created_at': time.time(), 'content': content}
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        self.writes += 1
+
+    def delete(self, key: str):
+        """Drop a completion from both tiers, e.g. one that turned out to be unusable"""
+        self._memory.pop(key, None)
+        if self.cache_dir:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+        self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'namespace': self.namespace,
+            'ttl': self.ttl,
+            'memory_entries': len(self._memory),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+        }
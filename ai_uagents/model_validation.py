@@ -0,0 +1,107 @@
+"""
+Cached model validation for AI Company agents
+Builds nested response models in one call, validating or constructing from trusted data
+"""
+
+import os
+import time
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Optional, Tuple, Type, Union, get_origin, get_args
+from uagents import Model
+from json_extractor import model_fields
+
+# Process-wide counters (seconds)
+_stats = {'validated': 0, 'constructed': 0, 'construct_fallbacks': 0, 'validate_time': 0.0, 'construct_time': 0.0}
+
+class UntrustedDataError(Exception):
+    """Raised by the construct path when data lacks a required field"""
+
+@lru_cache(maxsize=None)
+def validator_for(model: Type[Model]) -> Callable[[Dict[str, Any]], Model]:
+    """The one-pass validator for ``model``, resolved once per class
+
+    pydantic v2 compiles each model's nested schema into a single validator
+    at class creation (``model_validate``); pydantic v1 validates the nested
+    structure in one ``parse_obj`` call.
+    """
+    return model.model_validate if hasattr(model, 'model_validate') else model.parse_obj
+
+@lru_cache(maxsize=None)
+def construct_plan(model: Type[Model]) -> List[Tuple[str, Optional[Callable[[Any], Any]], bool]]:
+    """Per field of ``model``: (name, builder for nested models or None, required)"""
+    if hasattr(model, 'model_fields'):
+        required = {name for name, field in model.model_fields.items() if field.is_required()}
+    else:
+        required = {name for name, field in model.__fields__.items() if field.required}
+    return [(name, _nested_builder(annotation), name in required)
+            for name, annotation in model_fields(model).items()]
+
+def _nested_builder(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is Union:
+        options = [arg for arg in args if arg is not type(None)]
+        return _nested_builder(options[0]) if len(options) == 1 else None
+    if origin is list and args:
+        item = _nested_builder(args[0])
+        return (lambda value: [item(entry) for entry in value] if isinstance(value, list) else value) if item else None
+    if origin is dict and len(args) == 2:
+        item = _nested_builder(args[1])
+        return (lambda value: {key: item(entry) for key, entry in value.items()} if isinstance(value, dict) else value) if item else None
+    if isinstance(annotation, type) and issubclass(annotation, Model):
+        return lambda value: construct_model(annotation, value) if isinstance(value, dict) else value
+    return None
+
+def construct_model(model: Type[Model], data: Dict[str, Any]) -> Model:
+    """Build ``model`` and its nested models from ``data`` without revalidating
+
+    Field types are trusted; a missing required field raises
+    UntrustedDataError so the caller can validate instead.
+    """
+    values = {}
+    for name, build, required in construct_plan(model):
+        if name in data:
+            value = data[name]
+            values[name] = build(value) if build and value is not None else value
+        elif required:
+            raise UntrustedDataError(f"{model.__name__}.{name} is missing")
+    return model.model_construct(**values) if hasattr(model, 'model_construct') else model.construct(**values)
+
+def build_model(model: Type[Model], data: Dict[str, Any], trusted: bool = False) -> Model:
+    """Build ``model`` (nested models included) from ``data`` in one call
+
+    ``trusted=True`` is only for hand-written data such as an agent's
+    fallback responses; LLM output is always validated, even after
+    BaseUAgent.parse_llm_json has conformed it to the schema, since
+    conforming fixes shapes but not every type. On pydantic v1 trusted data
+    is constructed without revalidation, unless required fields are
+    missing or MODEL_TRUSTED_CONSTRUCT is false. pydantic v2's compiled
+    validator beats constructing nested models in Python, so there trusted
+    data is validated like everything else.
+    """
+    if trusted and not hasattr(model, 'model_validate') and os.getenv('MODEL_TRUSTED_CONSTRUCT', 'true').lower() == 'true':
+        started = time.perf_counter()
+        try:
+            instance = construct_model(model, data)
+            _stats['constructed'] += 1
+            return instance
+        except UntrustedDataError:
+            _stats['construct_fallbacks'] += 1
+        finally:
+            _stats['construct_time'] += time.perf_counter() - started
+    started = time.perf_counter()
+    try:
+        return validator_for(model)(data)
+    finally:
+        _stats['validated'] += 1
+        _stats['validate_time'] += time.perf_counter() - started
+
+def get_validation_stats() -> Dict[str, Any]:
+    """Get model build counts and average times (ms) for this process"""
+    validated, constructed = _stats['validated'], _stats['constructed']
+    return {
+        'validated': validated,
+        'constructed': constructed,
+        'construct_fallbacks': _stats['construct_fallbacks'],
+        'avg_validate_ms': round(_stats['validate_time'] * 1000 / validated, 3) if validated else None,
+        'avg_construct_ms': round(_stats['construct_time'] * 1000 / constructed, 3) if constructed else None
+    }
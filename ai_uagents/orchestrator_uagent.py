@@ -3,17 +3,49 @@ Workflow Orchestrator uAgent for AI Company
 Coordinates the complete business workflow across all agents
 """
 
+import os
+import time
 import asyncio
-import json
-import requests
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable
 from uagents import Context, Model
-from base_uagent import BaseUAgent
+from base_uagent import BaseUAgent, DEFAULT_CACHE_DIR
+from fused_workflow import FUSED_SECTIONS, build_fused_prompt, split_fused_response
+from semantic_cache import SemanticCache
+from workflow_dag import WorkflowDAG, is_fallback
+from agent_http import AgentHTTPClient
+from workflow_jobs import WorkflowJobManager, JobQueueFullError
+from workflow_stream_server import WorkflowStreamServer
+from workflow_checkpoints import WorkflowCheckpointStore, WorkflowFailedError
+from deadline import Deadline, DeadlineExceededError
+from workflow_scheduler import WorkflowScheduler, clamp_priority
+from stage_pools import StagePools
+
+WORKFLOW_MODES = ('staged', 'fused')
+
+# Share of the remaining workflow time each stage may use; the rest is kept for
+# the stages still to run after it on the critical path (finance runs alongside)
+STAGE_DEADLINE_SHARES = {
+    'ideas': 0.1,
+    'evaluation': 0.15,
+    'research': 0.2,
+    'fused': 0.5,
+    'product': 0.25,
+    'marketing': 0.5,
+    'technical': 0.5,
+    'bolt_prompt': 1.0,
+    'finance': 1.0
+}
 
 class WorkflowRequest(Model):
     """Model for workflow request"""
     user_input: str
-    idea_count: int = 3
+    idea_count: int = 1  # Above 1, candidate ideas are researched and ranked and only the best is developed
+    mode: str = None  # "staged" (one agent call per stage) or "fused"; defaults to WORKFLOW_MODE
+    bypass_cache: bool = False  # Skip the semantic cache and stage memo lookups
+    overrides: Dict[str, Dict[str, Any]] = None  # Fields merged over the idea or a stage result, e.g. {"idea": {"revenue_model": "..."}}
+    time_budget: float = None  # Seconds the client will wait for the whole workflow; defaults to WORKFLOW_TIME_BUDGET
+    tenant: str = None  # Fair-queuing key, e.g. the user or API key; defaults to the sender
+    priority: str = None  # "interactive", "standard" or "batch"; capped at (and defaulting to) the endpoint's class
 
 class WorkflowResponse(Model):
     """Model for workflow response"""
@@ -22,6 +54,37 @@ class WorkflowResponse(Model):
     data: Dict[str, Any] = None
     error: str = None
 
+class WorkflowResumeRequest(Model):
+    """Model for resuming a failed workflow from its checkpoints"""
+    workflow_id: str
+
+class WorkflowJobStatusRequest(Model):
+    """Model for workflow job status request"""
+    job_id: str
+
+class WorkflowJobResponse(Model):
+    """Model for workflow job submission and status"""
+    success: bool
+    job_id: str = None
+    status: str = None  # queued, running, completed or failed
+    queue_position: int = None
+    completed_stages: List[str] = None
+    stage_timings: Dict[str, Any] = None
+    data: Dict[str, Any] = None
+    error: str = None
+
+class WorkflowJobsStatsResponse(Model):
+    """Model for workflow job queue statistics"""
+    stats: Dict[str, Any]
+
+class WorkflowSchedulerStatsResponse(Model):
+    """Model for workflow scheduler statistics"""
+    stats: Dict[str, Any]
+
+class StagePoolsStatsResponse(Model):
+    """Model for per-stage worker pool statistics"""
+    stats: Dict[str, Any]
+
 class OrchestratoruAgent(BaseUAgent):
     """Workflow Orchestrator uAgent for coordinating complete business workflow"""
     
@@ -29,7 +92,8 @@ class OrchestratoruAgent(BaseUAgent):
         super().__init__(
             name="Workflow Orchestrator",
             role="Coordinates complete business workflow across all agents",
-            port=8008
+            port=8008,
+            prompt_budget=1500
         )
         self.agent_ports = {
             'ceo': 8001,
@@ -38,45 +102,80 @@ class OrchestratoruAgent(BaseUAgent):
             'cmo': 8004,
             'cto': 8005,
             'head_engineering': 8006,
-            'finance': 8007
+            'finance': 8007,
+            'research_metta': 8009
         }
+        
+        # Keep-alive connection pools to the downstream agents, or uAgents messages
+        # correlated by request_id when AGENT_TRANSPORT=message (agents on any host)
+        self.agent_transport = os.getenv('AGENT_TRANSPORT', 'http').lower()
+        if self.agent_transport == 'message':
+            from agent_messaging import create_message_transport
+            self.agent_http = create_message_transport().attach(self.agent)
+        else:
+            self.agent_http = AgentHTTPClient(self.agent_ports)
+        self.message_workflows = set()
+        self.default_mode = os.getenv('WORKFLOW_MODE', 'staged')
+        self.default_time_budget = float(os.getenv('WORKFLOW_TIME_BUDGET', '600'))
+        self.max_idea_count = int(os.getenv('WORKFLOW_MAX_IDEAS', '5'))
+        
+        # Research and product results reused for near-duplicate user inputs
+        self.semantic_cache = None
+        if os.getenv('SEMANTIC_CACHE_ENABLED', 'true').lower() == 'true':
+            self.semantic_cache = SemanticCache('workflow', cache_dir=os.getenv('LLM_CACHE_DIR', DEFAULT_CACHE_DIR))
+        
+        # Finished stages are checkpointed so failed workflows can resume
+        self.checkpoints = None
+        if os.getenv('WORKFLOW_CHECKPOINTS_ENABLED', 'true').lower() == 'true':
+            self.checkpoints = WorkflowCheckpointStore()
+        # Stage results memoized by input hash so resubmitted edits only recompute what changed
+        self.stage_memo_enabled = self.checkpoints is not None and os.getenv('STAGE_MEMO_ENABLED', 'true').lower() == 'true'
+        
+        # Admission control: priority classes, per-tenant fairness and a concurrency cap
+        self.scheduler = WorkflowScheduler()
+        # Per-stage queues and workers, so concurrent workflows pipeline through the stages
+        self.stage_pools = StagePools()
+        
+        # Submitted workflows run in the background on a bounded worker pool
+        self.job_manager = WorkflowJobManager(self.run_workflow_job)
+        
+        # Side HTTP server for streamed responses (uAgents REST cannot stream)
+        self.stream_server = None
+        if os.getenv('ORCHESTRATOR_STREAM_ENABLED', 'true').lower() == 'true':
+            self.stream_server = WorkflowStreamServer(self)
         self.setup_handlers()
     
     def setup_handlers(self):
         """Setup message handlers for the agent"""
         
+        @self.agent.on_event("startup")
+        async def start_workflow_services(ctx: Context):
+            self.job_manager.start()
+            if self.stream_server:
+                try:
+                    await self.stream_server.start()
+                except OSError as e:
+                    print(f"❌ [{self.name}] Could not start workflow stream server on port {self.stream_server.port}: {e}")
+                    self.stream_server = None
+        
+        @self.agent.on_event("shutdown")
+        async def shutdown_workflow_services(ctx: Context):
+            await self.job_manager.stop()
+            if self.stream_server:
+                await self.stream_server.stop()
+            await self.stage_pools.stop()
+            await self.agent_http.close()
+            if self.checkpoints:
+                self.checkpoints.close()
+        
         @self.agent.on_message(model=WorkflowRequest)
         async def handle_workflow_request(ctx: Context, sender: str, msg: WorkflowRequest):
             """Handle complete workflow request"""
-            try:
-                print(f"🎯 [{self.name}] Starting complete workflow for: {msg.user_input}")
-                
-                # Run the complete workflow
-                workflow_result = await self.run_complete_workflow(msg.user_input, msg.idea_count)
-                
-                response = WorkflowResponse(
-                    success=True,
-                    message="Complete workflow executed successfully",
-                    data=workflow_result
-                )
-                
-                self.log_activity('Complete workflow executed', {
-                    'user_input': msg.user_input,
-                    'idea_count': msg.idea_count,
-                    'sender': sender
-                })
-                
-                # Send response back
-                await ctx.send(sender, response)
-                
-            except Exception as e:
-                print(f"❌ [{self.name}] Error in workflow: {str(e)}")
-                error_response = WorkflowResponse(
-                    success=False,
-                    message="Workflow execution failed",
-                    error=str(e)
-                )
-                await ctx.send(sender, error_response)
+            # Run in the background: with AGENT_TRANSPORT=message the stage replies
+            # arrive as messages, which are not dispatched while this handler runs
+            task = asyncio.create_task(self.process_workflow_message(ctx, sender, msg))
+            self.message_workflows.add(task)
+            task.add_done_callback(self.message_workflows.discard)
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/process-business-idea", WorkflowRequest, WorkflowResponse)
@@ -86,7 +185,11 @@ class OrchestratoruAgent(BaseUAgent):
                 print(f"🎯 [{self.name}] REST: Starting complete workflow for: {req.user_input}")
                 
                 # Run the complete workflow
-                workflow_result = await self.run_complete_workflow(req.user_input, req.idea_count)
+                workflow_result = await self.run_scheduled_workflow(
+                    req.tenant, clamp_priority(req.priority, 'interactive'),
+                    req.user_input, req.idea_count, req.mode, req.bypass_cache,
+                    overrides=req.overrides, time_budget=req.time_budget
+                )
                 
                 response = WorkflowResponse(
                     success=True,
@@ -106,12 +209,229 @@ class OrchestratoruAgent(BaseUAgent):
                 return WorkflowResponse(
                     success=False,
                     message="Workflow execution failed",
+                    data=self.resume_data(e),
+                    error=str(e)
+                )
+        
+        @self.agent.on_rest_post("/resume-workflow", WorkflowResumeRequest, WorkflowResponse)
+        async def handle_resume_workflow_rest(ctx: Context, req: WorkflowResumeRequest) -> WorkflowResponse:
+            """REST endpoint that re-runs only the stages a failed workflow has not checkpointed"""
+            workflow = self.checkpoints.get_workflow(req.workflow_id) if self.checkpoints else None
+            if workflow is None:
+                return WorkflowResponse(success=False, message="Workflow resume failed",
+                                        error="Unknown or expired workflow id")
+            try:
+                print(f"🎯 [{self.name}] REST: Resuming workflow {req.workflow_id} "
+                      f"({len(workflow['completed_stages'])} stages checkpointed)")
+                params = workflow['params']
+                workflow_result = await self.run_scheduled_workflow(
+                    params.get('tenant'), params.get('priority') or 'interactive',
+                    params['user_input'], params['idea_count'], params['mode'], params['bypass_cache'],
+                    overrides=params.get('overrides'), time_budget=params.get('time_budget'),
+                    workflow_id=req.workflow_id
+                )
+                return WorkflowResponse(
+                    success=True,
+                    message="Workflow resumed successfully",
+                    data=workflow_result
+                )
+            except Exception as e:
+                print(f"❌ [{self.name}] REST: Error resuming workflow: {str(e)}")
+                return WorkflowResponse(
+                    success=False,
+                    message="Workflow resume failed",
+                    data=self.resume_data(e),
                     error=str(e)
                 )
+        
+        @self.agent.on_rest_post("/workflow-jobs", WorkflowRequest, WorkflowJobResponse)
+        async def handle_submit_workflow_job_rest(ctx: Context, req: WorkflowRequest) -> WorkflowJobResponse:
+            """REST endpoint that queues a workflow and returns its job id immediately"""
+            try:
+                job = self.job_manager.submit({
+                    'user_input': req.user_input,
+                    'idea_count': req.idea_count,
+                    'mode': req.mode,
+                    'bypass_cache': req.bypass_cache,
+                    'overrides': req.overrides,
+                    'time_budget': req.time_budget,
+                    'tenant': req.tenant,
+                    'priority': clamp_priority(req.priority, 'standard')
+                })
+                print(f"🎯 [{self.name}] REST: Queued workflow job {job['job_id']} for: {req.user_input}")
+                return self.job_response(job)
+            except JobQueueFullError as e:
+                return WorkflowJobResponse(success=False, error=str(e))
+        
+        @self.agent.on_rest_post("/workflow-jobs/status", WorkflowJobStatusRequest, WorkflowJobResponse)
+        async def handle_workflow_job_status_rest(ctx: Context, req: WorkflowJobStatusRequest) -> WorkflowJobResponse:
+            """REST endpoint returning a job's status, finished stages and (when done) the plan"""
+            job = self.job_manager.get(req.job_id)
+            if job is None:
+                return WorkflowJobResponse(success=False, job_id=req.job_id, error="Unknown or expired job id")
+            return self.job_response(job)
+        
+        @self.agent.on_rest_get("/workflow-jobs", WorkflowJobsStatsResponse)
+        async def handle_workflow_jobs_stats_rest(ctx: Context) -> WorkflowJobsStatsResponse:
+            """REST endpoint exposing job queue statistics"""
+            return WorkflowJobsStatsResponse(stats=self.job_manager.get_stats())
+        
+        @self.agent.on_rest_get("/workflow-scheduler", WorkflowSchedulerStatsResponse)
+        async def handle_workflow_scheduler_stats_rest(ctx: Context) -> WorkflowSchedulerStatsResponse:
+            """REST endpoint exposing running and queued workflows per priority class"""
+            return WorkflowSchedulerStatsResponse(stats=self.scheduler.get_stats())
+        
+        @self.agent.on_rest_get("/stage-pools", StagePoolsStatsResponse)
+        async def handle_stage_pools_stats_rest(ctx: Context) -> StagePoolsStatsResponse:
+            """REST endpoint exposing queue depth and service time per stage"""
+            return StagePoolsStatsResponse(stats=self.stage_pools.get_stats())
+    
+    async def process_workflow_message(self, ctx: Context, sender: str, msg: WorkflowRequest):
+        """Run a workflow requested by message and send the result back to the sender"""
+        try:
+            print(f"🎯 [{self.name}] Starting complete workflow for: {msg.user_input}")
+            
+            # Run the complete workflow
+            workflow_result = await self.run_scheduled_workflow(
+                msg.tenant or sender, clamp_priority(msg.priority, 'interactive'),
+                msg.user_input, msg.idea_count, msg.mode, msg.bypass_cache,
+                overrides=msg.overrides, time_budget=msg.time_budget
+            )
+            
+            response = WorkflowResponse(
+                success=True,
+                message="Complete workflow executed successfully",
+                data=workflow_result
+            )
+            
+            self.log_activity('Complete workflow executed', {
+                'user_input': msg.user_input,
+                'idea_count': msg.idea_count,
+                'sender': sender
+            })
+            
+            # Send response back
+            await ctx.send(sender, response)
+            
+        except Exception as e:
+            print(f"❌ [{self.name}] Error in workflow: {str(e)}")
+            error_response = WorkflowResponse(
+                success=False,
+                message="Workflow execution failed",
+                data=self.resume_data(e),
+                error=str(e)
+            )
+            await ctx.send(sender, error_response)
+    
+    @staticmethod
+    def resume_data(error: Exception) -> Optional[Dict[str, Any]]:
+        """Response data pointing a client at /resume-workflow after a checkpointed failure"""
+        if isinstance(error, WorkflowFailedError):
+            return {'workflow_id': error.workflow_id}
+        return None
+    
+    def job_response(self, job: Dict[str, Any]) -> WorkflowJobResponse:
+        """Build the REST view of a workflow job"""
+        return WorkflowJobResponse(
+            success=job['status'] != 'failed',
+            job_id=job['job_id'],
+            status=job['status'],
+            queue_position=self.job_manager.queue_position(job['job_id']),
+            completed_stages=list(job['completed_stages']),
+            stage_timings=dict(job['stage_timings']),
+            data=job['result'],
+            error=job['error']
+        )
+    
+    async def run_workflow_job(self, params: Dict[str, Any], on_stage_complete) -> Dict[str, Any]:
+        """Job runner: execute one queued workflow"""
+        return await self.run_scheduled_workflow(
+            params.get('tenant'), params.get('priority') or 'standard',
+            params['user_input'], params['idea_count'], params['mode'], params['bypass_cache'],
+            on_stage_complete=on_stage_complete, overrides=params.get('overrides'),
+            time_budget=params.get('time_budget')
+        )
+    
+    async def run_scheduled_workflow(self, tenant: Optional[str], priority: Optional[str], *args, **kwargs) -> Dict[str, Any]:
+        """Run a workflow once the scheduler admits it (same arguments as run_complete_workflow)
+        
+        The deadline starts when the workflow is queued, so time spent waiting
+        for a slot counts against its ``time_budget``; a workflow whose budget
+        runs out in the queue fails with DeadlineExceededError without running.
+        """
+        kwargs['time_budget'] = kwargs.get('time_budget') or self.default_time_budget
+        deadline = kwargs.setdefault('deadline', Deadline(kwargs['time_budget']))
+        async with self.scheduler.slot(tenant, priority, deadline.expires_at):
+            return await self.run_complete_workflow(*args, tenant=tenant, priority=priority, **kwargs)
     
-    async def run_complete_workflow(self, user_input: str, idea_count: int = 3) -> Dict[str, Any]:
-        """Run the complete business workflow"""
-        print(f"🎯 [{self.name}] Starting complete workflow...")
+    async def run_complete_workflow(self, user_input: str, idea_count: int = 1, mode: str = None,
+                                    bypass_cache: bool = False,
+                                    on_stage_complete: Optional[Callable[[str, Any, Dict[str, float]], Any]] = None,
+                                    workflow_id: str = None,
+                                    overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+                                    time_budget: Optional[float] = None,
+                                    deadline: Optional[Deadline] = None,
+                                    tenant: Optional[str] = None,
+                                    priority: Optional[str] = None) -> Dict[str, Any]:
+        """Run the complete business workflow
+        
+        In ``fused`` mode the product, marketing, technical, Bolt and finance
+        sections come from one structured completion; any section that fails
+        validation is produced by its agent as in ``staged`` mode.
+        
+        Research and product results for a near-duplicate earlier input are
+        served from the semantic cache unless ``bypass_cache`` is set.
+        
+        ``on_stage_complete(stage, result, timing)`` is called as each stage finishes.
+        
+        Each finished stage is checkpointed under a workflow id, except
+        stages that degraded to fallback data. Passing the ``workflow_id`` of
+        a failed run reuses its checkpointed stages and runs only the missing
+        or degraded ones; failures raise WorkflowFailedError. The scheduler
+        ``tenant`` and ``priority`` are stored with the workflow, so a resume
+        is admitted under the same ones.
+        
+        Stage results are also memoized by a hash of their exact inputs, so
+        resubmitting with ``overrides`` (fields merged over the ``idea`` or
+        a stage's result) recomputes only the stages downstream of the edit.
+        
+        The whole workflow must finish within ``time_budget`` seconds, counted
+        from ``deadline`` when the caller started the clock earlier. Each
+        agent is handed a share of the time left (STAGE_DEADLINE_SHARES) and
+        sizes its completion to fit; no stage starts once the budget is spent.
+        
+        With ``idea_count`` > 1 the CEO proposes variations on the user's
+        concept; every candidate is researched, developed and scored
+        concurrently, and only the highest-scoring one goes on to the
+        marketing, technical, Bolt and finance stages.
+        """
+        overrides = dict(overrides or {})
+        time_budget = time_budget or self.default_time_budget
+        deadline = deadline or Deadline(time_budget)
+        mode = mode or self.default_mode
+        if mode not in WORKFLOW_MODES:
+            raise ValueError(f"Unknown workflow mode '{mode}', expected one of {WORKFLOW_MODES}")
+        idea_count = max(1, min(idea_count or 1, self.max_idea_count))
+        fan_out = idea_count > 1
+        print(f"🎯 [{self.name}] Starting complete workflow ({mode} mode)...")
+        
+        checkpointed = {}
+        if self.checkpoints:
+            if workflow_id:
+                checkpointed = self.checkpoints.load_stages(workflow_id)
+                self.checkpoints.mark(workflow_id, 'running')
+                print(f"🎯 [{self.name}] Resuming workflow {workflow_id} with checkpointed stages {sorted(checkpointed)}")
+            else:
+                workflow_id = self.checkpoints.create_workflow({
+                    'user_input': user_input,
+                    'idea_count': idea_count,
+                    'mode': mode,
+                    'bypass_cache': bypass_cache,
+                    'overrides': overrides,
+                    'time_budget': time_budget,
+                    'tenant': tenant,
+                    'priority': priority
+                })
         
         try:
             # Step 1: Use user input as business concept (no automatic idea generation)
@@ -124,98 +444,339 @@ class OrchestratoruAgent(BaseUAgent):
                 "revenue_model": "To be determined by workflow",
                 "success_factors": "User-driven business development"
             }
+            idea_overrides = overrides.pop('idea', None) or {}
+            selected_idea.update(idea_overrides)
             
             print(f"🎯 [{self.name}] Using user business concept: {selected_idea.get('title', 'Unknown')}")
             
+            cached_stages, similarity = {}, None
+            # The semantic cache is keyed on the user's text only, so it cannot serve an edited idea
+            if self.semantic_cache and not bypass_cache and not idea_overrides and not fan_out:
+                hit = self.semantic_cache.lookup(user_input, ['research', 'product'])
+                if hit:
+                    cached_stages, similarity = hit
+            
+            def idea_for(results):
+                return results['ideation']['idea'] if fan_out else selected_idea
+            
+            # Step 1b: Research, develop and score candidate ideas, keeping the best
+            async def ideation_stage(results):
+                print(f"🎯 [{self.name}] Step 1b: Evaluating {idea_count} candidate ideas concurrently...")
+                return await self.select_best_idea(selected_idea, user_input, idea_count, deadline)
+            
             # Step 2: Research analyzes the idea
-            print(f"🎯 [{self.name}] Step 2: Research analyzing market...")
-            research_response = await self.call_research_agent(selected_idea)
-            if not research_response:
-                raise Exception("Research agent failed to analyze market")
+            async def research_stage(results):
+                research_response = results['ideation']['research'] if fan_out else cached_stages.get('research')
+                if research_response and fan_out:
+                    print(f"🎯 [{self.name}] Step 2: Using research of the selected idea")
+                elif research_response:
+                    print(f"🎯 [{self.name}] Step 2: Reusing cached research (similarity {similarity:.2f})")
+                else:
+                    print(f"🎯 [{self.name}] Step 2: Research analyzing market...")
+                    research_response = await self.call_research_agent(idea_for(results), deadline)
+                if not research_response:
+                    raise Exception("Research agent failed to analyze market")
+                return research_response
+            
+            async def fused_stage(results):
+                print(f"🎯 [{self.name}] Steps 3-7: Generating all sections in one fused completion...")
+                return await self.generate_fused_sections(idea_for(results), results['research'], deadline)
             
             # Step 3: Product develops the concept
-            print(f"🎯 [{self.name}] Step 3: Product developing concept...")
-            product_response = await self.call_product_agent(selected_idea, research_response)
-            if not product_response:
-                raise Exception("Product agent failed to develop concept")
+            async def product_stage(results):
+                product_response = (results['ideation']['product'] if fan_out else None) \
+                    or results.get('fused', {}).get('product') or cached_stages.get('product')
+                if not product_response:
+                    print(f"🎯 [{self.name}] Step 3: Product developing concept...")
+                    product_response = await self.call_product_agent(idea_for(results), results['research'], deadline)
+                if not product_response:
+                    raise Exception("Product agent failed to develop concept")
+                genuine = not results['research'].get('fallback') and not product_response.get('fallback')
+                if self.semantic_cache and genuine and not cached_stages and not idea_overrides and not fan_out:
+                    self.semantic_cache.store(user_input, {'research': results['research'], 'product': product_response})
+                return product_response
             
             # Step 4: CMO creates marketing strategy
-            print(f"🎯 [{self.name}] Step 4: CMO creating marketing strategy...")
-            marketing_response = await self.call_cmo_agent(selected_idea, product_response, research_response)
-            if not marketing_response:
-                raise Exception("CMO agent failed to create marketing strategy")
+            async def marketing_stage(results):
+                marketing_response = results.get('fused', {}).get('marketing')
+                if not marketing_response:
+                    print(f"🎯 [{self.name}] Step 4: CMO creating marketing strategy...")
+                    marketing_response = await self.call_cmo_agent(idea_for(results), results['product'], results['research'], deadline)
+                if not marketing_response:
+                    raise Exception("CMO agent failed to create marketing strategy")
+                return marketing_response
             
             # Step 5: CTO creates technical strategy
-            print(f"🎯 [{self.name}] Step 5: CTO creating technical strategy...")
-            technical_response = await self.call_cto_agent(selected_idea, product_response, research_response)
-            if not technical_response:
-                raise Exception("CTO agent failed to create technical strategy")
+            async def technical_stage(results):
+                technical_response = results.get('fused', {}).get('technical')
+                if not technical_response:
+                    print(f"🎯 [{self.name}] Step 5: CTO creating technical strategy...")
+                    technical_response = await self.call_cto_agent(idea_for(results), results['product'], results['research'], deadline)
+                if not technical_response:
+                    raise Exception("CTO agent failed to create technical strategy")
+                return technical_response
             
             # Step 6: Head of Engineering creates Bolt prompt
-            print(f"🎯 [{self.name}] Step 6: Head of Engineering creating Bolt prompt...")
-            bolt_response = await self.call_head_engineering_agent(
-                selected_idea, product_response, research_response, 
-                marketing_response, technical_response
-            )
-            if not bolt_response:
-                raise Exception("Head of Engineering agent failed to create Bolt prompt")
+            async def bolt_stage(results):
+                bolt_response = results.get('fused', {}).get('bolt_prompt')
+                if not bolt_response:
+                    print(f"🎯 [{self.name}] Step 6: Head of Engineering creating Bolt prompt...")
+                    bolt_response = await self.call_head_engineering_agent(
+                        idea_for(results), results['product'], results['research'], 
+                        results['marketing'], results['technical'], deadline
+                    )
+                if not bolt_response:
+                    raise Exception("Head of Engineering agent failed to create Bolt prompt")
+                return bolt_response
             
             # Step 7: Finance analyzes revenue
-            print(f"🎯 [{self.name}] Step 7: Finance analyzing revenue...")
-            finance_response = await self.call_finance_agent(selected_idea, product_response)
-            if not finance_response:
-                raise Exception("Finance agent failed to analyze revenue")
+            async def finance_stage(results):
+                finance_response = results.get('fused', {}).get('finance')
+                if not finance_response:
+                    print(f"🎯 [{self.name}] Step 7: Finance analyzing revenue...")
+                    finance_response = await self.call_finance_agent(idea_for(results), results['product'], deadline)
+                if not finance_response:
+                    raise Exception("Finance agent failed to analyze revenue")
+                return finance_response
+            
+            # Marketing, technical and finance only need product and research, so they run concurrently
+            dag = WorkflowDAG()
+            if fan_out:
+                dag.add_stage('ideation', ideation_stage)
+            dag.add_stage('research', research_stage, depends_on=['ideation'] if fan_out else [])
+            after_research = ['research']
+            if mode == 'fused':
+                dag.add_stage('fused', fused_stage, depends_on=['research'])
+                after_research = ['research', 'fused']
+            dag.add_stage('product', product_stage, depends_on=after_research)
+            dag.add_stage('marketing', marketing_stage, depends_on=['product', 'research'])
+            dag.add_stage('technical', technical_stage, depends_on=['product', 'research'])
+            dag.add_stage('bolt_prompt', bolt_stage, depends_on=['product', 'research', 'marketing', 'technical'])
+            dag.add_stage('finance', finance_stage, depends_on=['product'])
+            
+            workflow_started = time.monotonic()
+            def stage_complete(stage: str, result: Any, timing: Dict[str, float]):
+                self.log_stage_complete(stage, result, timing)
+                # Fallback results are not checkpointed, so a resume runs those stages again
+                if self.checkpoints and workflow_id and not timing.get('reused') and not is_fallback(result):
+                    self.checkpoints.save_stage(workflow_id, stage, result, timing)
+                if on_stage_complete:
+                    return on_stage_complete(stage, result, timing)
+            
+            memo = self.checkpoints if self.stage_memo_enabled and not bypass_cache else None
+            results, stage_timings = await dag.run(results=dict(checkpointed), on_stage_complete=stage_complete,
+                                                   memo=memo, inputs={'idea': selected_idea, 'idea_count': idea_count,
+                                                                      'mode': mode, 'time_budget': time_budget},
+                                                   overrides=overrides)
+            final_idea = idea_for(results)
+            research_response = results['research']
+            product_response = results['product']
+            marketing_response = results['marketing']
+            technical_response = results['technical']
+            bolt_response = results['bolt_prompt']
+            finance_response = results['finance']
             
             # Compile complete business plan
             complete_business_plan = {
                 "workflow_summary": {
                     "user_input": user_input,
-                    "selected_idea": selected_idea.get('title', 'Unknown'),
+                    "selected_idea": final_idea.get('title', 'Unknown'),
+                    "idea_candidates": results['ideation']['candidates'] if fan_out else None,
                     "workflow_status": "completed",
+                    "workflow_id": workflow_id,
+                    "mode": mode,
+                    "resumed_stages": sorted(stage for stage in checkpointed if stage in stage_timings),
+                    "reused_stages": sorted(stage for stage, timing in stage_timings.items() if timing.get('memoized')),
+                    "fused_sections": [key for key, _ in FUSED_SECTIONS if results.get('fused', {}).get(key)],
+                    "semantic_cache_similarity": similarity,
+                    "stage_timings": stage_timings,
+                    "total_duration": round(time.monotonic() - workflow_started, 3),
+                    "time_budget": time_budget,
+                    "time_remaining": round(deadline.remaining(), 3),
                     "timestamp": "2024-01-01T00:00:00Z"
                 },
-                "idea": selected_idea,
+                "idea": final_idea,
                 "research": research_response,
                 "product": product_response,
                 "marketing": marketing_response,
                 "technical": technical_response,
                 "bolt_prompt": bolt_response,
                 "finance": finance_response,
-                "all_ideas": [selected_idea]
+                "all_ideas": [candidate['idea'] for candidate in results['ideation']['candidates']] if fan_out else [selected_idea]
             }
             
+            if self.checkpoints and workflow_id:
+                self.checkpoints.mark(workflow_id, 'completed')
             print(f"🎯 [{self.name}] Complete workflow finished successfully!")
             return complete_business_plan
             
         except Exception as e:
             print(f"❌ [{self.name}] Workflow failed at step: {str(e)}")
+            if self.checkpoints and workflow_id:
+                self.checkpoints.mark(workflow_id, 'failed', str(e))
+                raise WorkflowFailedError(workflow_id, e) from e
             raise e
     
-    async def call_ceo_agent(self, idea_count: int) -> Dict[str, Any]:
+    def log_stage_complete(self, stage: str, result: Any, timing: Dict[str, float]):
+        """Log each workflow stage as the DAG executor finishes it"""
+        print(f"⏱️ [{self.name}] Stage '{stage}' finished in {timing['duration']:.2f}s (at +{timing['finished_at']:.2f}s)")
+    
+    def get_llm_stats(self) -> Dict[str, Any]:
+        """LLM statistics plus semantic cache and inter-agent HTTP counters"""
+        stats = super().get_llm_stats()
+        stats['semantic_cache'] = self.semantic_cache.get_stats() if self.semantic_cache else None
+        stats['agent_http'] = self.agent_http.get_stats()
+        stats['jobs'] = self.job_manager.get_stats()
+        stats['stream_server'] = self.stream_server.get_stats() if self.stream_server else None
+        stats['checkpoints'] = self.checkpoints.get_stats() if self.checkpoints else None
+        stats['scheduler'] = self.scheduler.get_stats()
+        stats['stage_pools'] = self.stage_pools.get_stats()
+        return stats
+    
+    async def generate_fused_sections(self, idea: Dict[str, Any], research: Dict[str, Any],
+                                      deadline: Deadline) -> Dict[str, Any]:
+        """Generate every downstream section with a single ASI:One completion
+        
+        When the completion fails or leaves sections out, the result is
+        flagged ``fallback`` (and a partial completion is evicted from the
+        LLM cache) so it is neither memoized nor checkpointed and the fused
+        call is tried again on the next run.
+        """
+        try:
+            context = self.fit_prompt_context({
+                'competitors': research.get('competitors', []),
+                'market_analysis': research.get('market_analysis', {}),
+                'recommendations': research.get('recommendations', {})
+            }, {'market_analysis': 3, 'recommendations': 2, 'competitors': 1})
+            
+            prompt = build_fused_prompt(idea, context)
+            
+            async def complete():
+                deadline.check("the fused stage")
+                return await self.call_asi_one(prompt, 8000, stream=True, on_field=self.log_streamed_field,
+                                               deadline=deadline.stage_deadline(STAGE_DEADLINE_SHARES['fused']))
+            
+            response = await self.stage_pools.run('fused', complete, deadline.expires_at)
+            fused = self.parse_llm_json(response)
+            if fused is None:
+                raise ValueError("No JSON object in fused completion")
+            sections = split_fused_response(fused)
+            
+            missing = [key for key, section in sections.items() if not section]
+            if missing:
+                print(f"⚠️ [{self.name}] Fused completion missing {missing}, falling back to agents for those")
+                self.evict_completion(response)
+            return dict(sections, fallback=bool(missing))
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            print(f"❌ [{self.name}] Fused generation failed, falling back to staged calls: {e}")
+            return {'fallback': True}
+    
+    async def select_best_idea(self, user_idea: Dict[str, Any], user_input: str, idea_count: int,
+                               deadline: Deadline) -> Dict[str, Any]:
+        """Fan out over candidate ideas and keep the one the CEO scores highest
+        
+        The user's own concept is always a candidate; the CEO adds
+        ``idea_count - 1`` variations of it. Each candidate is researched,
+        developed and evaluated concurrently with the others.
+        """
+        candidates = [user_idea]
+        generated = await self.call_ceo_agent(idea_count - 1, deadline, theme=user_input)
+        candidates += ((generated or {}).get('ideas') or [])[:idea_count - 1]
+        
+        async def develop(idea: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            research = await self.call_research_agent(idea, deadline)
+            product = await self.call_product_agent(idea, research, deadline) if research else None
+            if not product:
+                return None
+            evaluation = await self.call_ceo_evaluation(product, deadline) or {}
+            return {'idea': idea, 'research': research, 'product': product, 'evaluation': evaluation}
+        
+        developed = [candidate for candidate in await asyncio.gather(*(develop(idea) for idea in candidates)) if candidate]
+        if not developed:
+            raise Exception("No candidate idea survived research and product development")
+        developed.sort(key=lambda c: (c['evaluation'].get('viability_score') or 0, bool(c['evaluation'].get('go_decision'))),
+                       reverse=True)
+        best = developed[0]
+        print(f"🏆 [{self.name}] Selected '{best['idea'].get('title', 'Unknown')}' "
+              f"(viability {best['evaluation'].get('viability_score')}) from {len(developed)} candidates")
+        return {
+            'idea': best['idea'],
+            'research': best['research'],
+            'product': best['product'],
+            'fallback': bool(best['research'].get('fallback') or best['product'].get('fallback')),
+            'candidates': [
+                {'idea': c['idea'], 'product_name': c['product'].get('product_name'), 'evaluation': c['evaluation']}
+                for c in developed
+            ]
+        }
+    
+    async def call_ceo_agent(self, idea_count: int, deadline: Deadline, theme: str = None) -> Dict[str, Any]:
         """Call CEO agent to generate business ideas"""
         try:
-            response = requests.post(
-                f"http://localhost:{self.agent_ports['ceo']}/generate-ideas",
-                json={"count": idea_count},
-                timeout=90
+            return await self.post_stage(
+                'ideas', 'ceo', '/generate-ideas',
+                {"count": idea_count, "theme": theme},
+                deadline
             )
-            response.raise_for_status()
-            return response.json()
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"❌ [{self.name}] CEO agent call failed: {e}")
             return None
     
-    async def call_research_agent(self, idea: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_ceo_evaluation(self, product: Dict[str, Any], deadline: Deadline) -> Dict[str, Any]:
+        """Call CEO agent to score a product concept's viability"""
+        try:
+            return await self.post_stage(
+                'evaluation', 'ceo', '/evaluate-product',
+                {
+                    "product_name": product.get('product_name', 'Unknown'),
+                    "product_description": product.get('product_description', ''),
+                    "features": product.get('core_features', []),
+                    "target_market": product.get('target_market', {})
+                },
+                deadline
+            )
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            print(f"❌ [{self.name}] CEO evaluation call failed: {e}")
+            return None
+    
+    async def post_stage(self, stage: str, agent: str, path: str, payload: Dict[str, Any],
+                         deadline: Deadline) -> Dict[str, Any]:
+        """Call an agent for one stage, handing it its share of the remaining time
+        
+        The call waits its turn on the stage's worker pool, but not past the
+        workflow deadline. Once a worker picks it up the agent receives the
+        stage's deadline to size its completion; the request itself may use
+        whatever is left of the workflow budget.
+        """
+        async def call():
+            deadline.check(f"the {stage} stage")
+            try:
+                return await self.agent_http.post(
+                    agent, path, dict(payload, deadline=deadline.stage_deadline(STAGE_DEADLINE_SHARES[stage])),
+                    timeout=deadline.remaining()
+                )
+            except asyncio.TimeoutError:
+                if deadline.expired():
+                    raise DeadlineExceededError(f"Workflow deadline exceeded during the {stage} stage")
+                raise
+        
+        return await self.stage_pools.run(stage, call, deadline.expires_at)
+    
+    async def call_research_agent(self, idea: Dict[str, Any], deadline: Deadline) -> Dict[str, Any]:
         """Call MeTTa-enhanced Research agent to analyze market"""
         try:
             print(f"🧠 [{self.name}] Calling MeTTa-enhanced Research agent...")
-            response = requests.post(
-                "http://localhost:8009/research-idea-metta",
-                json={"idea": idea},
-                timeout=120
+            metta_response = await self.post_stage(
+                'research', 'research_metta', '/research-idea-metta',
+                {"idea": idea},
+                deadline
             )
-            response.raise_for_status()
-            metta_response = response.json()
             
             # Extract the core research data from MeTTa response
             research_data = {
@@ -231,86 +792,95 @@ class OrchestratoruAgent(BaseUAgent):
                 }
             }
             
+            if metta_response.get("fallback"):
+                research_data["fallback"] = True
+            
             print(f"🧠 [{self.name}] MeTTa Research completed with {len(metta_response.get('similar_research', []))} similar studies found")
             return research_data
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"❌ [{self.name}] MeTTa Research agent call failed: {e}")
             return None
     
-    async def call_product_agent(self, idea: Dict[str, Any], research: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_product_agent(self, idea: Dict[str, Any], research: Dict[str, Any],
+                                 deadline: Deadline) -> Dict[str, Any]:
         """Call Product agent to develop concept"""
         try:
-            response = requests.post(
-                f"http://localhost:{self.agent_ports['product']}/develop-product",
-                json={"idea": idea, "research": research},
-                timeout=90
+            return await self.post_stage(
+                'product', 'product', '/develop-product',
+                {"idea": idea, "research": research},
+                deadline
             )
-            response.raise_for_status()
-            return response.json()
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"❌ [{self.name}] Product agent call failed: {e}")
             return None
     
-    async def call_cmo_agent(self, idea: Dict[str, Any], product: Dict[str, Any], research: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_cmo_agent(self, idea: Dict[str, Any], product: Dict[str, Any], research: Dict[str, Any],
+                             deadline: Deadline) -> Dict[str, Any]:
         """Call CMO agent to create marketing strategy"""
         try:
-            response = requests.post(
-                f"http://localhost:{self.agent_ports['cmo']}/develop-marketing",
-                json={"idea": idea, "product": product, "research": research},
-                timeout=90
+            return await self.post_stage(
+                'marketing', 'cmo', '/develop-marketing',
+                {"idea": idea, "product": product, "research": research},
+                deadline
             )
-            response.raise_for_status()
-            return response.json()
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"❌ [{self.name}] CMO agent call failed: {e}")
             return None
     
-    async def call_cto_agent(self, idea: Dict[str, Any], product: Dict[str, Any], research: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_cto_agent(self, idea: Dict[str, Any], product: Dict[str, Any], research: Dict[str, Any],
+                             deadline: Deadline) -> Dict[str, Any]:
         """Call CTO agent to create technical strategy"""
         try:
-            response = requests.post(
-                f"http://localhost:{self.agent_ports['cto']}/develop-technical",
-                json={"idea": idea, "product": product, "research": research},
-                timeout=120
+            return await self.post_stage(
+                'technical', 'cto', '/develop-technical',
+                {"idea": idea, "product": product, "research": research},
+                deadline
             )
-            response.raise_for_status()
-            return response.json()
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"❌ [{self.name}] CTO agent call failed: {e}")
             return None
     
     async def call_head_engineering_agent(self, idea: Dict[str, Any], product: Dict[str, Any], 
                                         research: Dict[str, Any], marketing: Dict[str, Any], 
-                                        technical: Dict[str, Any]) -> Dict[str, Any]:
+                                        technical: Dict[str, Any], deadline: Deadline) -> Dict[str, Any]:
         """Call Head of Engineering agent to create Bolt prompt"""
         try:
-            response = requests.post(
-                f"http://localhost:{self.agent_ports['head_engineering']}/create-bolt-prompt",
-                json={
+            return await self.post_stage(
+                'bolt_prompt', 'head_engineering', '/create-bolt-prompt',
+                {
                     "idea": idea, 
                     "product": product, 
                     "research": research, 
                     "marketing_strategy": marketing, 
                     "technical_strategy": technical
                 },
-                timeout=120
+                deadline
             )
-            response.raise_for_status()
-            return response.json()
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"❌ [{self.name}] Head of Engineering agent call failed: {e}")
             return None
     
-    async def call_finance_agent(self, idea: Dict[str, Any], product: Dict[str, Any]) -> Dict[str, Any]:
+    async def call_finance_agent(self, idea: Dict[str, Any], product: Dict[str, Any],
+                                 deadline: Deadline) -> Dict[str, Any]:
         """Call Finance agent to analyze revenue"""
         try:
-            response = requests.post(
-                f"http://localhost:{self.agent_ports['finance']}/analyze-revenue",
-                json={"idea_data": idea, "product_data": product},
-                timeout=90
+            return await self.post_stage(
+                'finance', 'finance', '/analyze-revenue',
+                {"idea_data": idea, "product_data": product},
+                deadline
             )
-            response.raise_for_status()
-            return response.json()
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             print(f"❌ [{self.name}] Finance agent call failed: {e}")
             return None
@@ -0,0 +1,82 @@
+"""
+Prompt token budgeting for AI Company agents
+Estimates prompt size and compacts embedded context to fit a per-agent budget
+"""
+
+import json
+import math
+from typing import Dict, Any, Tuple
+
+# Progressively harsher (max list items, max string chars) limits
+COMPACTION_LEVELS = [(8, 400), (5, 200), (3, 100), (1, 60)]
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English/JSON text)"""
+    return math.ceil(len(text) / 4) if text else 0
+
+def shrink(value: Any, max_items: int, max_chars: int) -> Any:
+    """Trim lists and strings inside value, keeping its overall shape"""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars].rstrip() + '…'
+    if isinstance(value, list):
+        kept = [shrink(item, max_items, max_chars) for item in value[:max_items]]
+        if len(value) > max_items:
+            kept.append(f"(+{len(value) - max_items} more)")
+        return kept
+    if isinstance(value, dict):
+        return {key: shrink(item, max_items, max_chars) for key, item in value.items()}
+    return value
+
+def render(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value)
+
+class PromptBudget:
+    """Fits the context fields of a prompt into a token budget
+
+    Fields are compacted lowest priority first, one level at a time: lists
+    are cut to their leading items and long strings truncated. A field that
+    is still too large at the last level is dropped to a short placeholder.
+    Higher priority fields are only touched once every lower one is at
+    its floor.
+    """
+
+    def __init__(self, max_tokens: int):
+        self.max_tokens = max_tokens
+        self.compactions = 0
+        self.tokens_saved = 0
+
+    def fit(self, fields: Dict[str, Any], priorities: Dict[str, int]) -> Tuple[Dict[str, str], int]:
+        """Render fields within budget; returns the rendered fields and tokens saved"""
+        rendered = {key: render(value) for key, value in fields.items()}
+        original = sum(estimate_tokens(text) for text in rendered.values())
+        total = original
+        if total <= self.max_tokens:
+            return rendered, 0
+
+        levels = {key: 0 for key in fields}
+        order = sorted(fields, key=lambda key: priorities.get(key, 0))
+        while total > self.max_tokens:
+            candidates = [key for key in order if levels[key] <= len(COMPACTION_LEVELS)]
+            if not candidates:
+                break
+            key = candidates[0]
+            level = levels[key]
+            if level < len(COMPACTION_LEVELS):
+                compacted = render(shrink(fields[key], *COMPACTION_LEVELS[level]))
+            else:
+                compacted = '"(omitted for length)"'
+            levels[key] = level + 1
+            total += estimate_tokens(compacted) - estimate_tokens(rendered[key])
+            rendered[key] = compacted
+
+        saved = original - total
+        self.compactions += 1
+        self.tokens_saved += saved
+        return rendered, saved
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_context_tokens': self.max_tokens,
+            'compactions': self.compactions,
+            'tokens_saved': self.tokens_saved
+        }
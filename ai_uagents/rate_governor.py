@@ -0,0 +1,177 @@
+"""
+Cross-agent ASI:One rate governor for AI Company agents
+Token bucket plus AIMD concurrency limit, shared by every agent process on a host
+"""
+
+import os
+import json
+import time
+import asyncio
+import tempfile
+from typing import Dict, Any, Callable, Optional
+from deadline import DeadlineExceededError, time_left
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to per-process coordination
+    fcntl = None
+
+DEFAULT_STATE_FILE = os.path.join(tempfile.gettempdir(), 'asi_one_governor.json')
+
+class ASIOneRateGovernor:
+    """Host-wide token bucket and AIMD concurrency governor
+
+    All agents share one small JSON state file guarded by an exclusive
+    ``flock``. Each request takes a token and a concurrency lease; the
+    outcome then adjusts the shared budget: a 429 halves the request rate
+    and concurrency limit (at most once per cooldown window), while fast
+    successful calls grow them additively. Leases held by processes that
+    have exited are reclaimed automatically.
+    """
+
+    def __init__(self, state_path: Optional[str] = None):
+        self.state_path = state_path or os.getenv('ASI_ONE_GOVERNOR_FILE', DEFAULT_STATE_FILE)
+        self.min_rate = float(os.getenv('ASI_ONE_GOVERNOR_MIN_RATE', '0.2'))
+        self.max_rate = float(os.getenv('ASI_ONE_GOVERNOR_MAX_RATE', '5'))
+        self.max_concurrency = int(os.getenv('ASI_ONE_GOVERNOR_MAX_CONCURRENCY', '16'))
+        self.target_latency = float(os.getenv('ASI_ONE_GOVERNOR_TARGET_LATENCY', '30'))
+        self.cooldown = float(os.getenv('ASI_ONE_GOVERNOR_COOLDOWN', '5'))
+        self.pid = str(os.getpid())
+        self._local_state: Optional[Dict[str, Any]] = None
+
+    def _initial_state(self) -> Dict[str, Any]:
+        return {
+            'rate': self.max_rate / 2,
+            'tokens': 1.0,
+            'concurrency_limit': max(1, self.max_concurrency // 2),
+            'leases': {},
+            'updated_at': time.time(),
+            'last_decrease_at': 0.0,
+            'latency_ewma': None,
+            'throttled': 0,
+            'granted': 0
+        }
+
+    def _with_state(self, mutate: Callable[[Dict[str, Any]], Any]) -> Any:
+        """Run mutate on the shared state under an exclusive file lock"""
+        if fcntl is None:
+            if self._local_state is None:
+                self._local_state = self._initial_state()
+            return mutate(self._local_state)
+
+        with open(self.state_path, 'a+', encoding='utf-8') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    state = json.loads(raw) if raw else self._initial_state()
+                except ValueError:
+                    state = self._initial_state()
+                result = mutate(state)
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _refill(self, state: Dict[str, Any]):
+        now = time.time()
+        burst = max(1.0, state['rate'])
+        elapsed = max(0.0, now - state['updated_at'])
+        state['tokens'] = min(burst, state['tokens'] + elapsed * state['rate'])
+        state['updated_at'] = now
+
+    @staticmethod
+    def _pid_alive(pid: str) -> bool:
+        try:
+            os.kill(int(pid), 0)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _prune_leases(self, state: Dict[str, Any]):
+        leases = state['leases']
+        for pid in list(leases):
+            if leases[pid] <= 0 or (pid != self.pid and not self._pid_alive(pid)):
+                del leases[pid]
+
+    def _try_acquire(self, state: Dict[str, Any]) -> float:
+        """Take a token and lease if available; otherwise return seconds to wait"""
+        self._refill(state)
+        self._prune_leases(state)
+        in_flight = sum(state['leases'].values())
+        if in_flight >= state['concurrency_limit']:
+            return 0.1
+        if state['tokens'] < 1.0:
+            return (1.0 - state['tokens']) / state['rate']
+        state['tokens'] -= 1.0
+        state['leases'][self.pid] = state['leases'].get(self.pid, 0) + 1
+        state['granted'] += 1
+        return 0.0
+
+    async def acquire(self, deadline: Optional[float] = None):
+        """Wait until the shared budget allows one more ASI:One request
+
+        Raises DeadlineExceededError rather than waiting past an epoch ``deadline``.
+        """
+        while True:
+            wait = self._with_state(self._try_acquire)
+            if wait <= 0:
+                return
+            remaining = time_left(deadline)
+            if remaining is not None and wait >= remaining:
+                raise DeadlineExceededError(f"ASI:One rate budget frees up in {wait:.1f}s, after the deadline")
+            await asyncio.sleep(min(wait, 1.0))
+
+    def release(self, status: int, latency: float):
+        """Return the lease and adapt the budget to the observed outcome"""
+        def update(state: Dict[str, Any]):
+            if state['leases'].get(self.pid, 0) > 0:
+                state['leases'][self.pid] -= 1
+            self._refill(state)
+
+            if status == 429:
+                state['throttled'] += 1
+                now = time.time()
+                if now - state['last_decrease_at'] >= self.cooldown:
+                    state['rate'] = max(self.min_rate, state['rate'] / 2)
+                    state['concurrency_limit'] = max(1, state['concurrency_limit'] // 2)
+                    state['tokens'] = min(state['tokens'], 0.0)
+                    state['last_decrease_at'] = now
+                return
+
+            if status != 200:
+                return
+
+            ewma = state['latency_ewma']
+            state['latency_ewma'] = latency if ewma is None else 0.8 * ewma + 0.2 * latency
+            if latency <= self.target_latency:
+                state['rate'] = min(self.max_rate, state['rate'] + 0.1)
+                state['concurrency_limit'] = min(
+                    self.max_concurrency,
+                    state['concurrency_limit'] + 1.0 / max(1, state['concurrency_limit'])
+                )
+            elif state['latency_ewma'] > 2 * self.target_latency:
+                state['concurrency_limit'] = max(1, state['concurrency_limit'] - 1)
+
+        self._with_state(update)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the current shared budget"""
+        def snapshot(state: Dict[str, Any]) -> Dict[str, Any]:
+            self._refill(state)
+            self._prune_leases(state)
+            return {
+                'rate_per_second': round(state['rate'], 3),
+                'tokens_available': round(state['tokens'], 3),
+                'concurrency_limit': int(state['concurrency_limit']),
+                'in_flight': sum(state['leases'].values()),
+                'latency_ewma': round(state['latency_ewma'], 3) if state['latency_ewma'] is not None else None,
+                'throttled': state['throttled'],
+                'granted': state['granted'],
+                'shared': fcntl is not None
+            }
+        return self._with_state(snapshot)
@@ -3,67 +3,18 @@ Enhanced Research uAgent with MeTTa Knowledge Graphs
 Conducts intelligent market research with structured reasoning
 """
 
-import json
-import re
 from typing import List, Dict, Any
 from datetime import datetime
-from uagents import Context, Model
+from uagents import Context
 from base_uagent import BaseUAgent
+from agent_models import (
+    ResearchRequest, ResearchResponse, SimilarResearchResponse, MarketTrendResponse, MettaResearchResponse
+)
+from deadline import DeadlineExceededError
+from model_validation import build_model
 from knowledge.business_knowledge import BusinessKnowledgeGraph
 from knowledge.research_memory import ResearchMemorySystem
 
-class ResearchRequest(Model):
-    """Model for research request"""
-    idea: Dict[str, str]
-
-class Competitor(Model):
-    """Model for competitor information"""
-    name: str
-    description: str
-    strengths: str
-    weaknesses: str
-
-class MarketAnalysis(Model):
-    """Model for market analysis"""
-    market_size: str
-    growth_potential: str
-    key_challenges: List[str]
-    opportunities: List[str]
-
-class Recommendations(Model):
-    """Model for recommendations"""
-    positioning: str
-    differentiation: str
-    target_audience: str
-
-class ResearchResponse(Model):
-    """Model for research response"""
-    competitors: List[Competitor]
-    market_analysis: MarketAnalysis
-    recommendations: Recommendations
-
-class SimilarResearchResponse(Model):
-    """Response model for similar research endpoint"""
-    similar_research: List[Dict[str, Any]]
-    market_patterns: Dict[str, Any]
-    business_context: Dict[str, str]
-
-class MarketTrendResponse(Model):
-    """Response model for market trend analysis endpoint"""
-    industry_insights: Dict[str, str]
-    market_patterns: Dict[str, Any]
-    trends: str
-
-class MettaResearchResponse(Model):
-    """Enhanced research response with MeTTa insights"""
-    competitors: List[Competitor]
-    market_analysis: MarketAnalysis
-    recommendations: Recommendations
-    historical_context: str
-    similar_research: List[Dict[str, Any]]
-    market_patterns: Dict[str, Any]
-    success_factors: List[str]
-
 class ResearchMettauAgent(BaseUAgent):
     """Enhanced Research uAgent with MeTTa Knowledge Graphs"""
     
@@ -71,7 +22,8 @@ class ResearchMettauAgent(BaseUAgent):
         super().__init__(
             name="Research Agent (MeTTa)",
             role="Intelligent market research with structured reasoning",
-            port=8009  # Different port to avoid conflict
+            port=8009,  # Different port to avoid conflict
+            cache_ttl=7 * 24 * 3600  # Market research for the same idea changes slowly
         )
         
         # Initialize MeTTa knowledge systems
@@ -87,109 +39,13 @@ class ResearchMettauAgent(BaseUAgent):
         @self.agent.on_message(model=ResearchRequest)
         async def handle_enhanced_research_request(ctx: Context, sender: str, msg: ResearchRequest):
             """Conduct enhanced market research with MeTTa knowledge"""
-            try:
-                print(f"🧠 [{self.name}] Starting MeTTa-enhanced research for: {msg.idea.get('title', 'Unknown')}")
-                
-                # Step 1: Extract business context from idea
-                business_context = self.extract_business_context(msg.idea)
-                
-                # Step 2: Query MeTTa knowledge graphs
-                industry_insights = self.get_industry_insights(business_context)
-                historical_context = self.get_historical_context(business_context)
-                similar_research = self.find_similar_research(business_context)
-                
-                # Step 3: Enhanced ASI:One analysis with MeTTa context
-                enhanced_prompt = self.create_enhanced_prompt(msg.idea, industry_insights, historical_context)
-                
-                print(f"🧠 [{self.name}] Calling ASI:One with MeTTa context...")
-                response = await self.call_asi_one(enhanced_prompt, 3000)
-                
-                # Step 4: Parse and enhance response
-                research_data = self.parse_research_response(response)
-                
-                # Step 5: Add MeTTa insights
-                research_data = self.enhance_with_metta_insights(research_data, business_context)
-                
-                # Step 6: Store new research in memory
-                self.store_research_findings(msg.idea, research_data)
-                
-                # Step 7: Create enhanced response
-                enhanced_response = MettaResearchResponse(
-                    competitors=[Competitor(**comp) for comp in research_data.get('competitors', [])],
-                    market_analysis=MarketAnalysis(**research_data.get('market_analysis', {})),
-                    recommendations=Recommendations(**research_data.get('recommendations', {})),
-                    historical_context=historical_context,
-                    similar_research=similar_research,
-                    market_patterns=self.analyze_market_patterns(business_context),
-                    success_factors=self.get_success_factors(business_context)
-                )
-                
-                self.log_activity('Conducted MeTTa-enhanced research', {
-                    'idea_title': msg.idea.get('title', 'Unknown'),
-                    'industry': business_context.get('industry', 'Unknown'),
-                    'similar_research_found': len(similar_research),
-                    'sender': sender
-                })
-                
-                # Send enhanced response back
-                await ctx.send(sender, enhanced_response)
-                
-            except Exception as e:
-                print(f"❌ [{self.name}] Error in MeTTa-enhanced research: {str(e)}")
-                # Send fallback response
-                fallback_response = self.create_fallback_response()
-                await ctx.send(sender, fallback_response)
+            await self.reply(ctx, sender, msg, await self.research_idea_metta(msg))
         
         # REST endpoints for Node.js server integration
         @self.agent.on_rest_post("/research-idea-metta", ResearchRequest, MettaResearchResponse)
         async def handle_research_idea_metta_rest(ctx: Context, req: ResearchRequest) -> MettaResearchResponse:
             """REST endpoint for MeTTa-enhanced research"""
-            try:
-                print(f"🧠 [{self.name}] REST: MeTTa-enhanced research for: {req.idea.get('title', 'Unknown')}")
-                
-                # Extract business context
-                business_context = self.extract_business_context(req.idea)
-                
-                # Get MeTTa insights
-                industry_insights = self.get_industry_insights(business_context)
-                historical_context = self.get_historical_context(business_context)
-                similar_research = self.find_similar_research(business_context)
-                
-                # Create enhanced prompt
-                enhanced_prompt = self.create_enhanced_prompt(req.idea, industry_insights, historical_context)
-                
-                print(f"🧠 [{self.name}] REST: Calling ASI:One with MeTTa context...")
-                response = await self.call_asi_one(enhanced_prompt, 3000)
-                
-                # Parse and enhance response
-                research_data = self.parse_research_response(response)
-                research_data = self.enhance_with_metta_insights(research_data, business_context)
-                
-                # Store research findings
-                self.store_research_findings(req.idea, research_data)
-                
-                # Create enhanced response
-                enhanced_response = MettaResearchResponse(
-                    competitors=[Competitor(**comp) for comp in research_data.get('competitors', [])],
-                    market_analysis=MarketAnalysis(**research_data.get('market_analysis', {})),
-                    recommendations=Recommendations(**research_data.get('recommendations', {})),
-                    historical_context=historical_context,
-                    similar_research=similar_research,
-                    market_patterns=self.analyze_market_patterns(business_context),
-                    success_factors=self.get_success_factors(business_context)
-                )
-                
-                self.log_activity('REST: MeTTa-enhanced research completed', {
-                    'idea_title': req.idea.get('title', 'Unknown'),
-                    'industry': business_context.get('industry', 'Unknown'),
-                    'similar_research_found': len(similar_research)
-                })
-                
-                return enhanced_response
-                
-            except Exception as e:
-                print(f"❌ [{self.name}] REST: Error in MeTTa-enhanced research: {str(e)}")
-                return self.create_fallback_response()
+            return await self.research_idea_metta(req)
         
         # Additional MeTTa-specific endpoints
         @self.agent.on_rest_post("/find-similar-research", ResearchRequest, SimilarResearchResponse)
@@ -234,6 +90,58 @@ class ResearchMettauAgent(BaseUAgent):
                     trends="Error retrieving trends"
                 )
     
+    async def research_idea_metta(self, req: ResearchRequest) -> MettaResearchResponse:
+        """Conduct enhanced market research with MeTTa knowledge"""
+        try:
+            print(f"🧠 [{self.name}] MeTTa-enhanced research for: {req.idea.get('title', 'Unknown')}")
+            
+            # Extract business context
+            business_context = self.extract_business_context(req.idea)
+            
+            # Get MeTTa insights
+            industry_insights = self.get_industry_insights(business_context)
+            historical_context = self.get_historical_context(business_context)
+            similar_research = self.find_similar_research(business_context)
+            
+            # Create enhanced prompt
+            enhanced_prompt = self.create_enhanced_prompt(req.idea, industry_insights, historical_context)
+            
+            print(f"🧠 [{self.name}] Calling ASI:One with MeTTa context...")
+            response = await self.call_asi_one(enhanced_prompt, 3000, deadline=req.deadline)
+            
+            # Parse and enhance response
+            research_data = self.parse_research_response(response)
+            research_data = self.enhance_with_metta_insights(research_data, business_context)
+            
+            # Store research findings
+            self.store_research_findings(req.idea, research_data)
+            
+            # Create enhanced response
+            enhanced_response = build_model(MettaResearchResponse, {
+                'competitors': research_data.get('competitors', []),
+                'market_analysis': research_data.get('market_analysis', {}),
+                'recommendations': research_data.get('recommendations', {}),
+                'historical_context': historical_context,
+                'similar_research': similar_research,
+                'market_patterns': self.analyze_market_patterns(business_context),
+                'success_factors': self.get_success_factors(business_context),
+                'fallback': research_data.get('fallback') is True
+            })
+            
+            self.log_activity('MeTTa-enhanced research completed', {
+                'idea_title': req.idea.get('title', 'Unknown'),
+                'industry': business_context.get('industry', 'Unknown'),
+                'similar_research_found': len(similar_research)
+            })
+            
+            return enhanced_response
+            
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            print(f"❌ [{self.name}] Error in MeTTa-enhanced research: {str(e)}")
+            return self.create_fallback_response()
+    
     def extract_business_context(self, idea: Dict[str, str]) -> Dict[str, str]:
         """Extract business context from idea for MeTTa queries"""
         title = idea.get('title', '').lower()
@@ -359,24 +267,11 @@ Based on the historical context and industry insights above, provide a comprehen
     
     def parse_research_response(self, response: str) -> Dict[str, Any]:
         """Parse research response from ASI:One"""
-        try:
-            # Clean the response
-            cleaned_response = response
-            cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)
-            cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
-            if json_match:
-                cleaned_response = json_match.group(0)
-            
-            # Parse JSON
-            research_data = json.loads(cleaned_response)
-            return research_data
-            
-        except json.JSONDecodeError:
+        research_data = self.parse_llm_json(response, ResearchResponse)
+        if research_data is None:
             print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
-            return self.get_fallback_research_data()
+            return dict(self.get_fallback_research_data(), fallback=True)
+        return research_data
     
     def enhance_with_metta_insights(self, research_data: Dict[str, Any], business_context: Dict[str, str]) -> Dict[str, Any]:
         """Enhance research data with MeTTa insights"""
@@ -473,15 +368,14 @@ Based on the historical context and industry insights above, provide a comprehen
         """Create fallback response when MeTTa integration fails"""
         fallback_data = self.get_fallback_research_data()
         
-        return MettaResearchResponse(
-            competitors=[Competitor(**comp) for comp in fallback_data['competitors']],
-            market_analysis=MarketAnalysis(**fallback_data['market_analysis']),
-            recommendations=Recommendations(**fallback_data['recommendations']),
+        return build_model(MettaResearchResponse, dict(
+            fallback_data,
             historical_context="MeTTa knowledge system temporarily unavailable",
             similar_research=[],
             market_patterns={"error": "MeTTa analysis unavailable"},
-            success_factors=["Focus on user needs", "Build strong team", "Iterate quickly"]
-        )
+            success_factors=["Focus on user needs", "Build strong team", "Iterate quickly"],
+            fallback=True
+        ), trusted=True)
 
 # Create the enhanced agent instance
 research_metta_agent = ResearchMettauAgent()
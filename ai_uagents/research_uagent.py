@@ -3,11 +3,10 @@ Research uAgent for AI Company
 Conducts market research and competitive analysis
 """
 
-import json
-import re
 from typing import List, Dict, Any
 from uagents import Context, Model
 from base_uagent import BaseUAgent
+from model_validation import build_model
 
 class ResearchRequest(Model):
     """Model for research request"""
@@ -46,7 +45,8 @@ class ResearchuAgent(BaseUAgent):
         super().__init__(
             name="Research Agent",
             role="Market research and competitive analysis",
-            port=8002
+            port=8002,
+            cache_ttl=7 * 24 * 3600  # Market research for the same idea changes slowly
         )
         self.setup_handlers()
     
@@ -98,37 +98,23 @@ Format your response as JSON:
 
                 response = await self.call_asi_one(prompt, 2500)
                 
-                # Clean the response to handle JSON parsing issues
-                cleaned_response = response
-                cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
-                cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                
-                # Try to extract JSON from the response if it's wrapped in markdown
-                json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
-                if json_match:
-                    cleaned_response = json_match.group(0)
-                
-                # Parse JSON response
-                try:
-                    research_data = json.loads(cleaned_response)
-                except json.JSONDecodeError:
+                # Parse JSON response, repaired against the response schema
+                research_data = self.parse_llm_json(response, ResearchResponse)
+                if research_data is None:
                     print(f"❌ [{self.name}] JSON parsing failed, using fallback data")
                     research_data = self.get_fallback_research_data()
                 
-                # Convert to response models
-                competitors = [Competitor(**comp) for comp in research_data.get('competitors', [])]
-                market_analysis = MarketAnalysis(**research_data.get('market_analysis', {}))
-                recommendations = Recommendations(**research_data.get('recommendations', {}))
-                
-                research_response = ResearchResponse(
-                    competitors=competitors,
-                    market_analysis=market_analysis,
-                    recommendations=recommendations
-                )
+                # Build the response and its nested models in one pass
+                research_response = build_model(ResearchResponse, {
+                    'competitors': [],
+                    'market_analysis': {},
+                    'recommendations': {},
+                    **research_data
+                })
                 
                 self.log_activity('Conducted market research', {
                     'idea_title': msg.idea.get('title', 'Unknown'),
-                    'competitors_found': len(competitors),
+                    'competitors_found': len(research_response.competitors),
                     'sender': sender
                 })
                 
@@ -138,11 +124,7 @@ Format your response as JSON:
             except Exception as e:
                 print(f"❌ [{self.name}] Error conducting research: {str(e)}")
                 # Send error response with fallback data
-                fallback_response = ResearchResponse(
-                    competitors=[Competitor(**comp) for comp in self.get_fallback_research_data()['competitors']],
-                    market_analysis=MarketAnalysis(**self.get_fallback_research_data()['market_analysis']),
-                    recommendations=Recommendations(**self.get_fallback_research_data()['recommendations'])
-                )
+                fallback_response = build_model(ResearchResponse, self.get_fallback_research_data(), trusted=True)
                 await ctx.send(sender, fallback_response)
         
         # REST endpoints for Node.js server integration
@@ -191,37 +173,23 @@ Format your response as JSON:
 
                 response = await self.call_asi_one(prompt, 2500)
                 
-                # Clean the response to handle JSON parsing issues
-                cleaned_response = response
-                cleaned_response = re.sub(r'[\u0000-\u001F\u007F-\u009F]', '', cleaned_response)  # Remove control characters
-                cleaned_response = cleaned_response.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                
-                # Try to extract JSON from the response if it's wrapped in markdown
-                json_match = re.search(r'\{[\s\S]*\}', cleaned_response)
-                if json_match:
-                    cleaned_response = json_match.group(0)
-                
-                # Parse JSON response
-                try:
-                    research_data = json.loads(cleaned_response)
-                except json.JSONDecodeError:
+                # Parse JSON response, repaired against the response schema
+                research_data = self.parse_llm_json(response, ResearchResponse)
+                if research_data is None:
                     print(f"❌ [{self.name}] REST: JSON parsing failed, using fallback data")
                     research_data = self.get_fallback_research_data()
                 
-                # Convert to response models
-                competitors = [Competitor(**comp) for comp in research_data.get('competitors', [])]
-                market_analysis = MarketAnalysis(**research_data.get('market_analysis', {}))
-                recommendations = Recommendations(**research_data.get('recommendations', {}))
-                
-                research_response = ResearchResponse(
-                    competitors=competitors,
-                    market_analysis=market_analysis,
-                    recommendations=recommendations
-                )
+                # Build the response and its nested models in one pass
+                research_response = build_model(ResearchResponse, {
+                    'competitors': [],
+                    'market_analysis': {},
+                    'recommendations': {},
+                    **research_data
+                })
                 
                 self.log_activity('REST: Conducted market research', {
                     'idea_title': req.idea.get('title', 'Unknown'),
-                    'competitors_found': len(competitors)
+                    'competitors_found': len(research_response.competitors)
                 })
                 
                 return research_response
@@ -229,12 +197,7 @@ Format your response as JSON:
             except Exception as e:
                 print(f"❌ [{self.name}] REST: Error conducting research: {str(e)}")
                 # Return fallback response
-                fallback_data = self.get_fallback_research_data()
-                return ResearchResponse(
-                    competitors=[Competitor(**comp) for comp in fallback_data['competitors']],
-                    market_analysis=MarketAnalysis(**fallback_data['market_analysis']),
-                    recommendations=Recommendations(**fallback_data['recommendations'])
-                )
+                return build_model(ResearchResponse, self.get_fallback_research_data(), trusted=True)
     
     def get_fallback_research_data(self) -> Dict[str, Any]:
         """Get fallback research data when API fails"""
@@ -0,0 +1,61 @@
+"""
+Retry and hedging policy for ASI:One calls
+Exponential backoff with full jitter, Retry-After support and rolling latency percentiles
+"""
+
+import os
+import random
+import asyncio
+import aiohttp
+from collections import deque
+from typing import Optional
+from asi_one_client import ASIOneAPIError
+
+RETRYABLE_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+class RetryPolicy:
+    """Decides which failures to retry and how long to wait between attempts"""
+
+    def __init__(self, max_retries: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None):
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('ASI_ONE_MAX_RETRIES', '3'))
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv('ASI_ONE_RETRY_BASE_DELAY', '1'))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv('ASI_ONE_RETRY_MAX_DELAY', '20'))
+
+    @property
+    def max_attempts(self) -> int:
+        return self.max_retries + 1
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Transient HTTP statuses, timeouts and connection errors are retried"""
+        if isinstance(error, ASIOneAPIError):
+            return error.status in RETRYABLE_STATUSES
+        return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError))
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number ``attempt`` (0-based)
+
+        A server-provided Retry-After wins, with a little jitter added so the
+        agents sharing the key do not all come back at the same instant.
+        """
+        if retry_after is not None:
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+class LatencyTracker:
+    """Rolling window of successful call latencies"""
+
+    def __init__(self, window: int = 100, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, latency: float):
+        self.samples.append(latency)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Get the given percentile, or None until enough samples exist"""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index]
@@ -0,0 +1,62 @@
+"""
+Bureau mode for AI Company uAgents
+Runs every agent in one process and event loop; the orchestrator calls stage handlers directly
+"""
+
+import os
+from uagents import Bureau
+from agent_http import InProcessAgentTransport
+from ceo_uagent import ceo_agent, GenerateIdeas, EvaluateProduct
+from research_uagent import research_agent
+from research_metta_uagent import research_metta_agent, ResearchRequest
+from product_uagent import product_agent, ProductRequest
+from cmo_uagent import cmo_agent, MarketingRequest
+from cto_uagent import cto_agent, TechnicalRequest
+from head_engineering_uagent import head_engineering_agent, BoltPromptRequest
+from finance_uagent import finance_agent, RevenueAnalysisRequest
+from orchestrator_uagent import orchestrator_agent
+
+ALL_AGENTS = [
+    ceo_agent,
+    research_agent,
+    research_metta_agent,
+    product_agent,
+    cmo_agent,
+    cto_agent,
+    head_engineering_agent,
+    finance_agent,
+    orchestrator_agent
+]
+
+def create_in_process_transport() -> InProcessAgentTransport:
+    """Route the orchestrator's stage calls straight to the agents' stage handlers"""
+    return (InProcessAgentTransport()
+            .register('ceo', '/generate-ideas', GenerateIdeas, ceo_agent.generate_ideas)
+            .register('ceo', '/evaluate-product', EvaluateProduct, ceo_agent.evaluate_product)
+            .register('research_metta', '/research-idea-metta', ResearchRequest, research_metta_agent.research_idea_metta)
+            .register('product', '/develop-product', ProductRequest, product_agent.develop_product)
+            .register('cmo', '/develop-marketing', MarketingRequest, cmo_agent.develop_marketing)
+            .register('cto', '/develop-technical', TechnicalRequest, cto_agent.develop_technical)
+            .register('head_engineering', '/create-bolt-prompt', BoltPromptRequest, head_engineering_agent.create_bolt_prompt)
+            .register('finance', '/analyze-revenue', RevenueAnalysisRequest, finance_agent.analyze_revenue))
+
+def create_bureau() -> Bureau:
+    """One Bureau serving every agent on the orchestrator's port (BUREAU_PORT, default 8008)
+
+    REST endpoints of all agents share that port; endpoints several agents
+    define (such as /llm-stats) need the target agent's address in the
+    request's ``x-uagents-address`` header.
+    """
+    orchestrator_agent.agent_http = create_in_process_transport()
+    bureau = Bureau(port=int(os.getenv('BUREAU_PORT', str(orchestrator_agent.port))))
+    for agent in ALL_AGENTS:
+        bureau.add(agent.agent)
+    return bureau
+
+if __name__ == "__main__":
+    bureau = create_bureau()
+    print(f"🚀 Starting AI Company bureau with {len(ALL_AGENTS)} agents on port {os.getenv('BUREAU_PORT', orchestrator_agent.port)}")
+    for agent in ALL_AGENTS:
+        print(f"📍 {agent.name}: {agent.get_agent_address()}")
+    print("🔗 Orchestrator stage calls run in-process (no inter-agent HTTP)")
+    bureau.run()
@@ -0,0 +1,219 @@
+"""
+Semantic cache for AI Company workflows
+Serves stored stage results for near-duplicate business ideas using hashed n-gram TF-IDF
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+
+# Filler words that say nothing about the business concept itself
+STOP_WORDS = {
+    'a', 'an', 'the', 'for', 'of', 'to', 'and', 'or', 'with', 'in', 'on', 'by', 'that',
+    'which', 'my', 'our', 'your', 'app', 'platform', 'tool', 'service', 'helper', 'assistant',
+    'idea', 'startup', 'company', 'build', 'create', 'make'
+}
+
+class HashedNgramVectorizer:
+    """Maps text to sparse hashed features: word unigrams/bigrams plus character 3-5 grams
+
+    Character n-grams are taken inside word boundaries, so "businesses" and
+    "business" still share most of their features. Feature indices come
+    from a stable hash, so vectors stay comparable across restarts.
+    """
+
+    def __init__(self, n_features: int = 2 ** 15):
+        self.n_features = n_features
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        words = re.findall(r'[a-z0-9]+', text.lower())
+        return [word for word in words if word not in STOP_WORDS]
+
+    def _index(self, feature: str) -> int:
+        return zlib.crc32(feature.encode('utf-8')) % self.n_features
+
+    def term_counts(self, text: str) -> Dict[int, float]:
+        counts: Dict[int, float] = {}
+        words = self.tokenize(text)
+        features = [f"w:{word}" for word in words]
+        features += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f" {word} "
+            for n in (3, 4, 5):
+                features += [f"c:{padded[i:i + n]}" for i in range(max(1, len(padded) - n + 1))]
+        for feature in features:
+            index = self._index(feature)
+            counts[index] = counts.get(index, 0.0) + 1.0
+        return counts
+
+    def tf_vector(self, text: str) -> np.ndarray:
+        """Sublinear term-frequency vector (1 + log tf)"""
+        vector = np.zeros(self.n_features, dtype=np.float32)
+        for index, count in self.term_counts(text).items():
+            vector[index] = 1.0 + np.log(count)
+        return vector
+
+def same_stem(a: str, b: str) -> bool:
+    """Crude stemming: words match if equal or sharing their first four letters ("plans", "planner")"""
+    return a == b or (len(a) >= 4 and len(b) >= 4 and a[:4] == b[:4])
+
+class SemanticCache:
+    """Near-duplicate lookup of stored workflow stage results
+
+    Each entry holds the original text and the stage results produced for
+    it. Lookups weight the entries' term-frequency vectors by
+    inverse document frequency over the cached corpus, L2-normalise and take
+    the best cosine similarity; entries at or above ``threshold`` are hits.
+    Cosine alone cannot tell "scooter rental in Tokyo" from "scooter rental
+    in Paris", so a hit also requires every content word the two texts do
+    not share to be common across the cache and query (low IDF): present in
+    at least two of them and in ``common_word_share`` of them. Entries
+    expire after ``ttl`` seconds and persist to one JSON file.
+    """
+
+    def __init__(self, namespace: str, threshold: Optional[float] = None, ttl: Optional[int] = None,
+                 max_entries: Optional[int] = None, cache_dir: Optional[str] = None,
+                 common_word_share: Optional[float] = None):
+        self.namespace = namespace
+        self.threshold = threshold if threshold is not None else float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.6'))
+        self.common_word_share = (common_word_share if common_word_share is not None
+                                  else float(os.getenv('SEMANTIC_CACHE_COMMON_WORD_SHARE', '0.2')))
+        self.ttl = ttl or int(os.getenv('SEMANTIC_CACHE_TTL', str(7 * 24 * 3600)))
+        self.max_entries = max_entries or int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '500'))
+        self.path = os.path.join(cache_dir, f"semantic_{namespace}.json") if cache_dir else None
+        self.vectorizer = HashedNgramVectorizer()
+        self.entries: List[Dict[str, Any]] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._word_sets: Optional[List[set]] = None
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.writes = 0
+        self._load()
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        self.entries = [entry for entry in stored if now - entry['created_at'] < self.ttl]
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ [SEMANTIC CACHE] Could not persist {self.namespace}: {e}")
+
+    def _expire(self):
+        now = time.time()
+        fresh = [entry for entry in self.entries if now - entry['created_at'] < self.ttl]
+        if len(fresh) != len(self.entries):
+            self.entries = fresh
+            self._matrix = self._word_sets = None
+
+    def _tf_matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = np.vstack([self.vectorizer.tf_vector(entry['text']) for entry in self.entries])
+        return self._matrix
+
+    def _entry_words(self) -> List[set]:
+        if self._word_sets is None:
+            self._word_sets = [set(self.vectorizer.tokenize(entry['text'])) for entry in self.entries]
+        return self._word_sets
+
+    def distinctive_differences(self, text: str, other: str) -> List[str]:
+        """Content words found in only one of the texts and rare across the cache (high IDF)
+
+        ``text`` is the query and ``other`` a cached entry; document frequency
+        counts the query plus every cached entry.
+        """
+        words, other_words = set(self.vectorizer.tokenize(text)), set(self.vectorizer.tokenize(other))
+        unmatched = [word for word in words ^ other_words
+                     if not any(same_stem(word, candidate) for candidate in (other_words if word in words else words))]
+        entry_words = self._entry_words()
+        documents = len(entry_words) + 1
+        distinctive = []
+        for word in sorted(unmatched):
+            frequency = (word in words) + sum(word in entry for entry in entry_words)
+            if frequency < 2 or frequency < self.common_word_share * documents:
+                distinctive.append(word)
+        return distinctive
+
+    def similarities(self, text: str) -> np.ndarray:
+        """Cosine similarity of text to every cached entry"""
+        matrix = self._tf_matrix()
+        query = self.vectorizer.tf_vector(text)
+        document_frequency = np.count_nonzero(np.vstack([matrix, query]), axis=0)
+        idf = np.log((len(self.entries) + 2) / (document_frequency + 1)) + 1.0
+        weighted = matrix * idf
+        query = query * idf
+        norms = np.linalg.norm(weighted, axis=1) * np.linalg.norm(query)
+        return np.divide(weighted @ query, norms, out=np.zeros(len(self.entries)), where=norms > 0)
+
+    def lookup(self, text: str, stages: List[str]) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Best cached entry holding all ``stages`` for a near-duplicate of text"""
+        self._expire()
+        candidates = [i for i, entry in enumerate(self.entries) if all(stage in entry['stages'] for stage in stages)]
+        if candidates:
+            scores = self.similarities(text)
+            for best in sorted(candidates, key=lambda i: scores[i], reverse=True):
+                if scores[best] < self.threshold:
+                    break
+                entry = self.entries[best]
+                differences = self.distinctive_differences(text, entry['text'])
+                if differences:
+                    self.rejected += 1
+                    print(f"🧭 [SEMANTIC CACHE] '{text}' not matched to '{entry['text']}' "
+                          f"(similarity {scores[best]:.2f}, differs in {', '.join(differences)})")
+                    continue
+                self.hits += 1
+                print(f"🧭 [SEMANTIC CACHE] '{text}' matched '{entry['text']}' (similarity {scores[best]:.2f})")
+                return entry['stages'], float(scores[best])
+        self.misses += 1
+        return None
+
+    def store(self, text: str, stages: Dict[str, Any]):
+        """Store stage results for text, merging with an existing entry for the same text"""
+        self._expire()
+        for entry in self.entries:
+            if entry['text'] == text:
+                entry['stages'].update(stages)
+                entry['created_at'] = time.time()
+                break
+        else:
+            self.entries.append({'text': text, 'created_at': time.time(), 'stages': dict(stages)})
+            if len(self.entries) > self.max_entries:
+                self.entries = self.entries[-self.max_entries:]
+            self._matrix = self._word_sets = None
+        self.writes += 1
+        self._save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'namespace': self.namespace,
+            'threshold': self.threshold,
+            'common_word_share': self.common_word_share,
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'rejected': self.rejected,
+            'writes': self.writes,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,44 @@
+"""
+Single-flight de-duplication for AI Company agents
+Concurrent callers with the same key share one in-flight upstream call
+"""
+
+import asyncio
+from typing import Dict, Any, Callable, Awaitable
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution
+
+    The first caller (the leader) starts the work as a task; callers that
+    arrive while it is running await the same task and receive its result
+    or exception. Cancelling one waiter does not cancel the shared task.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def in_flight(self, key: str) -> bool:
+        """Check whether a call for key is currently running"""
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn once per key at a time and share its outcome"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get leader/follower counters"""
+        return {
+            'in_flight': len(self._calls),
+            'upstream_calls': self.leaders,
+            'shared_calls': self.followers
+        }
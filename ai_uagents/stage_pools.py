@@ -0,0 +1,181 @@
+"""
+Per-stage worker pools for the Workflow Orchestrator
+Staged event-driven pipelining: each stage has its own queue and worker count
+"""
+
+import os
+import time
+import asyncio
+from typing import Dict, Any, Optional, Callable, Awaitable
+from deadline import DeadlineExceededError, time_left
+
+def parse_pool_sizes(spec: str) -> Dict[str, int]:
+    """Parse ``"research=4,fused=2"`` into ``{'research': 4, 'fused': 2}``"""
+    sizes = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            stage, workers = item.split('=', 1)
+            sizes[stage.strip()] = max(1, int(workers))
+    return sizes
+
+class StagePool:
+    """A queue in front of a fixed number of workers for one stage
+
+    Work from every workflow joins the same queue, so concurrent workflows
+    pipeline through the stage and at most ``workers`` of its calls are in
+    flight at once. Work submitted with a deadline is dropped once that
+    deadline passes, whether it is still queued or already running.
+    """
+
+    def __init__(self, stage: str, workers: int):
+        self.stage = stage
+        self.workers = workers
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks = []
+        self.busy = 0
+        self.stats = {'processed': 0, 'failed': 0, 'cancelled': 0, 'expired': 0,
+                      'total_service': 0.0, 'max_service': 0.0, 'total_wait': 0.0, 'max_wait': 0.0}
+
+    def start(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+            self.tasks = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers, and the callers of work still queued so none waits forever"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        while self.queue is not None and not self.queue.empty():
+            future = self.queue.get_nowait()[0]
+            if not future.done():
+                future.cancel()
+                self.stats['cancelled'] += 1
+        self.tasks, self.queue = [], None
+
+    async def submit(self, work: Callable[[], Awaitable[Any]], deadline: Optional[float] = None) -> Any:
+        """Queue ``work`` (a coroutine function) and wait for a worker to run it
+
+        Raises DeadlineExceededError, instead of waiting on, once the epoch
+        ``deadline`` passes; the work is then never dispatched, or is
+        cancelled if a worker has already started it.
+        """
+        self.start()
+        remaining = time_left(deadline)
+        if remaining is not None and remaining <= 0:
+            self.stats['expired'] += 1
+            raise DeadlineExceededError(f"Workflow deadline passed before the {self.stage} stage was queued")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((future, work, time.monotonic(), deadline))
+        try:
+            await asyncio.wait({future}, timeout=time_left(deadline))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        if not future.done():
+            future.set_exception(DeadlineExceededError(f"Workflow deadline passed in the {self.stage} stage pool"))
+            self.stats['expired'] += 1
+        return future.result()
+
+    async def worker(self):
+        while True:
+            future, work, enqueued, deadline = await self.queue.get()
+            try:
+                if future.done():
+                    # The caller gave up or ran out of time while queued
+                    if future.cancelled():
+                        self.stats['cancelled'] += 1
+                    continue
+                if deadline is not None and time_left(deadline) <= 0:
+                    future.set_exception(DeadlineExceededError(f"Workflow deadline passed in the {self.stage} stage pool"))
+                    self.stats['expired'] += 1
+                    continue
+                await self.serve(future, work, time.monotonic() - enqueued)
+            finally:
+                self.queue.task_done()
+
+    async def serve(self, future: asyncio.Future, work: Callable[[], Awaitable[Any]], waited: float):
+        self.busy += 1
+        started = time.monotonic()
+        task = asyncio.ensure_future(work())
+        # A caller cancelled or out of time mid-call cancels the call instead of holding the worker
+        future.add_done_callback(lambda f: task.cancel())
+        try:
+            result = await task
+            if not future.done():
+                future.set_result(result)
+        except asyncio.CancelledError:
+            if not future.done():
+                # The pool is stopping: don't leave the caller waiting
+                future.cancel()
+                raise
+            if future.cancelled():
+                self.stats['cancelled'] += 1
+        except Exception as e:
+            self.stats['failed'] += 1
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            self.busy -= 1
+            service = time.monotonic() - started
+            stats = self.stats
+            stats['processed'] += 1
+            stats['total_service'] += service
+            stats['max_service'] = max(stats['max_service'], service)
+            stats['total_wait'] += waited
+            stats['max_wait'] = max(stats['max_wait'], waited)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats
+        processed = stats['processed']
+        return {
+            'workers': self.workers,
+            'busy': self.busy,
+            'queue_depth': self.queue.qsize() if self.queue else 0,
+            'processed': processed,
+            'failed': stats['failed'],
+            'cancelled': stats['cancelled'],
+            'expired': stats['expired'],
+            'avg_service_time': round(stats['total_service'] / processed, 3) if processed else None,
+            'max_service_time': round(stats['max_service'], 3),
+            'avg_wait_time': round(stats['total_wait'] / processed, 3) if processed else None,
+            'max_wait_time': round(stats['max_wait'], 3)
+        }
+
+class StagePools:
+    """One StagePool per workflow stage, created on first use
+
+    Pool sizes come from STAGE_POOL_WORKERS (e.g. ``"research=4,fused=2"``);
+    stages not listed get STAGE_POOL_DEFAULT_WORKERS (default 4).
+    """
+
+    def __init__(self, sizes: Optional[Dict[str, int]] = None, default_workers: Optional[int] = None):
+        self.sizes = sizes if sizes is not None else parse_pool_sizes(os.getenv('STAGE_POOL_WORKERS', ''))
+        self.default_workers = default_workers or int(os.getenv('STAGE_POOL_DEFAULT_WORKERS', '4'))
+        self.pools: Dict[str, StagePool] = {}
+
+    def pool(self, stage: str) -> StagePool:
+        if stage not in self.pools:
+            self.pools[stage] = StagePool(stage, self.sizes.get(stage, self.default_workers))
+        return self.pools[stage]
+
+    async def run(self, stage: str, work: Callable[[], Awaitable[Any]], deadline: Optional[float] = None) -> Any:
+        """Run ``work`` on the stage's pool and return its result, giving up at the epoch ``deadline``"""
+        return await self.pool(stage).submit(work, deadline)
+
+    async def stop(self):
+        await asyncio.gather(*(pool.stop() for pool in self.pools.values()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and service time per stage, plus the likely bottleneck
+
+        The bottleneck is the stage whose queued calls wait longest on
+        average: it is the one that most needs more workers.
+        """
+        stages = {stage: pool.get_stats() for stage, pool in self.pools.items()}
+        waits = {stage: stats['avg_wait_time'] for stage, stats in stages.items() if stats['avg_wait_time']}
+        return {
+            'default_workers': self.default_workers,
+            'stages': stages,
+            'bottleneck': max(waits, key=waits.get) if waits else None
+        }
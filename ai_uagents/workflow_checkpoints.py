@@ -0,0 +1,175 @@
+"""
+Durable workflow checkpoints for the Workflow Orchestrator
+Stores every finished stage in SQLite so failed workflows resume where they stopped
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+from typing import Dict, Any, Optional
+
+DEFAULT_CHECKPOINT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.workflow_state', 'checkpoints.sqlite3')
+
+class WorkflowFailedError(Exception):
+    """Raised when a checkpointed workflow fails; carries the id to resume it with"""
+
+    def __init__(self, workflow_id: str, error: Exception):
+        super().__init__(str(error))
+        self.workflow_id = workflow_id
+        self.error = error
+
+class WorkflowCheckpointStore:
+    """SQLite-backed stage results keyed by workflow id
+
+    One row per workflow holds its parameters and status; one row per
+    finished stage holds that stage's result and timing. Writes are small
+    and committed immediately (WAL mode), so a crash loses at most the
+    stage in progress. Workflows older than ``ttl`` seconds are purged.
+
+    The same database memoizes stage results by a hash of their inputs
+    (see WorkflowDAG.run), shared across workflows.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[int] = None):
+        self.path = path or os.getenv('WORKFLOW_CHECKPOINT_DB') or DEFAULT_CHECKPOINT_DB
+        self.ttl = ttl or int(os.getenv('WORKFLOW_CHECKPOINT_TTL', str(7 * 24 * 3600)))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS workflows (
+                workflow_id TEXT PRIMARY KEY,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS stage_results (
+                workflow_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                result TEXT NOT NULL,
+                timing TEXT,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (workflow_id, stage)
+            );
+            CREATE TABLE IF NOT EXISTS stage_memo (
+                stage TEXT NOT NULL,
+                input_key TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (stage, input_key)
+            );
+        """)
+        self._conn.commit()
+        self.stages_saved = 0
+        self.stages_restored = 0
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    def create_workflow(self, params: Dict[str, Any]) -> str:
+        """Record a new workflow and return its id"""
+        self.purge_expired()
+        workflow_id = uuid.uuid4().hex
+        now = time.time()
+        self._conn.execute(
+            'INSERT INTO workflows (workflow_id, params, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+            (workflow_id, json.dumps(params), 'running', now, now)
+        )
+        self._conn.commit()
+        return workflow_id
+
+    def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Workflow parameters and status, or None if unknown"""
+        row = self._conn.execute(
+            'SELECT params, status, error, created_at, updated_at FROM workflows WHERE workflow_id = ?',
+            (workflow_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        stages = [stage for (stage,) in self._conn.execute(
+            'SELECT stage FROM stage_results WHERE workflow_id = ? ORDER BY completed_at', (workflow_id,)
+        )]
+        return {
+            'workflow_id': workflow_id,
+            'params': json.loads(row[0]),
+            'status': row[1],
+            'error': row[2],
+            'created_at': row[3],
+            'updated_at': row[4],
+            'completed_stages': stages
+        }
+
+    def save_stage(self, workflow_id: str, stage: str, result: Any, timing: Optional[Dict[str, Any]] = None):
+        """Checkpoint one finished stage"""
+        now = time.time()
+        self._conn.execute(
+            'INSERT OR REPLACE INTO stage_results (workflow_id, stage, result, timing, completed_at) VALUES (?, ?, ?, ?, ?)',
+            (workflow_id, stage, json.dumps(result, default=str), json.dumps(timing), now)
+        )
+        self._conn.execute('UPDATE workflows SET updated_at = ? WHERE workflow_id = ?', (now, workflow_id))
+        self._conn.commit()
+        self.stages_saved += 1
+
+    def load_stages(self, workflow_id: str) -> Dict[str, Any]:
+        """All checkpointed stage results for a workflow, keyed by stage"""
+        stages = {stage: json.loads(result) for stage, result in self._conn.execute(
+            'SELECT stage, result FROM stage_results WHERE workflow_id = ?', (workflow_id,)
+        )}
+        self.stages_restored += len(stages)
+        return stages
+
+    def mark(self, workflow_id: str, status: str, error: Optional[str] = None):
+        """Set a workflow's status (running, completed or failed)"""
+        self._conn.execute(
+            'UPDATE workflows SET status = ?, error = ?, updated_at = ? WHERE workflow_id = ?',
+            (status, error, time.time(), workflow_id)
+        )
+        self._conn.commit()
+
+    def get_memo(self, stage: str, input_key: str) -> Optional[Any]:
+        """Memoized result of a stage for these exact inputs, or None"""
+        row = self._conn.execute(
+            'SELECT result FROM stage_memo WHERE stage = ? AND input_key = ? AND created_at >= ?',
+            (stage, input_key, time.time() - self.ttl)
+        ).fetchone()
+        if row is None:
+            self.memo_misses += 1
+            return None
+        self.memo_hits += 1
+        return json.loads(row[0])
+
+    def save_memo(self, stage: str, input_key: str, result: Any):
+        """Memoize a stage result under the hash of its inputs"""
+        self._conn.execute(
+            'INSERT OR REPLACE INTO stage_memo (stage, input_key, result, created_at) VALUES (?, ?, ?, ?)',
+            (stage, input_key, json.dumps(result, default=str), time.time())
+        )
+        self._conn.commit()
+
+    def purge_expired(self):
+        cutoff = time.time() - self.ttl
+        self._conn.execute(
+            'DELETE FROM stage_results WHERE workflow_id IN (SELECT workflow_id FROM workflows WHERE updated_at < ?)',
+            (cutoff,)
+        )
+        self._conn.execute('DELETE FROM workflows WHERE updated_at < ?', (cutoff,))
+        self._conn.execute('DELETE FROM stage_memo WHERE created_at < ?', (cutoff,))
+        self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get workflow counts by status and stage counters"""
+        statuses = dict(self._conn.execute('SELECT status, COUNT(*) FROM workflows GROUP BY status').fetchall())
+        return {
+            'path': self.path,
+            'workflows_by_status': statuses,
+            'stages_saved': self.stages_saved,
+            'stages_restored': self.stages_restored,
+            'memo_hits': self.memo_hits,
+            'memo_misses': self.memo_misses
+        }
+
+    def close(self):
+        self._conn.close()
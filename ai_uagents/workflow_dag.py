@@ -0,0 +1,154 @@
+"""
+Async DAG executor for AI Company workflows
+Runs each stage as soon as the stages it depends on have finished
+"""
+
+import json
+import time
+import asyncio
+import hashlib
+from typing import Dict, Any, List, Callable, Awaitable, Optional, Iterable
+
+StageFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+def stage_input_key(stage: str, inputs: Dict[str, Any]) -> str:
+    """Stable hash of a stage's name and its exact inputs"""
+    payload = json.dumps({'stage': stage, 'inputs': inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def is_fallback(result: Any) -> bool:
+    """True for a missing result or one an agent flagged as canned fallback data"""
+    return result is None or (isinstance(result, dict) and bool(result.get('fallback')))
+
+class WorkflowStageError(Exception):
+    """Raised when a workflow stage fails; carries the stage name"""
+
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+class WorkflowDAG:
+    """Dependency graph of async workflow stages
+
+    Each stage is an async function receiving the results of the stages run
+    so far (keyed by stage name) and returning its own result. ``run``
+    starts every stage whose dependencies are satisfied concurrently. When
+    a stage fails, the stages depending on it are skipped but independent
+    branches run on to completion (and checkpoint), so their work survives
+    for a resume; the first failure is then re-raised as a
+    WorkflowStageError.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageFn] = {}
+        self.dependencies: Dict[str, List[str]] = {}
+
+    def add_stage(self, name: str, fn: StageFn, depends_on: Iterable[str] = ()):
+        """Register a stage; dependencies must already be registered"""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        missing = [dep for dep in depends_on if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on undefined stages {missing}")
+        self.stages[name] = fn
+        self.dependencies[name] = list(depends_on)
+        return self
+
+    async def run(self, results: Optional[Dict[str, Any]] = None,
+                  on_stage_complete: Optional[Callable[[str, Any, Dict[str, float]], Any]] = None,
+                  memo=None, inputs: Any = None, overrides: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Run all stages; returns (results, timings)
+
+        ``results`` may be pre-seeded, e.g. from a checkpoint: a stage whose
+        name is already present is not run again and its timing is marked
+        ``reused``. Timings hold each stage's start offset, duration and end
+        offset in seconds relative to the start of the run.
+        ``on_stage_complete(name, result, timing)`` is called (and awaited if
+        it returns an awaitable) after each stage finishes or is reused.
+
+        With a ``memo`` store (``get_memo(stage, key)`` / ``save_memo(stage,
+        key, result)``) each stage is keyed by a hash of the shared ``inputs``
+        plus its dependencies' results; a stage whose key was seen before
+        is not run and its timing is marked ``memoized``. Results that are
+        None or flagged ``{'fallback': True}`` (an agent's canned data) are
+        never memoized, so the next run tries the stage again. ``overrides``
+        maps a stage name to fields merged over that stage's result, so
+        only the stages downstream of an edit get new keys.
+        """
+        results = results if results is not None else {}
+        overrides = overrides or {}
+        timings: Dict[str, Dict[str, float]] = {}
+        started = time.monotonic()
+        done_events = {name: asyncio.Event() for name in self.stages}
+        reused = {name for name in self.stages if name in results}
+        failed = set()
+        errors: List[BaseException] = []
+
+        async def run_stage(name: str):
+            try:
+                await execute_stage(name)
+            except BaseException as e:
+                failed.add(name)
+                errors.append(e)
+                raise
+            finally:
+                done_events[name].set()
+
+        async def execute_stage(name: str):
+            for dep in self.dependencies[name]:
+                await done_events[dep].wait()
+            if any(dep in failed for dep in self.dependencies[name]):
+                failed.add(name)
+                return
+            stage_started = time.monotonic()
+            key = None
+            if memo is not None and name not in reused:
+                key = stage_input_key(name, {
+                    'shared': inputs,
+                    'dependencies': {dep: results[dep] for dep in self.dependencies[name]}
+                })
+                cached = memo.get_memo(name, key)
+                if cached is not None:
+                    results[name] = cached
+                    reused.add(name)
+            if name in reused:
+                timings[name] = {'started_at': round(stage_started - started, 3), 'duration': 0.0,
+                                 'finished_at': round(stage_started - started, 3),
+                                 'memoized' if key else 'reused': True}
+            else:
+                try:
+                    result = await self.stages[name](results)
+                except asyncio.CancelledError:
+                    raise
+                except WorkflowStageError:
+                    raise
+                except Exception as e:
+                    raise WorkflowStageError(name, e) from e
+                finished = time.monotonic()
+                results[name] = result
+                if key and not is_fallback(result):
+                    memo.save_memo(name, key, result)
+                timings[name] = {
+                    'started_at': round(stage_started - started, 3),
+                    'duration': round(finished - stage_started, 3),
+                    'finished_at': round(finished - started, 3)
+                }
+            if name in overrides and isinstance(results[name], dict):
+                results[name] = dict(results[name], **overrides[name])
+            done_events[name].set()
+            if on_stage_complete:
+                outcome = on_stage_complete(name, results[name], timings[name])
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+
+        tasks = [asyncio.ensure_future(run_stage(name)) for name in self.stages]
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        if errors:
+            raise errors[0]
+        return results, timings
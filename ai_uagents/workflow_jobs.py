@@ -0,0 +1,141 @@
+"""
+Asynchronous workflow jobs for the Workflow Orchestrator
+Queues submitted workflows and runs them on a bounded pool of worker tasks
+"""
+
+import os
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, List, Callable, Awaitable, Optional
+
+# runner(params, on_stage_complete) -> final business plan
+JobRunner = Callable[[Dict[str, Any], Callable[[str, Any, Dict[str, float]], None]], Awaitable[Dict[str, Any]]]
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue has no room for another workflow"""
+
+class WorkflowJobManager:
+    """Bounded job queue plus worker pool for long-running workflows
+
+    ``submit`` records the job and returns immediately; ``max_workers``
+    worker tasks take jobs in submission order and run them through
+    ``runner``, recording each finished stage as it completes. Finished
+    jobs are kept for ``job_ttl`` seconds so clients can collect results.
+    """
+
+    def __init__(self, runner: JobRunner, max_workers: Optional[int] = None,
+                 max_queue: Optional[int] = None, job_ttl: Optional[int] = None):
+        self.runner = runner
+        self.max_workers = max_workers or int(os.getenv('WORKFLOW_JOB_WORKERS', '4'))
+        self.max_queue = max_queue or int(os.getenv('WORKFLOW_JOB_QUEUE_SIZE', '100'))
+        self.job_ttl = job_ttl or int(os.getenv('WORKFLOW_JOB_TTL', '3600'))
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+
+    def start(self):
+        """Start the worker tasks on the running loop"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.ensure_future(self._worker(i)) for i in range(self.max_workers)]
+        print(f"🧵 [JOBS] Started {self.max_workers} workflow workers (queue size {self.max_queue})")
+
+    async def stop(self):
+        """Cancel the worker tasks"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a workflow and return its job record"""
+        if self._queue is None:
+            self.start()
+        self._expire()
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'status': 'queued',
+            'params': params,
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'completed_stages': [],
+            'stage_timings': {},
+            'result': None,
+            'error': None
+        }
+        try:
+            self._queue.put_nowait(job['job_id'])
+        except asyncio.QueueFull:
+            self.stats['rejected'] += 1
+            raise JobQueueFullError(f"Workflow job queue is full ({self.max_queue} jobs)")
+        self.jobs[job['job_id']] = job
+        self.stats['submitted'] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job by id"""
+        return self.jobs.get(job_id)
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position among queued jobs, or None once the job has started"""
+        queued = [jid for jid, job in self.jobs.items() if job['status'] == 'queued']
+        return queued.index(job_id) + 1 if job_id in queued else None
+
+    def _expire(self):
+        now = time.time()
+        for job_id in list(self.jobs):
+            job = self.jobs[job_id]
+            if job['finished_at'] and now - job['finished_at'] > self.job_ttl:
+                del self.jobs[job_id]
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            try:
+                if job is not None:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict[str, Any]):
+        job['status'] = 'running'
+        job['started_at'] = time.time()
+        print(f"🧵 [JOBS] Running workflow job {job['job_id']}")
+
+        def record_stage(stage: str, result: Any, timing: Dict[str, float]):
+            job['completed_stages'].append(stage)
+            job['stage_timings'][stage] = timing
+
+        try:
+            job['result'] = await self.runner(job['params'], record_stage)
+            job['status'] = 'completed'
+            self.stats['completed'] += 1
+        except asyncio.CancelledError:
+            job['status'] = 'failed'
+            job['error'] = 'Cancelled'
+            raise
+        except Exception as e:
+            job['status'] = 'failed'
+            job['error'] = str(e)
+            self.stats['failed'] += 1
+            print(f"❌ [JOBS] Workflow job {job['job_id']} failed: {e}")
+        finally:
+            job['finished_at'] = time.time()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, worker count and job counters"""
+        statuses: Dict[str, int] = {}
+        for job in self.jobs.values():
+            statuses[job['status']] = statuses.get(job['status'], 0) + 1
+        return dict(
+            self.stats,
+            workers=len(self._workers),
+            queued=self._queue.qsize() if self._queue else 0,
+            jobs_by_status=statuses
+        )
@@ -0,0 +1,157 @@
+"""
+Workflow admission scheduler for the Workflow Orchestrator
+Priority classes, per-tenant fair queuing and a cap on concurrent workflows
+"""
+
+import os
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+from deadline import DeadlineExceededError, time_left
+
+# Highest priority first
+PRIORITY_CLASSES = ('interactive', 'standard', 'batch')
+
+def clamp_priority(requested: Optional[str], ceiling: str) -> str:
+    """Priority a caller asked for, never above ``ceiling``; unknown or missing values get ``ceiling``
+
+    Clients may lower a workflow's priority but cannot claim a higher class
+    than the endpoint they called grants.
+    """
+    if requested in PRIORITY_CLASSES and PRIORITY_CLASSES.index(requested) >= PRIORITY_CLASSES.index(ceiling):
+        return requested
+    return ceiling
+
+class WorkflowScheduler:
+    """Admits at most ``max_concurrent`` workflows at a time
+
+    Waiting workflows are served strictly by priority class; within a class
+    tenants take turns (round robin), so one tenant's backlog cannot starve
+    another's. ``reserved_interactive`` slots are only ever given to
+    interactive workflows, keeping their latency stable while batch work
+    fills the rest. A workflow whose deadline passes while it waits is
+    dropped from the queue with DeadlineExceededError instead of being
+    admitted with no time left.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, reserved_interactive: Optional[int] = None):
+        self.max_concurrent = max_concurrent or int(os.getenv('WORKFLOW_MAX_CONCURRENT', '8'))
+        if reserved_interactive is None:
+            reserved_interactive = int(os.getenv('WORKFLOW_RESERVED_INTERACTIVE_SLOTS', '1'))
+        self.reserved_interactive = min(reserved_interactive, self.max_concurrent - 1)
+        self.queues: Dict[str, "OrderedDict[str, deque]"] = {priority: OrderedDict() for priority in PRIORITY_CLASSES}
+        self.running = 0
+        self.running_by_priority = {priority: 0 for priority in PRIORITY_CLASSES}
+        self.stats = {priority: {'admitted': 0, 'cancelled': 0, 'expired': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+                      for priority in PRIORITY_CLASSES}
+
+    @asynccontextmanager
+    async def slot(self, tenant: Optional[str] = None, priority: Optional[str] = None,
+                   deadline: Optional[float] = None):
+        """Hold one workflow slot for the duration of the ``async with`` block
+
+        Raises DeadlineExceededError if the epoch ``deadline`` passes before
+        a slot is free.
+        """
+        priority = priority or 'standard'
+        await self.acquire(tenant or 'default', priority, deadline)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    async def acquire(self, tenant: str, priority: str, deadline: Optional[float] = None):
+        if priority not in self.queues:
+            raise ValueError(f"Unknown priority '{priority}', expected one of {PRIORITY_CLASSES}")
+        remaining = time_left(deadline)
+        if remaining is not None and remaining <= 0:
+            self.stats[priority]['expired'] += 1
+            raise DeadlineExceededError("Workflow deadline passed before it was queued")
+        waiter = asyncio.get_running_loop().create_future()
+        enqueued = time.monotonic()
+        self.queues[priority].setdefault(tenant, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await asyncio.wait({waiter}, timeout=remaining)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as the caller gave up: hand the slot back
+                self.release(priority)
+            else:
+                self._discard(priority, tenant, waiter)
+                waiter.cancel()
+            self.stats[priority]['cancelled'] += 1
+            raise
+        waited = time.monotonic() - enqueued
+        if not waiter.done():
+            self._discard(priority, tenant, waiter)
+            waiter.cancel()
+            self.stats[priority]['expired'] += 1
+            raise DeadlineExceededError(f"Workflow deadline passed after {waited:.1f}s waiting for a slot")
+        stats = self.stats[priority]
+        stats['admitted'] += 1
+        stats['total_wait'] += waited
+        stats['max_wait'] = max(stats['max_wait'], waited)
+
+    def release(self, priority: str):
+        self.running -= 1
+        self.running_by_priority[priority] -= 1
+        self._dispatch()
+
+    def _discard(self, priority: str, tenant: str, waiter: asyncio.Future):
+        tenants = self.queues[priority]
+        if tenant in tenants:
+            try:
+                tenants[tenant].remove(waiter)
+            except ValueError:
+                pass
+            if not tenants[tenant]:
+                del tenants[tenant]
+
+    def _next_waiter(self) -> Optional[tuple]:
+        for priority in PRIORITY_CLASSES:
+            if priority != 'interactive' and self.running >= self.max_concurrent - self.reserved_interactive:
+                continue
+            tenants = self.queues[priority]
+            while tenants:
+                tenant, waiters = tenants.popitem(last=False)
+                waiter = waiters.popleft()
+                if waiters:
+                    tenants[tenant] = waiters  # back of the rotation
+                if not waiter.done():
+                    return priority, waiter
+        return None
+
+    def _dispatch(self):
+        while self.running < self.max_concurrent:
+            picked = self._next_waiter()
+            if picked is None:
+                return
+            priority, waiter = picked
+            self.running += 1
+            self.running_by_priority[priority] += 1
+            waiter.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get running and queued workflows plus wait times per priority class"""
+        return {
+            'max_concurrent': self.max_concurrent,
+            'reserved_interactive': self.reserved_interactive,
+            'running': self.running,
+            'queued': sum(len(waiters) for tenants in self.queues.values() for waiters in tenants.values()),
+            'priorities': {
+                priority: {
+                    'running': self.running_by_priority[priority],
+                    'queued': sum(len(waiters) for waiters in self.queues[priority].values()),
+                    'queued_by_tenant': {tenant: len(waiters) for tenant, waiters in self.queues[priority].items()},
+                    'admitted': stats['admitted'],
+                    'cancelled': stats['cancelled'],
+                    'expired': stats['expired'],
+                    'avg_wait': round(stats['total_wait'] / stats['admitted'], 3) if stats['admitted'] else None,
+                    'max_wait': round(stats['max_wait'], 3)
+                }
+                for priority, stats in self.stats.items()
+            }
+        }
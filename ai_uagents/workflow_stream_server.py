@@ -0,0 +1,210 @@
+"""
+Streaming HTTP server for the Workflow Orchestrator
+Serves workflow progress (server-sent events) and batch results (NDJSON) alongside the uAgents REST API
+"""
+
+import os
+import json
+import time
+import asyncio
+from aiohttp import web
+from typing import Dict, Any, Optional
+from workflow_scheduler import clamp_priority
+
+HEARTBEAT_INTERVAL = 15  # seconds between SSE keep-alive comments
+
+def parse_flag(value: Any) -> bool:
+    """A boolean request flag: JSON true or the string "true" (query strings), in any case"""
+    return str(value).lower() == 'true'
+
+class WorkflowStreamServer:
+    """aiohttp.web side server for responses uAgents REST handlers cannot stream
+
+    uAgents REST endpoints return one JSON document per request, so progress
+    streaming and batch results live on their own port (ORCHESTRATOR_STREAM_PORT, default 8010)
+    and runs on the orchestrator's event loop, sharing its caches and pools.
+    """
+
+    def __init__(self, orchestrator, host: Optional[str] = None, port: Optional[int] = None):
+        self.orchestrator = orchestrator
+        self.host = host or os.getenv('ORCHESTRATOR_STREAM_HOST', '0.0.0.0')
+        self.port = port or int(os.getenv('ORCHESTRATOR_STREAM_PORT', '8010'))
+        self.app = web.Application()
+        self.app.router.add_get('/workflow-stream', self.handle_workflow_stream)
+        self.app.router.add_post('/workflow-stream', self.handle_workflow_stream)
+        self.app.router.add_post('/workflow-batch', self.handle_workflow_batch)
+        self._runner: Optional[web.AppRunner] = None
+        self.active_streams = 0
+        self.batch_concurrency = int(os.getenv('WORKFLOW_BATCH_CONCURRENCY', '4'))
+        self.batch_max_concurrency = int(os.getenv('WORKFLOW_BATCH_MAX_CONCURRENCY', '16'))
+        self.batch_max_items = int(os.getenv('WORKFLOW_BATCH_MAX_ITEMS', '1000'))
+        self.batch_stats = {'batches': 0, 'items': 0, 'succeeded': 0, 'failed': 0, 'active_batches': 0}
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"📡 [STREAM] Workflow stream server listening on http://{self.host}:{self.port}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @staticmethod
+    async def read_params(request: web.Request) -> Dict[str, Any]:
+        """Workflow parameters from a JSON body (POST) or the query string (GET, for EventSource)"""
+        if request.method == 'POST':
+            body = await request.json()
+        else:
+            body = dict(request.query)
+        if not body.get('user_input'):
+            raise web.HTTPBadRequest(text=json.dumps({'error': 'user_input is required'}), content_type='application/json')
+        return {
+            'user_input': body['user_input'],
+            'idea_count': int(body.get('idea_count', 1)),
+            'mode': body.get('mode') or None,
+            'bypass_cache': parse_flag(body.get('bypass_cache', False)),
+            'overrides': body.get('overrides') if isinstance(body.get('overrides'), dict) else None,
+            'time_budget': float(body['time_budget']) if body.get('time_budget') else None,
+            'tenant': body.get('tenant') or request.remote,
+            'priority': clamp_priority(body.get('priority'), 'interactive')
+        }
+
+    @staticmethod
+    async def send_event(response: web.StreamResponse, event: str, data: Any):
+        payload = json.dumps(data, default=str)
+        await response.write(f"event: {event}\ndata: {payload}\n\n".encode('utf-8'))
+
+    async def handle_workflow_stream(self, request: web.Request) -> web.StreamResponse:
+        """Run a workflow and emit one SSE event per finished stage
+
+        Events: ``started``, then ``stage`` ({stage, payload, timing}) as each
+        stage completes, then ``completed`` with the workflow summary, or
+        ``error``. Closing the connection cancels the workflow.
+        """
+        params = await self.read_params(request)
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'Access-Control-Allow-Origin': '*'
+        })
+        await response.prepare(request)
+
+        events: asyncio.Queue = asyncio.Queue()
+
+        def on_stage_complete(stage: str, result: Any, timing: Dict[str, float]):
+            events.put_nowait(('stage', {'stage': stage, 'payload': result, 'timing': timing}))
+
+        async def run():
+            try:
+                plan = await self.orchestrator.run_scheduled_workflow(
+                    params['tenant'], params['priority'],
+                    params['user_input'], params['idea_count'], params['mode'], params['bypass_cache'],
+                    on_stage_complete=on_stage_complete, overrides=params['overrides'],
+                    time_budget=params['time_budget']
+                )
+                events.put_nowait(('completed', {'workflow_summary': plan['workflow_summary']}))
+            except Exception as e:
+                events.put_nowait(('error', {'error': str(e)}))
+
+        self.active_streams += 1
+        started = time.monotonic()
+        workflow = asyncio.ensure_future(run())
+        try:
+            await self.send_event(response, 'started', {'user_input': params['user_input'], 'mode': params['mode']})
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(events.get(), timeout=HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    await response.write(b": keep-alive\n\n")
+                    continue
+                await self.send_event(response, event, data)
+                if event in ('completed', 'error'):
+                    break
+            print(f"📡 [STREAM] Workflow stream finished in {time.monotonic() - started:.1f}s")
+        except (ConnectionResetError, asyncio.CancelledError):
+            print(f"📡 [STREAM] Client disconnected, cancelling workflow for: {params['user_input']}")
+            raise
+        finally:
+            self.active_streams -= 1
+            if not workflow.done():
+                workflow.cancel()
+        return response
+
+    async def handle_workflow_batch(self, request: web.Request) -> web.StreamResponse:
+        """Run many workflows with bounded concurrency, streaming one NDJSON line per item
+
+        Body: ``{"user_inputs": [...], "concurrency": 4, "mode": ..., "bypass_cache": false, "time_budget": ...}``.
+        Items are admitted as ``batch`` priority, so they yield to interactive
+        workflows. Lines arrive in completion order and carry the item's ``index``; a final
+        ``{"summary": ...}`` line closes the stream. All items share the
+        orchestrator's semantic cache and the agents' LLM caches, so repeated
+        and near-duplicate concepts reuse earlier results.
+        """
+        body = await request.json()
+        user_inputs = body.get('user_inputs')
+        if not isinstance(user_inputs, list) or not user_inputs:
+            raise web.HTTPBadRequest(text=json.dumps({'error': 'user_inputs must be a non-empty list'}), content_type='application/json')
+        if len(user_inputs) > self.batch_max_items:
+            raise web.HTTPBadRequest(text=json.dumps({'error': f'At most {self.batch_max_items} items per batch'}), content_type='application/json')
+        concurrency = max(1, min(int(body.get('concurrency') or self.batch_concurrency), self.batch_max_concurrency))
+        mode = body.get('mode') or None
+        bypass_cache = parse_flag(body.get('bypass_cache', False))
+        time_budget = float(body['time_budget']) if body.get('time_budget') else None  # per item
+        tenant = body.get('tenant') or request.remote
+
+        response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson', 'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_item(index: int, user_input: str) -> Dict[str, Any]:
+            async with semaphore:
+                item_started = time.monotonic()
+                try:
+                    plan = await self.orchestrator.run_scheduled_workflow(tenant, 'batch', user_input, 1, mode, bypass_cache,
+                                                                          time_budget=time_budget)
+                    return {'index': index, 'user_input': user_input, 'success': True,
+                            'duration': round(time.monotonic() - item_started, 3), 'data': plan}
+                except Exception as e:
+                    return {'index': index, 'user_input': user_input, 'success': False,
+                            'duration': round(time.monotonic() - item_started, 3), 'error': str(e)}
+
+        print(f"📦 [BATCH] Running {len(user_inputs)} workflows with concurrency {concurrency}")
+        self.batch_stats['batches'] += 1
+        self.batch_stats['active_batches'] += 1
+        started = time.monotonic()
+        succeeded = 0
+        tasks = [asyncio.ensure_future(run_item(i, str(text))) for i, text in enumerate(user_inputs)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                item = await finished
+                succeeded += item['success']
+                self.batch_stats['items'] += 1
+                self.batch_stats['succeeded' if item['success'] else 'failed'] += 1
+                await response.write((json.dumps(item, default=str) + '\n').encode('utf-8'))
+
+            elapsed = time.monotonic() - started
+            summary = {
+                'items': len(user_inputs),
+                'succeeded': succeeded,
+                'failed': len(user_inputs) - succeeded,
+                'concurrency': concurrency,
+                'duration': round(elapsed, 3),
+                'throughput_per_minute': round(len(user_inputs) / elapsed * 60, 2) if elapsed else None
+            }
+            await response.write((json.dumps({'summary': summary}) + '\n').encode('utf-8'))
+            print(f"📦 [BATCH] Finished {len(user_inputs)} workflows in {elapsed:.1f}s ({succeeded} succeeded)")
+        except (ConnectionResetError, asyncio.CancelledError):
+            print("📦 [BATCH] Client disconnected, cancelling remaining batch items")
+            raise
+        finally:
+            self.batch_stats['active_batches'] -= 1
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'port': self.port, 'active_streams': self.active_streams, 'batch': dict(self.batch_stats)}
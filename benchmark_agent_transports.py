@@ -0,0 +1,86 @@
+"""
+Benchmark REST vs uAgents message transport for orchestrator stage calls
+Sends the same product stage request through each transport and compares latency
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai_uagents'))
+
+from uagents import Agent, Context
+from agent_http import AgentHTTPClient
+from agent_messaging import create_message_transport
+
+# Identical payloads hit the product agent's LLM cache after the warm-up call,
+# so the timings below are dominated by the transport itself
+PAYLOAD = {
+    "idea": {
+        "title": "AI meal planning assistant",
+        "description": "Weekly meal plans and shopping lists for busy families",
+        "target_market": "Working parents",
+        "revenue_model": "Subscription"
+    },
+    "research": {"competitors": [], "market_analysis": {}, "recommendations": {}}
+}
+
+async def time_calls(transport, calls, concurrency):
+    """Run ``calls`` product stage calls, ``concurrency`` at a time; return per-call seconds"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.monotonic()
+            await transport.post('product', '/develop-product', PAYLOAD, timeout=300)
+            latencies.append(time.monotonic() - started)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies
+
+def report(name, latencies, wall):
+    latencies = sorted(latencies)
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{name:<8} {len(latencies):>5} {p50 * 1000:>9.1f}ms {p95 * 1000:>9.1f}ms {len(latencies) / wall:>9.1f}/s")
+
+def benchmark_agent_transports(calls=50, concurrency=8):
+    """Compare REST and message transports against a running product agent"""
+    client = Agent(name="transport_benchmark", port=int(os.getenv('BENCHMARK_AGENT_PORT', '8020')),
+                   endpoint=[f"http://localhost:{os.getenv('BENCHMARK_AGENT_PORT', '8020')}/submit"])
+    http = AgentHTTPClient({'product': 8003})
+    messages = create_message_transport().attach(client)
+
+    async def run_benchmark():
+        # Replies are only dispatched once startup has finished
+        await asyncio.sleep(1)
+        print("🧪 Benchmarking agent transports (product stage)...")
+        print("=" * 60)
+        try:
+            for transport in (http, messages):
+                await transport.post('product', '/develop-product', PAYLOAD, timeout=300)  # warm-up, fills the cache
+            print(f"{'transport':<8} {'calls':>5} {'p50':>11} {'p95':>11} {'throughput':>11}")
+            for name, transport in (('rest', http), ('message', messages)):
+                started = time.monotonic()
+                latencies = await time_calls(transport, calls, concurrency)
+                report(name, latencies, time.monotonic() - started)
+        except Exception as e:
+            print(f"❌ Benchmark failed: {e}")
+        finally:
+            await http.close()
+            await messages.close()
+            os._exit(0)
+
+    @client.on_event("startup")
+    async def start_benchmark(ctx: Context):
+        asyncio.create_task(run_benchmark())
+
+    client.run()
+
+if __name__ == "__main__":
+    benchmark_agent_transports(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    )
@@ -0,0 +1,66 @@
+"""
+Benchmark batch workflow throughput
+Sends the same batch of concepts at increasing concurrency limits and reports workflows per minute
+"""
+
+import sys
+import json
+import time
+import requests
+
+BATCH_URL = "http://localhost:8010/workflow-batch"
+
+CONCEPTS = [
+    "AI bookkeeping assistant for freelancers",
+    "Marketplace for renting camping gear",
+    "Personalized language learning through podcasts",
+    "Smart inventory tracking for small restaurants",
+    "Carbon footprint tracker for logistics fleets",
+    "Telehealth platform for pet owners",
+    "Peer tutoring network for university students",
+    "AI resume reviewer for career changers"
+]
+
+def run_batch(concurrency, run_id):
+    """Run one batch and return its summary line"""
+    # A unique suffix per run keeps caches from answering for earlier runs
+    user_inputs = [f"{concept} (batch {run_id})" for concept in CONCEPTS]
+    started = time.time()
+    summary = None
+    with requests.post(BATCH_URL, json={"user_inputs": user_inputs, "concurrency": concurrency},
+                       stream=True, timeout=3600) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            item = json.loads(line)
+            if 'summary' in item:
+                summary = item['summary']
+            else:
+                status = "✅" if item['success'] else f"❌ {item.get('error')}"
+                print(f"   [{time.time() - started:6.1f}s] #{item['index']} {status} ({item['duration']:.1f}s)")
+    return summary
+
+def benchmark_batch_throughput(levels):
+    print("🧪 Benchmarking batch workflow throughput...")
+    print("=" * 60)
+    results = []
+    for concurrency in levels:
+        print(f"\n📦 Concurrency {concurrency}")
+        try:
+            summary = run_batch(concurrency, f"{int(time.time())}-{concurrency}")
+        except Exception as e:
+            print(f"❌ Batch failed: {e}")
+            continue
+        results.append(summary)
+        print(f"✅ {summary['succeeded']}/{summary['items']} in {summary['duration']:.1f}s "
+              f"({summary['throughput_per_minute']} workflows/min)")
+
+    print("\n📊 Summary")
+    print("-" * 60)
+    for summary in results:
+        print(f"concurrency {summary['concurrency']:>3}: {summary['throughput_per_minute']:>7} workflows/min, "
+              f"{summary['failed']} failed")
+
+if __name__ == "__main__":
+    benchmark_batch_throughput([int(level) for level in sys.argv[1:]] or [1, 2, 4, 8])
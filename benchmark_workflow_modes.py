@@ -0,0 +1,93 @@
+"""
+Benchmark staged vs fused workflow modes
+Runs the orchestrator workflow in each mode and compares latency and ASI:One token totals
+"""
+
+import sys
+import time
+import requests
+
+ORCHESTRATOR_URL = "http://localhost:8008/process-business-idea"
+
+# Every agent that may call ASI:One during a workflow, with its REST port
+AGENT_PORTS = {
+    'research_metta': 8009,
+    'product': 8003,
+    'cmo': 8004,
+    'cto': 8005,
+    'head_engineering': 8006,
+    'finance': 8007,
+    'orchestrator': 8008
+}
+
+def collect_token_totals():
+    """Sum the estimated upstream token counters reported by every agent"""
+    totals = {'upstream_calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+    for name, port in AGENT_PORTS.items():
+        try:
+            response = requests.get(f"http://localhost:{port}/llm-stats", timeout=5)
+            response.raise_for_status()
+            tokens = response.json()['stats'].get('tokens') or {}
+        except Exception as e:
+            print(f"⚠️ Could not read /llm-stats from {name} ({port}): {e}")
+            continue
+        for key in totals:
+            totals[key] += tokens.get(key, 0)
+    return totals
+
+def run_workflow(user_input, mode):
+    """Run one workflow and return (seconds, token delta, fused sections)"""
+    before = collect_token_totals()
+    started = time.time()
+    response = requests.post(
+        ORCHESTRATOR_URL,
+        json={"user_input": user_input, "idea_count": 1, "mode": mode},
+        timeout=900
+    )
+    elapsed = time.time() - started
+    response.raise_for_status()
+    result = response.json()
+    if not result.get('success'):
+        raise Exception(result.get('error') or result.get('message'))
+    after = collect_token_totals()
+    delta = {key: after[key] - before[key] for key in after}
+    fused_sections = result['data']['workflow_summary'].get('fused_sections', [])
+    return elapsed, delta, fused_sections
+
+def benchmark_workflow_modes(runs=2):
+    """Compare staged and fused modes on latency and token totals"""
+    print("🧪 Benchmarking workflow modes...")
+    print("=" * 60)
+
+    results = {'staged': [], 'fused': []}
+    for run in range(runs):
+        for mode in results:
+            # A unique input per run keeps the LLM response cache out of the measurement
+            user_input = f"AI meal planning assistant for busy families (benchmark {int(time.time())}-{run}-{mode})"
+            print(f"\n🔍 Run {run + 1}/{runs}, {mode} mode")
+            try:
+                elapsed, tokens, fused_sections = run_workflow(user_input, mode)
+            except Exception as e:
+                print(f"❌ {mode} run failed: {e}")
+                continue
+            results[mode].append((elapsed, tokens))
+            print(f"✅ {elapsed:.1f}s, {tokens['upstream_calls']} LLM calls, "
+                  f"{tokens['prompt_tokens']} prompt + {tokens['completion_tokens']} completion tokens")
+            if mode == 'fused':
+                print(f"   Fused sections: {fused_sections}")
+
+    print("\n📊 Summary (averages)")
+    print("-" * 60)
+    print(f"{'mode':<8} {'runs':>4} {'latency':>10} {'calls':>7} {'prompt':>9} {'completion':>11}")
+    for mode, samples in results.items():
+        if not samples:
+            print(f"{mode:<8} {0:>4} {'-':>10}")
+            continue
+        count = len(samples)
+        avg = lambda key: sum(tokens[key] for _, tokens in samples) / count
+        latency = sum(elapsed for elapsed, _ in samples) / count
+        print(f"{mode:<8} {count:>4} {latency:>9.1f}s {avg('upstream_calls'):>7.1f} "
+              f"{avg('prompt_tokens'):>9.0f} {avg('completion_tokens'):>11.0f}")
+
+if __name__ == "__main__":
+    benchmark_workflow_modes(int(sys.argv[1]) if len(sys.argv) > 1 else 2)
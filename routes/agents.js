@@ -207,10 +207,26 @@ router.post('/bolt-prompt/:ideaId', async (req, res) => {
 
 // ===== uAGENT INTEGRATION ROUTES =====
 
+// Orchestrator priority classes, highest first
+const PRIORITY_CLASSES = ['interactive', 'standard', 'batch'];
+
+// Fair-share tenant for the orchestrator's scheduler: the caller's address as Express
+// resolves it (set TRUST_PROXY behind a load balancer). Client-supplied tenants are ignored,
+// otherwise every request through this proxy would share one tenant or pick its own.
+function workflowTenant(req) {
+  return req.ip;
+}
+
+// Clients may lower a workflow's priority but never raise it above the endpoint's class
+function workflowPriority(requested, ceiling) {
+  const rank = PRIORITY_CLASSES.indexOf(requested);
+  return rank >= PRIORITY_CLASSES.indexOf(ceiling) ? requested : ceiling;
+}
+
 // Complete workflow endpoint - calls the orchestrator uAgent
 router.post('/process-complete-workflow', async (req, res) => {
   try {
-    const { user_input, idea_count = 1 } = req.body;
+    const { user_input, idea_count = 1, overrides, time_budget, priority } = req.body;
     console.log('🎯 [ROUTE] Complete workflow endpoint called for:', user_input);
     
     if (!user_input) {
@@ -220,7 +236,11 @@ router.post('/process-complete-workflow', async (req, res) => {
     console.log('🎯 [ROUTE] Calling Workflow Orchestrator uAgent...');
     const response = await axios.post('http://localhost:8008/process-business-idea', {
       user_input,
-      idea_count
+      idea_count,
+      overrides,
+      time_budget,
+      tenant: workflowTenant(req),
+      priority: workflowPriority(priority, 'interactive')
     }, {
       timeout: 600000 // 10 minutes timeout
     });
@@ -228,7 +248,8 @@ router.post('/process-complete-workflow', async (req, res) => {
     console.log('🎯 [ROUTE] Orchestrator returned:', {
       success: response.data.success,
       selected_idea: response.data.data?.idea?.title,
-      workflow_status: response.data.data?.workflow_summary?.workflow_status
+      workflow_status: response.data.data?.workflow_summary?.workflow_status,
+      reused_stages: response.data.data?.workflow_summary?.reused_stages
     });
     
     res.json(response.data);
@@ -242,6 +263,128 @@ router.post('/process-complete-workflow', async (req, res) => {
   }
 });
 
+// Resume a failed workflow; only stages without a checkpoint are re-run
+router.post('/resume-workflow/:workflowId', async (req, res) => {
+  try {
+    const response = await axios.post('http://localhost:8008/resume-workflow', {
+      workflow_id: req.params.workflowId
+    }, {
+      timeout: 600000 // 10 minutes timeout
+    });
+
+    console.log('🎯 [ROUTE] Workflow resume returned:', {
+      success: response.data.success,
+      resumed_stages: response.data.data?.workflow_summary?.resumed_stages
+    });
+
+    res.json(response.data);
+  } catch (error) {
+    console.error('❌ [ROUTE] Error resuming workflow:', error.message);
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
+// Submit a workflow as a background job on the orchestrator; returns a job id immediately
+router.post('/workflow-jobs', async (req, res) => {
+  try {
+    const { user_input, idea_count = 1, mode, bypass_cache = false, overrides, priority } = req.body;
+    
+    if (!user_input) {
+      return res.status(400).json({ success: false, error: 'User input is required' });
+    }
+    
+    const response = await axios.post('http://localhost:8008/workflow-jobs', {
+      user_input,
+      idea_count,
+      mode,
+      bypass_cache,
+      overrides,
+      tenant: workflowTenant(req),
+      priority: workflowPriority(priority, 'standard')
+    }, {
+      timeout: 10000
+    });
+    
+    console.log('🎯 [ROUTE] Workflow job queued:', response.data.job_id);
+    res.status(response.data.success ? 202 : 503).json(response.data);
+  } catch (error) {
+    console.error('❌ [ROUTE] Error submitting workflow job:', error.message);
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
+// Poll a workflow job: status, finished stages and, once completed, the business plan
+router.get('/workflow-jobs/:jobId', async (req, res) => {
+  try {
+    const response = await axios.post('http://localhost:8008/workflow-jobs/status', {
+      job_id: req.params.jobId
+    }, {
+      timeout: 10000
+    });
+    
+    res.status(response.data.job_id && response.data.status ? 200 : 404).json(response.data);
+  } catch (error) {
+    console.error('❌ [ROUTE] Error fetching workflow job:', error.message);
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
+// Stream workflow progress (server-sent events) from the orchestrator's stream server
+router.get('/workflow-stream', async (req, res) => {
+  try {
+    if (!req.query.user_input) {
+      return res.status(400).json({ success: false, error: 'User input is required' });
+    }
+    
+    const upstream = await axios.get('http://localhost:8010/workflow-stream', {
+      params: {
+        ...req.query,
+        tenant: workflowTenant(req),
+        priority: workflowPriority(req.query.priority, 'interactive')
+      },
+      responseType: 'stream',
+      timeout: 0
+    });
+    
+    res.setHeader('Content-Type', 'text/event-stream');
+    res.setHeader('Cache-Control', 'no-cache');
+    res.setHeader('Connection', 'keep-alive');
+    res.flushHeaders();
+    
+    upstream.data.pipe(res);
+    // Closing the browser tab cancels the workflow upstream
+    req.on('close', () => upstream.data.destroy());
+  } catch (error) {
+    console.error('❌ [ROUTE] Error streaming workflow:', error.message);
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
+// Run a batch of workflows; results stream back as NDJSON, one line per finished item
+router.post('/workflow-batch', async (req, res) => {
+  try {
+    const { user_inputs } = req.body;
+    if (!Array.isArray(user_inputs) || user_inputs.length === 0) {
+      return res.status(400).json({ success: false, error: 'user_inputs must be a non-empty list' });
+    }
+    
+    const upstream = await axios.post('http://localhost:8010/workflow-batch', {
+      ...req.body,
+      tenant: workflowTenant(req)
+    }, {
+      responseType: 'stream',
+      timeout: 0
+    });
+    
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    upstream.data.pipe(res);
+    req.on('close', () => upstream.data.destroy());
+  } catch (error) {
+    console.error('❌ [ROUTE] Error running workflow batch:', error.message);
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
 // ===== UTILITY ROUTES =====
 
 // Test ASI:One API directly
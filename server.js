@@ -6,6 +6,13 @@ require('dotenv').config();
 const app = express();
 const PORT = process.env.PORT || 5001;
 
+// Behind a load balancer (Railway, Render) req.ip is only the client's address when the
+// proxy hops are trusted; TRUST_PROXY takes a hop count or an Express trust proxy setting
+if (process.env.TRUST_PROXY) {
+  const trustProxy = process.env.TRUST_PROXY;
+  app.set('trust proxy', /^\d+$/.test(trustProxy) ? Number(trustProxy) : trustProxy);
+}
+
 // Middleware - CORS configuration for multiple ports
 const corsOptions = {
   origin: [
@@ -0,0 +1,189 @@
+"""
+Test the multi-backend inference router
+Runs three local OpenAI-compatible stand-ins (failing, healthy and slow) and checks failover, probes and deadlines
+"""
+
+import asyncio
+import os
+import time
+import sys
+import json
+import tempfile
+from aiohttp import web
+
+# Add the ai_uagents directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ai_uagents'))
+
+os.environ.setdefault('ASI_ONE_MAX_RETRIES', '2')
+os.environ.setdefault('ASI_ONE_RETRY_BASE_DELAY', '0.05')
+os.environ.setdefault('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '2')
+
+from retry_policy import RetryPolicy
+from rate_governor import ASIOneRateGovernor
+from deadline import DeadlineExceededError
+from inference_fallback_manager import InferenceRouter, OpenAICompatibleBackend, LocalStubBackend, NoBackendAvailableError
+
+HEALTHY_CONTENT = '{"status": "ok", "backend": "healthy"}'
+
+async def failing_handler(request):
+    return web.json_response({'error': 'upstream overloaded'}, status=503)
+
+async def healthy_handler(request):
+    payload = await request.json()
+    if not payload.get('stream'):
+        return web.json_response({'choices': [{'message': {'content': HEALTHY_CONTENT}}]})
+
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+    await response.prepare(request)
+    for i in range(0, len(HEALTHY_CONTENT), 8):
+        chunk = {'choices': [{'delta': {'content': HEALTHY_CONTENT[i:i + 8]}}]}
+        await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+    await response.write(b"data: [DONE]\n\n")
+    return response
+
+async def slow_handler(request):
+    await asyncio.sleep(5)
+    return web.json_response({'choices': [{'message': {'content': HEALTHY_CONTENT}}]})
+
+async def start_server(handler, port):
+    app = web.Application()
+    app.router.add_post('/chat/completions', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    return runner
+
+async def test_inference_router():
+    """Test failover, circuit breaking and streaming across backends"""
+    print("🧪 Testing inference router...")
+    print()
+
+    runners = [
+        await start_server(failing_handler, 8091),
+        await start_server(healthy_handler, 8092),
+        await start_server(slow_handler, 8093)
+    ]
+    failing = OpenAICompatibleBackend('failing', 'http://127.0.0.1:8091', 'test-key', 'stand-in')
+    healthy = OpenAICompatibleBackend('healthy', 'http://127.0.0.1:8092', 'test-key', 'stand-in')
+    router = InferenceRouter([failing, healthy], retry_policy=RetryPolicy(), hedge_enabled=False)
+
+    try:
+        # Test 1: a failing primary fails over to the healthy backend
+        print("Test 1: Failover on 5xx")
+        served_by = {}
+        content = await router.complete("Say ok", 50, served_by=served_by)
+        assert content == HEALTHY_CONTENT, content
+        assert served_by['backend'] == 'healthy', served_by
+        print("✅ Failover working! Served by:", served_by['backend'])
+        print()
+
+        # Test 2: repeated failures open the failing backend's circuit
+        print("Test 2: Circuit breaker")
+        # The healthy backend now ranks first, so drive the failing one directly
+        for _ in range(2):
+            try:
+                await failing.complete("Say ok", 50)
+            except Exception as e:
+                print(f"Expected failure: {e}")
+        stats = router.get_stats()
+        print("Router stats:", json.dumps(stats, indent=2))
+        assert stats['backends']['failing']['circuit'] == 'open', stats
+        assert router.ranked_backends()[0] is healthy
+        print("✅ Circuit opened and healthy backend ranked first!")
+        print()
+
+        # Test 3: streaming goes through the healthy backend
+        print("Test 3: Streaming")
+        chunks = [delta async for delta in router.stream("Say ok", 50)]
+        assert ''.join(chunks) == HEALTHY_CONTENT, chunks
+        print(f"✅ Streaming working! ({len(chunks)} chunks)")
+        print()
+
+        # Test 4: with no healthy backend the local stub answers, and is marked uncacheable
+        print("Test 4: Local stub fallback")
+        stub_router = InferenceRouter([failing, LocalStubBackend('{"stub": true}')], retry_policy=RetryPolicy())
+        served_by = {}
+        content = await stub_router.complete("Say ok", 50, served_by=served_by)
+        assert json.loads(content) == {'stub': True}, content
+        assert served_by['cacheable'] is False, served_by
+        print("✅ Stub fallback working and excluded from cache!")
+        print()
+
+        # Test 5: a router with only failing backends raises
+        print("Test 5: No backend available")
+        only_failing = InferenceRouter([failing], retry_policy=RetryPolicy(max_retries=0))
+        try:
+            await only_failing.complete("Say ok", 50)
+            print("❌ Expected an error")
+        except NoBackendAvailableError:
+            print("✅ NoBackendAvailableError raised while circuit is open")
+        print()
+
+        # Test 6: a healthy backend keeps serving even though the stub answers faster
+        print("Test 6: Local stub ranked last")
+        primary = OpenAICompatibleBackend('primary', 'http://127.0.0.1:8092', 'test-key', 'stand-in')
+        with_stub = InferenceRouter([primary, LocalStubBackend()], retry_policy=RetryPolicy())
+        try:
+            for _ in range(5):
+                served_by = {}
+                await with_stub.complete("Say ok", 50, served_by=served_by)
+                assert served_by['backend'] == 'primary', served_by
+        finally:
+            await with_stub.close()
+        print("✅ Primary served every call with the stub configured")
+        print()
+
+        # Test 7: a cancelled half-open probe frees the breaker for the next probe
+        print("Test 7: Cancelled half-open probe")
+        slow = OpenAICompatibleBackend('slow', 'http://127.0.0.1:8093', 'test-key', 'stand-in')
+        try:
+            slow.breaker.state = 'open'
+            slow.breaker.opened_at = time.monotonic() - slow.breaker.reset_timeout
+            assert slow.breaker.allow_request()
+            probe = asyncio.create_task(slow.complete("Say ok", 50))
+            await asyncio.sleep(0.2)
+            probe.cancel()
+            try:
+                await probe
+            except asyncio.CancelledError:
+                pass
+            assert slow.breaker.state == 'half_open' and slow.breaker.is_available(), vars(slow.breaker)
+        finally:
+            await slow.close()
+        print("✅ Breaker admits a new probe after cancellation")
+        print()
+
+        # Test 8: a deadline bounds retries and backoff, not just one attempt
+        print("Test 8: Deadline across retries")
+        slow_router = InferenceRouter([OpenAICompatibleBackend('slow', 'http://127.0.0.1:8093', 'test-key', 'stand-in')],
+                                      retry_policy=RetryPolicy(), hedge_enabled=False)
+        started = time.monotonic()
+        try:
+            await slow_router.complete("Say ok", 50, deadline=time.time() + 0.5)
+            print("❌ Expected DeadlineExceededError")
+        except DeadlineExceededError:
+            elapsed = time.monotonic() - started
+            assert elapsed < 1.0, elapsed
+            print(f"✅ Gave up after {elapsed:.2f}s on a 0.5s budget")
+        finally:
+            await slow_router.close()
+        print()
+
+        # Test 9: the rate governor does not wait past the deadline
+        print("Test 9: Deadline on the rate governor")
+        with tempfile.TemporaryDirectory() as state_dir:
+            governor = ASIOneRateGovernor(os.path.join(state_dir, 'governor.json'))
+            governor._with_state(lambda state: state.update(tokens=0.0, rate=0.2))
+            started = time.monotonic()
+            try:
+                await governor.acquire(deadline=time.time() + 0.5)
+                print("❌ Expected DeadlineExceededError")
+            except DeadlineExceededError:
+                print(f"✅ Refused after {time.monotonic() - started:.2f}s instead of waiting for a token")
+    finally:
+        await router.close()
+        for runner in runners:
+            await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(test_inference_router())
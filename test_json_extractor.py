@@ -0,0 +1,104 @@
+"""
+Test the shared schema-guided JSON extractor
+Feeds typical malformed LLM completions through extract_json and checks the repairs
+"""
+
+import os
+import sys
+import time
+from typing import List, Optional
+
+# Add the ai_uagents directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ai_uagents'))
+
+from uagents import Model
+from json_extractor import extract_json
+
+class Market(Model):
+    primary: str
+    secondary: str
+
+class Concept(Model):
+    product_name: str
+    core_features: List[str]
+    target_market: Market
+    viability_score: int
+    go_decision: bool
+
+class Forecast(Model):
+    revenue: Optional[float] = None
+    customers: Optional[int] = None
+
+def test_json_extractor():
+    """Test fences, prose, control characters, truncation and schema repairs"""
+    print("🧪 Testing JSON extractor...")
+    print()
+
+    # Test 1: valid JSON is returned untouched
+    print("Test 1: Valid JSON")
+    data, repaired = extract_json('{"product_name": "Planner", "core_features": ["Plans"]}', Concept)
+    assert data == {'product_name': 'Planner', 'core_features': ['Plans']} and not repaired, data
+    print("✅ Valid JSON parsed without repairs")
+    print()
+
+    # Test 2: code fences, prose and raw newlines inside strings
+    print("Test 2: Fences, prose and raw newlines")
+    completion = 'Here is the plan:\n```json\n{\n  "product_name": "Meal\nPlanner"\n}\n```\nLet me know {if} you need more.'
+    data, _ = extract_json(completion)
+    assert data == {'product_name': 'Meal\nPlanner'}, data
+    print("✅ Outermost object found, trailing prose ignored")
+    print()
+
+    # Test 3: trailing commas and a completion cut off by the token limit
+    print("Test 3: Trailing commas and truncation")
+    data, repaired = extract_json('{"core_features": ["Plans", "Lists",], "product_name": "Plan')
+    assert data == {'core_features': ['Plans', 'Lists'], 'product_name': 'Plan'} and repaired, data
+    print("✅ Repaired:", data)
+    print()
+
+    # Test 4: keys and values conformed to the model schema
+    print("Test 4: Schema-guided repairs")
+    completion = ('{"Product Name": "Planner", "core_features": "Plans", "viability_score": "8/10", '
+                  '"go_decision": "yes", "target_market": {"primary": ["Parents", "Students"], "secondary": 3}}')
+    data, repaired = extract_json(completion, Concept)
+    assert data == {
+        'product_name': 'Planner',
+        'core_features': ['Plans'],
+        'viability_score': 8,
+        'go_decision': True,
+        'target_market': {'primary': 'Parents, Students', 'secondary': '3'}
+    } and repaired, data
+    print("✅ Conformed:", data)
+    print()
+
+    # Test 5: numbers are only coerced from strings that are entirely numeric
+    print("Test 5: Numeric coercion")
+    cases = [
+        ('{"revenue": "$50,000", "customers": "1,200"}', {'revenue': 50000.0, 'customers': 1200}),
+        ('{"revenue": "-€1,250.50", "customers": " 42 "}', {'revenue': -1250.5, 'customers': 42}),
+        ('{"revenue": "1.2 million", "customers": "about 300"}', {'revenue': '1.2 million', 'customers': 'about 300'}),
+        ('{"revenue": "50000 in year 2", "customers": "7/10"}', {'revenue': '50000 in year 2', 'customers': 7}),
+    ]
+    for completion, expected in cases:
+        data, _ = extract_json(completion, Forecast)
+        assert data == expected, (completion, data)
+    print("✅ Currency and separators stripped, worded amounts left for validation")
+    print()
+
+    # Test 6: no object at all
+    print("Test 6: No JSON")
+    assert extract_json("I'm sorry, I can't help with that.") == (None, False)
+    print("✅ None returned so callers can use fallback data")
+    print()
+
+    # Test 7: parse time on a large completion
+    print("Test 7: Parse time")
+    large = '{"items": [' + ', '.join('{"name": "item %d\nline", "tags": ["a", "b"]}' % i for i in range(2000)) + ']}'
+    for name, text in (('valid', large), ('truncated', large[:-3])):
+        started = time.perf_counter()
+        data, _ = extract_json(text)
+        assert data and len(data['items']) == 2000, name
+        print(f"✅ {name}: {len(text)} chars in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    test_json_extractor()
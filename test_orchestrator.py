@@ -8,6 +8,7 @@ import os
 import requests
 import json
 import sys
+import time
 
 # Add the ai_uagents directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'ai_uagents'))
@@ -85,6 +86,38 @@ async def test_orchestrator():
             print(f"⚠️ {agent_name.title()} agent health check failed on port {port}")
     print()
 
+    # Test 4: Test asynchronous job API
+    print("Test 4: Test asynchronous workflow job API")
+    base_url = f"http://localhost:{orchestrator_agent.port}"
+    try:
+        response = requests.post(
+            f"{base_url}/workflow-jobs",
+            json={
+                "user_input": "I want to start an AI company that helps small businesses",
+                "idea_count": 1
+            },
+            timeout=10
+        )
+        response.raise_for_status()
+        job = response.json()
+        print(f"✅ Job submitted: {job.get('job_id')} ({job.get('status')})")
+        
+        # Poll until the job finishes (up to 5 minutes)
+        for _ in range(150):
+            time.sleep(2)
+            status = requests.post(f"{base_url}/workflow-jobs/status", json={"job_id": job['job_id']}, timeout=10).json()
+            print(f"   {status.get('status')}: stages done {status.get('completed_stages')}")
+            if status.get('status') in ('completed', 'failed'):
+                break
+        
+        if status.get('status') == 'completed' and status.get('data'):
+            print("✅ Job completed with business plan")
+        else:
+            print(f"❌ Job did not complete: {status.get('status')} {status.get('error') or ''}")
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Job API test failed: {e}")
+    print()
+
 async def main():
     print("🚀 Workflow Orchestrator Testing")
     print("==================================================")
@@ -0,0 +1,77 @@
+"""
+Test the workflow semantic cache
+Checks that rephrased ideas reuse stored stages while different ideas with similar wording do not
+"""
+
+import os
+import sys
+
+# Add the ai_uagents directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'ai_uagents'))
+
+from semantic_cache import SemanticCache
+
+STAGES = {'research': {'competitors': []}, 'product': {'product_name': 'Cached'}}
+
+# Same concept phrased differently: should reuse the stored stages
+PARAPHRASES = [
+    ("AI for small businesses", "small business AI helper"),
+    ("AI for small businesses", "AI for small business")
+]
+
+# Same wording around a different subject: must never share research or product results
+NEAR_MISSES = [
+    ("Scooter rental app in Tokyo", "Scooter rental app in Paris"),
+    ("Subscription box for cats", "Subscription box for dogs"),
+    ("Online tea subscription shop", "Online coffee subscription shop"),
+    ("AI tutor for high school math", "AI tutor for high school chemistry")
+]
+
+def test_semantic_cache():
+    """Test rephrased matches, near-miss rejections and corpus-common differences"""
+    print("🧪 Testing semantic cache...")
+    print()
+
+    # Test 1: a rephrasing of a cached idea is a hit
+    print("Test 1: Rephrased idea")
+    cache = SemanticCache('test')
+    cache.store("AI meal planning app for busy parents", STAGES)
+    hit = cache.lookup("A meal planning AI for busy parents", ['research', 'product'])
+    assert hit is not None and hit[0] == STAGES, hit
+    print(f"✅ Matched with similarity {hit[1]:.2f}")
+    print()
+
+    # Test 2: reworded paraphrases are hits even against a single-entry cache
+    print("Test 2: Paraphrases")
+    for cached, query in PARAPHRASES:
+        cache = SemanticCache('test')
+        cache.store(cached, STAGES)
+        hit = cache.lookup(query, ['research', 'product'])
+        assert hit is not None and hit[0] == STAGES, (cached, query, cache.similarities(query)[0])
+        print(f"✅ '{query}' served from '{cached}' (similarity {hit[1]:.2f})")
+    print()
+
+    # Test 3: different ideas that share most of their wording are misses
+    print("Test 3: Near misses")
+    for cached, query in NEAR_MISSES:
+        cache = SemanticCache('test')
+        cache.store(cached, STAGES)
+        assert cache.lookup(query, ['research']) is None, (cached, query)
+        print(f"✅ '{query}' not served from '{cached}' (similarity {cache.similarities(query)[0]:.2f})")
+    print()
+
+    # Test 4: a differing word that is common across the cache does not block a hit
+    print("Test 4: Common words")
+    cache = SemanticCache('test')
+    for idea in ("Online bakery marketplace", "Online tutoring for kids", "Online plant nursery", "Online tea subscription shop"):
+        cache.store(idea, STAGES)
+    hit = cache.lookup("Tea subscription shop", ['research'])
+    assert hit is not None, cache.get_stats()
+    print(f"✅ 'online' ignored, matched with similarity {hit[1]:.2f}")
+    print()
+
+    stats = cache.get_stats()
+    print(f"📊 Stats: {stats['hits']} hits, {stats['misses']} misses, {stats['rejected']} rejected")
+
+if __name__ == "__main__":
+    test_semantic_cache()